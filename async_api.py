@@ -0,0 +1,150 @@
+import asyncio
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Union
+
+import registry
+import size_parser
+from sparse_create import create_dummy_large_file, open_registry, register_created_file
+
+
+# 与 ThreadPoolExecutor 默认值一致，保证与同步线程池路径吞吐相当
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+CreateResult = namedtuple('CreateResult', ['path', 'size', 'error', 'elapsed'])
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """获取共享的有界线程池 (延迟创建)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=DEFAULT_WORKERS, thread_name_prefix='sparse-async')
+    return _executor
+
+
+def shutdown_executor(wait: bool = True):
+    """关闭共享线程池，之后再次调用会重新创建"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+
+def _to_bytes(size: Union[int, str]) -> int:
+    apparent_size = size if isinstance(size, int) else size_parser.parse_size(size)
+    if apparent_size <= 0:
+        raise ValueError('Invalid size: %r' % (size,))
+    return apparent_size
+
+
+def _timed_create(file_path: str, apparent_size: int,
+                  file_registry: Optional[registry.FileRegistry] = None) -> float:
+    """在工作线程中创建文件并登记到索引 (批量时记录到共享的索引，按批提交)；返回的耗时只含创建"""
+    start = time.perf_counter()
+    create_dummy_large_file(file_path, apparent_size)
+    elapsed = time.perf_counter() - start
+    if file_registry is None:
+        register_created_file(file_path, apparent_size)
+    else:
+        try:
+            file_registry.record(file_path, apparent_size)
+        except Exception:
+            pass
+    return elapsed
+
+
+async def create_sparse(file_path: str, size: Union[int, str], timeout: Optional[float] = None,
+                        executor: Optional[ThreadPoolExecutor] = None) -> CreateResult:
+    """
+    异步创建单个稀疏文件，不阻塞事件循环
+    超时或取消时尚未开始的任务会被撤销；已经在线程中执行的系统调用无法中断，会在后台完成
+    :param file_path: 文件路径
+    :param size: 字节数或大小表达式 (如 "1TiB")
+    :param timeout: 超时秒数，None 表示不限
+    :param executor: 自定义线程池，默认使用共享线程池
+    :return: CreateResult
+    :raises asyncio.TimeoutError: 超时
+    """
+    return await _create(file_path, size, timeout, executor, None)
+
+
+async def _create(file_path, size, timeout, executor, file_registry) -> CreateResult:
+    """创建一个文件；file_registry 为 None 时单独打开索引登记"""
+    apparent_size = _to_bytes(size)
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(executor or get_executor(), _timed_create, file_path, apparent_size,
+                                  file_registry)
+    elapsed = await asyncio.wait_for(future, timeout)
+    return CreateResult(file_path, apparent_size, None, elapsed)
+
+
+async def _create_job(job, timeout, executor, file_registry) -> CreateResult:
+    """执行一个任务并把异常收进结果，使批量迭代不因单个失败而中断"""
+    file_path, size = job
+    try:
+        return await _create(file_path, size, timeout, executor, file_registry)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        return CreateResult(file_path, size, e, None)
+
+
+async def _iterate_jobs(jobs):
+    """统一同步与异步可迭代对象"""
+    if hasattr(jobs, '__aiter__'):
+        async for job in jobs:
+            yield job
+    else:
+        for job in jobs:
+            yield job
+
+
+async def create_many(jobs, concurrency: Optional[int] = None, timeout: Optional[float] = None,
+                      executor: Optional[ThreadPoolExecutor] = None):
+    """
+    异步批量创建稀疏文件，按完成顺序产出 CreateResult
+    任务源按需拉取，同时在途的任务不超过 concurrency 个 (背压)；
+    调用方提前退出迭代或被取消时，所有在途任务都会被取消
+    :param jobs: (文件路径, 大小) 的同步或异步可迭代对象
+    :param concurrency: 最大在途任务数，默认等于线程池大小
+    :param timeout: 每个任务的超时秒数
+    :param executor: 自定义线程池
+    """
+    limit = concurrency or DEFAULT_WORKERS
+    # 整个批次共用一个索引连接，记录按批提交
+    file_registry = open_registry()
+    # 完成的任务把结果放入队列，取结果是 O(1)，不随在途任务数增长
+    completed = asyncio.Queue()
+    pending = set()
+
+    def on_done(task):
+        pending.discard(task)
+        if not task.cancelled():
+            completed.put_nowait(task.result())
+
+    try:
+        async for job in _iterate_jobs(jobs):
+            while len(pending) >= limit:
+                yield await completed.get()
+            task = asyncio.ensure_future(_create_job(job, timeout, executor, file_registry))
+            pending.add(task)
+            task.add_done_callback(on_done)
+        while pending or not completed.empty():
+            yield await completed.get()
+    finally:
+        for task in list(pending):
+            task.cancel()
+        if file_registry is not None:
+            try:
+                file_registry.close()
+            except Exception:
+                pass
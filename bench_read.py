@@ -0,0 +1,180 @@
+import bisect
+import mmap
+import os
+import random
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import sparse_io
+
+
+PATTERNS = ('sequential', 'random', 'strided')
+METHODS = ('read', 'pread', 'readinto', 'mmap')
+CACHE_MODES = ('drop', 'keep', 'willneed')
+
+DEFAULT_BLOCK = 128 << 10
+DEFAULT_COUNT = 10000
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class RegionMap:
+    """按数据区间判断一次读取落在空洞、数据还是两者之间"""
+
+    def __init__(self, extents: List[Tuple[int, int]]):
+        self.starts = [offset for offset, _length in extents]
+        self.ends = [offset + length for offset, length in extents]
+
+    def classify(self, offset: int, length: int) -> str:
+        end = offset + length
+        index = bisect.bisect_right(self.starts, offset) - 1
+        covered = 0
+        if index < 0:
+            index = 0
+        while index < len(self.starts) and self.starts[index] < end:
+            overlap = min(end, self.ends[index]) - max(offset, self.starts[index])
+            if overlap > 0:
+                covered += overlap
+            index += 1
+        if covered == 0:
+            return 'hole'
+        return 'data' if covered >= length else 'mixed'
+
+
+def plan_offsets(size: int, pattern: str, block: int, count: Optional[int] = None,
+                 stride: Optional[int] = None, seed: int = 0) -> List[int]:
+    """
+    生成读取偏移序列
+    :param pattern: sequential (顺序)、random (按块对齐随机)、strided (固定步长跳读)
+    :param count: 读取次数上限，None 使用 DEFAULT_COUNT
+    :param stride: strided 模式的步长，默认 16 个块
+    """
+    blocks = max(0, -(-size // block))
+    count = DEFAULT_COUNT if count is None else count
+    if pattern == 'sequential':
+        return [i * block for i in range(min(count, blocks))]
+    if pattern == 'random':
+        rng = random.Random(seed)
+        return [rng.randrange(blocks) * block for _ in range(count)] if blocks else []
+    if pattern == 'strided':
+        step = stride or block * 16
+        # 先切片 range 再展开，大文件上不会生成全部偏移
+        return list(range(0, size, step)[:count])
+    raise ValueError('Unknown pattern: %s' % pattern)
+
+
+def _make_reader(method: str, fd: int, file_obj, mapped_view: memoryview,
+                 buffer: bytearray) -> Callable[[int, int], int]:
+    """返回 read_block(offset, length) -> 读取字节数，缓冲区在各次读取之间复用"""
+    view = memoryview(buffer)
+    if method == 'read':
+        def read_block(offset, length):
+            os.lseek(fd, offset, os.SEEK_SET)
+            return len(os.read(fd, length))
+    elif method == 'pread':
+        if not hasattr(os, 'pread'):
+            raise ValueError('pread is not available on this platform')
+
+        def read_block(offset, length):
+            return len(os.pread(fd, length, offset))
+    elif method == 'readinto':
+        def read_block(offset, length):
+            file_obj.seek(offset)
+            return file_obj.readinto(view[:length]) or 0
+    elif method == 'mmap':
+        def read_block(offset, length):
+            chunk = mapped_view[offset:offset + length]
+            view[:len(chunk)] = chunk
+            return len(chunk)
+    else:
+        raise ValueError('Unknown method: %s' % method)
+    return read_block
+
+
+def _advise(fd: int, advice_name: str):
+    """posix_fadvise 提示；平台不支持时忽略"""
+    advice = getattr(os, advice_name, None)
+    if advice is None or not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, advice)
+    except OSError:
+        pass
+
+
+def _percentile(sorted_values: List[int], percent: float) -> int:
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, int(round(percent / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _summarize(latencies: List[int], total_bytes: int) -> Dict:
+    latencies.sort()
+    seconds = sum(latencies) / 1e9
+    summary = {
+        'reads': len(latencies),
+        'bytes': total_bytes,
+        'throughput': round(total_bytes / seconds) if seconds > 0 else 0,
+    }
+    for percent in PERCENTILES:
+        summary['p%g_us' % percent] = round(_percentile(latencies, percent) / 1000.0, 1)
+    summary['max_us'] = round(latencies[-1] / 1000.0, 1) if latencies else 0.0
+    return summary
+
+
+def bench_file(path: str, pattern: str, method: str, block: int = DEFAULT_BLOCK, count: Optional[int] = None,
+               stride: Optional[int] = None, seed: int = 0, cache: str = 'drop') -> Dict:
+    """
+    按指定模式和读取方式读取文件，分别统计空洞、数据、跨越两者的读取的吞吐量与延迟分位数
+    :param cache: drop 先用 POSIX_FADV_DONTNEED 丢弃页缓存 (冷读)，keep 不处理，willneed 先提示预读
+    :return: {"path", "pattern", "method", "block", "seconds", "regions": {"hole"|"data"|"mixed": {...}}}
+    """
+    if cache not in CACHE_MODES:
+        raise ValueError('Unknown cache mode: %s' % cache)
+    buffer = bytearray(block)
+    with open(path, 'rb', buffering=0) as f:
+        fd = f.fileno()
+        size = os.fstat(fd).st_size
+        regions = RegionMap(list(sparse_io.iter_data_extents(fd, size)))
+        offsets = plan_offsets(size, pattern, block, count, stride, seed)
+
+        if cache == 'drop':
+            _advise(fd, 'POSIX_FADV_DONTNEED')
+        elif cache == 'willneed':
+            _advise(fd, 'POSIX_FADV_WILLNEED')
+        _advise(fd, 'POSIX_FADV_SEQUENTIAL' if pattern == 'sequential' else 'POSIX_FADV_RANDOM')
+
+        mapped = mmap.mmap(fd, 0, access=mmap.ACCESS_READ) if method == 'mmap' and size else None
+        mapped_view = memoryview(mapped if mapped is not None else b'')
+        try:
+            read_block = _make_reader(method, fd, f, mapped_view, buffer)
+            latencies: Dict[str, List[int]] = {}
+            totals: Dict[str, int] = {}
+            clock = time.perf_counter_ns
+            started = clock()
+            for offset in offsets:
+                length = min(block, size - offset)
+                before = clock()
+                read = read_block(offset, length)
+                elapsed = clock() - before
+                region = regions.classify(offset, length)
+                latencies.setdefault(region, []).append(elapsed)
+                totals[region] = totals.get(region, 0) + read
+            seconds = (clock() - started) / 1e9
+        finally:
+            # 先释放对映射的引用才能关闭 mmap
+            read_block = None
+            mapped_view.release()
+            if mapped is not None:
+                mapped.close()
+
+    return {
+        'path': path,
+        'pattern': pattern,
+        'method': method,
+        'block': block,
+        'cache': cache,
+        'seconds': round(seconds, 3),
+        'regions': {region: _summarize(values, totals[region]) for region, values in sorted(latencies.items())},
+    }
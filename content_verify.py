@@ -0,0 +1,209 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import sparse_io
+from layout import PATTERN_BLOCK, FileLayout, capture_file, fill_pattern
+
+
+DEFAULT_CHUNK = 8 << 20
+
+# 每个任务最多包含的分块数: 小文件一个任务，大文件拆成多个任务并行校验
+CHUNKS_PER_TASK = 8
+
+
+class _Buffers(threading.local):
+    """每个工作线程预先分配的读取缓冲区和期望数据缓冲区，在各分块之间复用"""
+
+    def __init__(self, chunk: int):
+        self.actual = bytearray(chunk)
+        self.expected = bytearray(chunk)
+
+
+def _equal(a: memoryview, b: memoryview) -> bool:
+    """逐字节比较 memoryview 很慢，对齐部分按 8 字节整数比较"""
+    aligned = len(a) & ~7
+    return a[:aligned].cast('Q') == b[:aligned].cast('Q') and a[aligned:] == b[aligned:]
+
+
+def _append_range(ranges: List[List[int]], offset: int, length: int):
+    if ranges and ranges[-1][0] + ranges[-1][1] == offset:
+        ranges[-1][1] += length
+    else:
+        ranges.append([offset, length])
+
+
+def _tasks_for(entry: FileLayout, chunk: int) -> List[List[Tuple[int, int]]]:
+    """把数据区间切分为分块，并按 CHUNKS_PER_TASK 分组为任务"""
+    tasks: List[List[Tuple[int, int]]] = [[]]
+    for offset, length in entry.extents:
+        end = offset + length
+        while offset < end:
+            if len(tasks[-1]) >= CHUNKS_PER_TASK:
+                tasks.append([])
+            step = min(chunk, end - offset)
+            tasks[-1].append((offset, step))
+            offset += step
+    return tasks
+
+
+def _check_pieces(path: str, pieces: List[Tuple[int, int]], seed: int, buffers: _Buffers,
+                  stop: Optional[threading.Event]) -> Tuple[int, List[List[int]]]:
+    """
+    按种子重新生成期望数据，与文件内容逐块比较
+    :param stop: 遇到第一处差异即停止时使用的事件，None 表示报告全部差异
+    :return: (比较的字节数, 差异范围 [[偏移, 长度], ...]，按 PATTERN_BLOCK 粒度)
+    """
+    checked = 0
+    mismatches: List[List[int]] = []
+    with open(path, 'rb', buffering=0) as f:
+        fd = f.fileno()
+        for offset, length in pieces:
+            if stop is not None and stop.is_set():
+                break
+            if length == len(buffers.actual):
+                actual, expected = memoryview(buffers.actual), memoryview(buffers.expected)
+            else:
+                actual, expected = memoryview(buffers.actual)[:length], memoryview(buffers.expected)[:length]
+            read = sparse_io.read_into(fd, actual, offset)
+            fill_pattern(expected, seed, offset)
+            checked += length
+            if read == length and (buffers.actual == buffers.expected if length == len(buffers.actual)
+                                   else _equal(actual, expected)):
+                continue
+            # 定位差异: 文件提前结束的部分整体视为差异
+            for start in range(0, length, PATTERN_BLOCK):
+                step = min(PATTERN_BLOCK, length - start)
+                if start + step > read or not _equal(actual[start:start + step], expected[start:start + step]):
+                    _append_range(mismatches, offset + start, step)
+                    if stop is not None:
+                        break
+            if stop is not None:
+                stop.set()
+                break
+    return checked, mismatches
+
+
+def _check_holes(path: str, entry: FileLayout) -> Optional[List[List[int]]]:
+    """
+    用 SEEK_DATA/SEEK_HOLE 检查布局中的空洞是否仍然是空洞 (不读取数据)
+    期望的数据区间按块大小向外取整，文件系统按块分配造成的边界差异不算错误
+    :return: 空洞中出现数据的范围；平台不支持 SEEK_HOLE 时为 None
+    """
+    if not sparse_io.supports_seek_hole():
+        return None
+    with open(path, 'rb') as f:
+        fd = f.fileno()
+        stat = os.fstat(fd)
+        block = getattr(stat, 'st_blksize', 0) or PATTERN_BLOCK
+        expected = [(offset // block * block, -(-(offset + length) // block) * block)
+                    for offset, length in entry.extents]
+        unexpected: List[List[int]] = []
+        index = 0
+        for offset, length in sparse_io.iter_data_extents(fd, stat.st_size):
+            end = offset + length
+            position = offset
+            while index < len(expected) and expected[index][1] <= position:
+                index += 1
+            scan = index
+            while position < end:
+                if scan < len(expected) and expected[scan][0] <= position:
+                    position = max(position, expected[scan][1])
+                    scan += 1
+                    continue
+                hole_end = min(end, expected[scan][0]) if scan < len(expected) else end
+                _append_range(unexpected, position, hole_end - position)
+                position = hole_end
+    return unexpected
+
+
+def layouts_for(paths: List[str]) -> List[Tuple[str, FileLayout]]:
+    """以文件当前的数据区间作为期望布局 (只校验数据内容)，目录递归展开"""
+    items = []
+    for source in paths:
+        if not os.path.isdir(source):
+            items.append((source, capture_file(source)))
+            continue
+        for dirpath, dirnames, filenames in os.walk(source):
+            dirnames.sort()
+            for name in sorted(filenames):
+                path = os.path.join(dirpath, name)
+                if os.path.isfile(path) and not os.path.islink(path):
+                    items.append((path, capture_file(path)))
+    return items
+
+
+def verify_files(items: List[Tuple[str, FileLayout]], seed: int = 0, chunk: int = DEFAULT_CHUNK,
+                 workers: Optional[int] = None, check_holes: bool = True,
+                 first_only: bool = True) -> Tuple[List[Dict], bool]:
+    """
+    不依赖保存的校验和，按种子重新生成每个数据区间的图案并与文件内容并行比较
+    :param items: [(文件路径, 期望布局), ...]
+    :param check_holes: 同时检查布局中的空洞是否仍是空洞
+    :param first_only: 遇到第一处差异即停止其余比较；False 时报告全部差异范围
+    :return: ([{"path", "size", "expected_size", "checked_bytes", "mismatches", "data_in_holes", "error",
+               "skipped", "ok"}, ...], 是否提前停止)；skipped 表示尚未发现差异但因提前停止而未校验完
+    """
+    stop = threading.Event() if first_only else None
+    buffers = _Buffers(chunk)
+    results = []
+    tasks = []
+    for index, (path, entry) in enumerate(items):
+        result = {'path': path, 'size': None, 'expected_size': entry.size, 'checked_bytes': 0,
+                  'mismatches': [], 'data_in_holes': None, 'error': None, 'skipped': False}
+        try:
+            result['size'] = os.stat(path).st_size
+        except OSError as e:
+            result['error'] = str(e)
+        results.append(result)
+        if stop is not None and (result['error'] is not None or result['size'] != entry.size):
+            stop.set()
+        if result['error'] is None:
+            if check_holes:
+                tasks.append((index, None))
+            tasks.extend((index, pieces) for pieces in _tasks_for(entry, chunk) if pieces)
+
+    def run(task):
+        index, pieces = task
+        path, entry = items[index]
+        if stop is not None and stop.is_set():
+            return index, pieces, None, None, True
+        try:
+            if pieces is None:
+                return index, None, _check_holes(path, entry), None, False
+            checked, mismatches = _check_pieces(path, pieces, seed, buffers, stop)
+        except OSError as e:
+            return index, pieces, None, e, False
+        # 停止事件也可能在分块之间触发，没有比较完的任务同样算作跳过
+        skipped = not mismatches and checked < sum(length for _offset, length in pieces)
+        return index, pieces, (checked, mismatches), None, skipped
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for index, pieces, outcome, error, skipped in pool.map(run, tasks):
+            result = results[index]
+            result['skipped'] = result['skipped'] or skipped
+            if error is not None:
+                result['error'] = str(error)
+            elif outcome is None:
+                continue
+            elif pieces is None:
+                result['data_in_holes'] = outcome
+            else:
+                checked, mismatches = outcome
+                result['checked_bytes'] += checked
+                for offset, length in mismatches:
+                    _append_range(result['mismatches'], offset, length)
+            if stop is not None and (result['error'] is not None or result['data_in_holes']):
+                stop.set()
+
+    for result in results:
+        result['ok'] = (result['error'] is None and result['size'] == result['expected_size']
+                        and not result['mismatches'] and not result['data_in_holes'])
+        if not result['ok']:
+            result['skipped'] = False
+        result['mismatches'] = [{'offset': offset, 'length': length} for offset, length in result['mismatches']]
+        if result['data_in_holes'] is not None:
+            result['data_in_holes'] = [{'offset': offset, 'length': length}
+                                       for offset, length in result['data_in_holes']]
+    return results, stop is not None and stop.is_set()
@@ -0,0 +1,184 @@
+import collections
+import json
+import os
+import queue
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import fs_probe
+from planner import existing_ancestor
+
+
+CONFIG_FILE = os.path.join(fs_probe.CONFIG_DIR, 'config.json')
+
+# 每个设备在途任务数为并发数的倍数，保证池中线程不空闲又不会一次提交全部任务
+WINDOW_FACTOR = 4
+
+# 单个任务包含的作业数：进程池按批提交以摊薄序列化开销
+THREAD_BATCH = 16
+PROCESS_BATCH = 256
+
+
+def suggested_workers(caps: Dict) -> int:
+    """根据探测结果给出设备的默认并发数: 机械硬盘少量并发，SSD/NVMe 随 CPU 数增加，未知 (网络等) 取中间值"""
+    rotational = caps.get('rotational')
+    if rotational:
+        return 2
+    if rotational is False:
+        return min(32, (os.cpu_count() or 1) * 4)
+    return 8
+
+
+def load_device_config() -> Dict[int, int]:
+    """
+    读取 config.json 中的 device_workers 设置 ({"挂载点或目录": 并发数})，转换为按 st_dev 的映射
+    不存在的路径忽略
+    """
+    try:
+        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+            configured = json.load(f).get('device_workers', {})
+    except (OSError, ValueError):
+        return {}
+    workers = {}
+    for path, count in configured.items():
+        try:
+            workers[os.stat(path).st_dev] = int(count)
+        except (OSError, ValueError, TypeError):
+            continue
+    return workers
+
+
+def group_by_device(paths: Sequence[str], indices: Sequence[int]) -> Tuple[Dict[int, List[int]], Dict[int, str]]:
+    """
+    按所在设备分组
+    :return: ({st_dev: [索引, ...]}, {st_dev: 该设备上的一个目录})
+    """
+    device_of_dir: Dict[str, int] = {}
+    groups: Dict[int, List[int]] = collections.OrderedDict()
+    sample_dir: Dict[int, str] = {}
+    for index in indices:
+        directory = os.path.dirname(os.path.abspath(paths[index]))
+        device = device_of_dir.get(directory)
+        if device is None:
+            device = device_of_dir[directory] = os.stat(existing_ancestor(directory)).st_dev
+            sample_dir.setdefault(device, directory)
+        groups.setdefault(device, []).append(index)
+    return groups, sample_dir
+
+
+def _run_batch(func: Callable, jobs: List[tuple]) -> List[Optional[BaseException]]:
+    """在工作线程/进程中依次执行一批作业，返回每个作业的异常 (成功为 None)"""
+    errors = []
+    for job in jobs:
+        try:
+            func(*job)
+            errors.append(None)
+        except Exception as e:
+            errors.append(e)
+    return errors
+
+
+class DeviceStats:
+    """单个设备的吞吐量统计"""
+
+    __slots__ = ('device', 'directory', 'workers', 'files', 'bytes', 'failures', 'started', 'finished')
+
+    def __init__(self, device: int, directory: str, workers: int):
+        self.device = device
+        self.directory = directory
+        self.workers = workers
+        self.files = 0
+        self.bytes = 0
+        self.failures = 0
+        self.started = time.monotonic()
+        self.finished = self.started
+
+    def describe(self) -> Dict:
+        seconds = self.finished - self.started
+        return {
+            'device': self.device,
+            'directory': self.directory,
+            'workers': self.workers,
+            'files': self.files,
+            'bytes': self.bytes,
+            'failures': self.failures,
+            'seconds': round(seconds, 3),
+            'files_per_second': round(self.files / seconds, 1) if seconds > 0 else 0.0,
+        }
+
+
+def run_by_device(jobs: Sequence[Tuple[str, int]], indices: Sequence[int], func: Callable,
+                  workers: Optional[int] = None, processes: bool = False,
+                  on_submit: Optional[Callable[[List[int]], None]] = None,
+                  on_complete: Optional[Callable[[int, Optional[BaseException]], None]] = None) -> List[Dict]:
+    """
+    按设备分组并行执行作业: 每个设备一个有界的线程池 (或进程池)，各设备同时运行，
+    一个慢设备只会占满自己的池，不会拖住其他设备
+    完成通知经由队列回到调用线程，on_submit/on_complete 都在调用线程中执行 (可安全写日志和索引)
+    :param jobs: [(文件路径, 字节数), ...]
+    :param indices: 需要执行的作业索引
+    :param func: 作业函数 func(文件路径, 字节数)；进程模式下必须可被 pickle
+    :param workers: 每个设备的并发数，None 时依次取 config.json 的 device_workers 和探测结果
+    :param processes: 每个设备使用独立的进程池
+    :return: 每个设备的统计 [{"device", "directory", "workers", "files", "bytes", "seconds", ...}]
+    """
+    groups, sample_dir = group_by_device([path for path, _size in jobs], indices)
+    configured = load_device_config() if workers is None else {}
+    executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    batch = PROCESS_BATCH if processes else THREAD_BATCH
+
+    completions: queue.Queue = queue.Queue()
+    pending = {}
+    executors = {}
+    stats = {}
+    in_flight = {}
+    try:
+        for device, device_indices in groups.items():
+            count = workers or configured.get(device)
+            if not count:
+                try:
+                    count = suggested_workers(fs_probe.get_capabilities(existing_ancestor(sample_dir[device])))
+                except OSError:
+                    count = suggested_workers({})
+            executors[device] = executor_class(max_workers=count)
+            stats[device] = DeviceStats(device, sample_dir[device], count)
+            pending[device] = collections.deque(device_indices)
+            in_flight[device] = 0
+
+        def submit(device):
+            window = stats[device].workers * WINDOW_FACTOR
+            while pending[device] and in_flight[device] < window:
+                take = min(batch, len(pending[device]))
+                chunk = [pending[device].popleft() for _ in range(take)]
+                if on_submit:
+                    on_submit(chunk)
+                future = executors[device].submit(_run_batch, func, [jobs[index] for index in chunk])
+                future.add_done_callback(
+                    lambda done, device=device, chunk=chunk: completions.put((device, chunk, done)))
+                in_flight[device] += 1
+
+        for device in groups:
+            submit(device)
+        outstanding = sum(in_flight.values())
+        while outstanding:
+            device, chunk, future = completions.get()
+            in_flight[device] -= 1
+            error = future.exception()
+            errors = future.result() if error is None else [error] * len(chunk)
+            device_stats = stats[device]
+            for index, job_error in zip(chunk, errors):
+                if job_error is None:
+                    device_stats.files += 1
+                    device_stats.bytes += jobs[index][1]
+                else:
+                    device_stats.failures += 1
+                if on_complete:
+                    on_complete(index, job_error)
+            device_stats.finished = time.monotonic()
+            submit(device)
+            outstanding = sum(in_flight.values())
+    finally:
+        for executor in executors.values():
+            executor.shutdown(wait=True)
+    return [device_stats.describe() for device_stats in stats.values()]
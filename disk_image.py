@@ -0,0 +1,190 @@
+import json
+import struct
+import uuid
+import zlib
+from typing import Dict, List, Optional
+
+import size_parser
+import rate_limit
+import sparse_io
+
+
+# 常用分区类型 GUID 别名
+PARTITION_TYPES = {
+    'efi': 'C12A7328-F81F-11D2-BA4B-00A0C93EC93B',
+    'bios': '21686148-6449-6E6F-744E-656564454649',
+    'linux': '0FC63DAF-8483-4772-8E79-3D69D8477DE4',
+    'swap': '0657FD6D-A4AB-43C4-84E5-0933C84B4F4F',
+    'lvm': 'E6D6D379-F507-44C2-A23C-238F2A3DF928',
+    'raid': 'A19D880F-05FC-4D3B-A006-743F0F84911E',
+    'msdata': 'EBD0A0A2-B9E5-4433-87C0-68B6B72699C7',
+    'msr': 'E3C9E316-0B5C-4DB8-817D-F92DF00215AE',
+}
+
+GPT_SIGNATURE = b'EFI PART'
+GPT_REVISION = 0x00010000
+GPT_HEADER_SIZE = 92
+PARTITION_ENTRY_SIZE = 128
+PARTITION_ENTRY_COUNT = 128
+
+_HEADER_STRUCT = struct.Struct('<8sIIIIQQQQ16sQIII')
+_ENTRY_STRUCT = struct.Struct('<16s16sQQQ72s')
+
+
+def _parse_guid(value: Optional[str]) -> uuid.UUID:
+    if not value:
+        return uuid.uuid4()
+    return uuid.UUID(PARTITION_TYPES.get(value.lower(), value))
+
+
+def _parse_size(value) -> int:
+    return value if isinstance(value, int) else size_parser.parse_size(str(value))
+
+
+def load_spec(spec_path: str) -> Dict:
+    """读取 JSON 格式的镜像描述文件"""
+    with open(spec_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def parse_partition_arg(text: str) -> Dict:
+    """解析命令行分区参数 NAME:SIZE[:TYPE]，SIZE 为 rest 表示占满剩余空间"""
+    parts = text.split(':')
+    if len(parts) < 2:
+        raise ValueError('Invalid partition: %s' % text)
+    partition = {'name': parts[0], 'size': parts[1]}
+    if len(parts) > 2:
+        partition['type'] = parts[2]
+    return partition
+
+
+def plan_layout(spec: Dict) -> Dict:
+    """
+    根据描述计算 GPT 布局
+    :param spec: {"size": ..., "sector_size": 512, "align": "1MiB", "disk_guid": ...,
+                  "partitions": [{"name", "size" (或 "rest"), "type", "guid", "attributes"}]}
+    :return: 含扇区号的布局字典
+    :raises ValueError: 描述无效或分区放不下时
+    """
+    sector_size = int(spec.get('sector_size', 512))
+    if sector_size not in (512, 4096):
+        raise ValueError('Unsupported sector size: %d' % sector_size)
+    image_size = _parse_size(spec['size'])
+    if image_size % sector_size:
+        raise ValueError('Image size must be a multiple of the sector size')
+    total_sectors = image_size // sector_size
+    align = max(1, _parse_size(spec.get('align', '1MiB')) // sector_size)
+
+    entry_sectors = PARTITION_ENTRY_COUNT * PARTITION_ENTRY_SIZE // sector_size
+    first_usable = 2 + entry_sectors
+    last_lba = total_sectors - 1
+    last_usable = last_lba - entry_sectors - 1
+    if last_usable <= first_usable:
+        raise ValueError('Image too small for GPT')
+
+    partitions = spec.get('partitions', [])
+    if len(partitions) > PARTITION_ENTRY_COUNT:
+        raise ValueError('Too many partitions')
+
+    planned = []
+    next_lba = first_usable
+    for index, partition in enumerate(partitions):
+        start = -(-next_lba // align) * align
+        size = partition.get('size', 'rest')
+        if size in ('rest', '*'):
+            if index != len(partitions) - 1:
+                raise ValueError('Only the last partition may use the remaining space')
+            end = last_usable
+        else:
+            size_bytes = _parse_size(size)
+            if size_bytes <= 0 or size_bytes % sector_size:
+                raise ValueError('Invalid partition size: %s' % size)
+            end = start + size_bytes // sector_size - 1
+        if end > last_usable or end < start:
+            raise ValueError('Partition %r does not fit in the image' % partition.get('name', index))
+        planned.append({
+            'name': partition.get('name', ''),
+            'type': _parse_guid(partition.get('type', 'linux')),
+            'guid': _parse_guid(partition.get('guid')),
+            'first_lba': start,
+            'last_lba': end,
+            'attributes': int(partition.get('attributes', 0)),
+        })
+        next_lba = end + 1
+
+    return {
+        'sector_size': sector_size,
+        'image_size': image_size,
+        'total_sectors': total_sectors,
+        'first_usable': first_usable,
+        'last_usable': last_usable,
+        'entry_sectors': entry_sectors,
+        'disk_guid': _parse_guid(spec.get('disk_guid')),
+        'partitions': planned,
+    }
+
+
+def _protective_mbr(layout: Dict) -> bytes:
+    """生成保护性 MBR：一个覆盖整个磁盘的 0xEE 分区"""
+    mbr = bytearray(layout['sector_size'])
+    sectors = min(layout['total_sectors'] - 1, 0xFFFFFFFF)
+    mbr[446:462] = struct.pack('<B3sB3sII', 0, b'\x00\x02\x00', 0xEE, b'\xff\xff\xff', 1, sectors)
+    mbr[510:512] = b'\x55\xaa'
+    return bytes(mbr)
+
+
+def _partition_entries(layout: Dict) -> bytes:
+    entries = bytearray(PARTITION_ENTRY_COUNT * PARTITION_ENTRY_SIZE)
+    for index, partition in enumerate(layout['partitions']):
+        name = partition['name'].encode('utf-16-le')[:72]
+        _ENTRY_STRUCT.pack_into(entries, index * PARTITION_ENTRY_SIZE,
+                                partition['type'].bytes_le, partition['guid'].bytes_le,
+                                partition['first_lba'], partition['last_lba'],
+                                partition['attributes'], name)
+    return bytes(entries)
+
+
+def _gpt_header(layout: Dict, current_lba: int, backup_lba: int, entries_lba: int, entries_crc: int) -> bytes:
+    fields = [GPT_SIGNATURE, GPT_REVISION, GPT_HEADER_SIZE, 0, 0,
+              current_lba, backup_lba, layout['first_usable'], layout['last_usable'],
+              layout['disk_guid'].bytes_le, entries_lba, PARTITION_ENTRY_COUNT,
+              PARTITION_ENTRY_SIZE, entries_crc]
+    fields[3] = zlib.crc32(_HEADER_STRUCT.pack(*fields)) & 0xFFFFFFFF
+    header = _HEADER_STRUCT.pack(*fields)
+    return header + b'\0' * (layout['sector_size'] - len(header))
+
+
+def write_image(image_path: str, layout: Dict):
+    """
+    写出稀疏磁盘镜像：截断到完整大小后只写入 MBR、主/备 GPT 头和分区表所在扇区
+    :param image_path: 镜像文件路径
+    :param layout: plan_layout 的返回值
+    """
+    sector_size = layout['sector_size']
+    last_lba = layout['total_sectors'] - 1
+    backup_entries_lba = last_lba - layout['entry_sectors']
+    entries = _partition_entries(layout)
+    entries_crc = zlib.crc32(entries) & 0xFFFFFFFF
+
+    with rate_limit.metadata_op():
+        f = open(image_path, 'wb')
+    with f:
+        f.truncate(layout['image_size'])
+        fd = f.fileno()
+        primary = _gpt_header(layout, 1, last_lba, 2, entries_crc)
+        backup = _gpt_header(layout, last_lba, 1, backup_entries_lba, entries_crc)
+        sparse_io.write_at(fd, _protective_mbr(layout) + primary + entries, 0)
+        sparse_io.write_at(fd, entries + backup, backup_entries_lba * sector_size)
+
+
+def describe_layout(layout: Dict) -> List[Dict]:
+    """把布局转换为便于输出的分区列表"""
+    sector_size = layout['sector_size']
+    return [{
+        'name': partition['name'],
+        'type': str(partition['type']).upper(),
+        'guid': str(partition['guid']).upper(),
+        'first_lba': partition['first_lba'],
+        'last_lba': partition['last_lba'],
+        'size': (partition['last_lba'] - partition['first_lba'] + 1) * sector_size,
+    } for partition in layout['partitions']]
@@ -0,0 +1,182 @@
+import errno
+import heapq
+import os
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+import size_parser
+import sparse_io
+
+
+OP_PUNCH = 'punch'
+OP_ZERO = 'zero'
+OP_COLLAPSE = 'collapse'
+OP_INSERT = 'insert'
+OPERATIONS = (OP_PUNCH, OP_ZERO, OP_COLLAPSE, OP_INSERT)
+
+# 所需的能力键 (fs_probe) 与 fallocate 模式
+_CAPABILITY = {
+    OP_PUNCH: 'punch_hole',
+    OP_ZERO: 'zero_range',
+    OP_COLLAPSE: 'collapse_range',
+    OP_INSERT: 'insert_range',
+}
+_MODES = {
+    OP_PUNCH: sparse_io.FALLOC_FL_PUNCH_HOLE | sparse_io.FALLOC_FL_KEEP_SIZE,
+    OP_ZERO: sparse_io.FALLOC_FL_ZERO_RANGE | sparse_io.FALLOC_FL_KEEP_SIZE,
+    OP_COLLAPSE: sparse_io.FALLOC_FL_COLLAPSE_RANGE,
+    OP_INSERT: sparse_io.FALLOC_FL_INSERT_RANGE,
+}
+
+# 不支持 ZERO_RANGE 时退回写零的单次写入量
+ZERO_CHUNK = 1 << 20
+
+# 偏移均指编辑前的原文件坐标
+RangeOp = namedtuple('RangeOp', ['op', 'offset', 'length'])
+
+
+def parse_op(text: str) -> RangeOp:
+    """解析 OP:OFFSET:LENGTH，偏移和长度可带单位 (如 punch:1GiB:4MiB)"""
+    parts = text.strip().split(':')
+    if len(parts) != 3 or parts[0] not in OPERATIONS:
+        raise ValueError('Invalid edit operation: %s' % text)
+    offset = size_parser.parse_size(parts[1]) if parts[1] not in ('0', '') else 0
+    length = size_parser.parse_size(parts[2])
+    if offset < 0 or length <= 0:
+        raise ValueError('Invalid edit operation: %s' % text)
+    return RangeOp(parts[0], offset, length)
+
+
+def load_ops(path: str) -> List[RangeOp]:
+    """读取操作列表文件: 每行一个 OP:OFFSET:LENGTH，# 开头为注释"""
+    ops = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                ops.append(parse_op(line))
+    return ops
+
+
+def _paint(ops: List[RangeOp]) -> List[RangeOp]:
+    """
+    合并打洞/置零操作: 重叠部分以后出现的操作为准，相邻的同类范围合并为一个
+    扫描所有边界点，用堆维护覆盖当前位置的最后一个操作，复杂度 O(n log n)
+    :return: 按偏移排序、互不重叠的操作
+    """
+    items = sorted((op.offset, op.offset + op.length, index, op.op) for index, op in enumerate(ops))
+    bounds = sorted({point for start, end, _index, _kind in items for point in (start, end)})
+    active: List[Tuple[int, int, str]] = []  # (-序号, 终点, 类型)
+    merged: List[List] = []
+    next_item = 0
+    for start, end in zip(bounds, bounds[1:]):
+        while next_item < len(items) and items[next_item][0] <= start:
+            _offset, item_end, index, kind = items[next_item]
+            heapq.heappush(active, (-index, item_end, kind))
+            next_item += 1
+        while active and active[0][1] <= start:
+            heapq.heappop(active)
+        if not active:
+            continue
+        kind = active[0][2]
+        if merged and merged[-1][2] == kind and merged[-1][1] == start:
+            merged[-1][1] = end
+        else:
+            merged.append([start, end, kind])
+    return [RangeOp(kind, start, end - start) for start, end, kind in merged]
+
+
+def plan_edits(ops: List[RangeOp]) -> List[RangeOp]:
+    """
+    把操作列表整理为最少的系统调用序列
+    打洞/置零先执行 (不改变偏移)；折叠/插入按偏移从大到小执行，使每个操作的原文件坐标在执行时仍然有效。
+    同一偏移先折叠再插入，即用指定长度的空洞替换被折叠的范围
+    :raises ValueError: 插入点落在被折叠的范围内部时
+    """
+    fills = _paint([op for op in ops if op.op in (OP_PUNCH, OP_ZERO)])
+
+    collapses: List[List[int]] = []
+    for op in sorted((op for op in ops if op.op == OP_COLLAPSE), key=lambda op: op.offset):
+        end = op.offset + op.length
+        if collapses and collapses[-1][1] >= op.offset:
+            collapses[-1][1] = max(collapses[-1][1], end)
+        else:
+            collapses.append([op.offset, end])
+
+    inserts: Dict[int, int] = {}
+    for op in ops:
+        if op.op == OP_INSERT:
+            inserts[op.offset] = inserts.get(op.offset, 0) + op.length
+    for offset in inserts:
+        for start, end in collapses:
+            if start < offset < end:
+                raise ValueError('Insert at %d falls inside collapsed range [%d, %d)' % (offset, start, end))
+
+    # 被折叠的范围会被移除，其中的打洞/置零没有意义
+    fills = [op for op in fills
+             if not any(start <= op.offset and op.offset + op.length <= end for start, end in collapses)]
+
+    shifts = [RangeOp(OP_COLLAPSE, start, end - start) for start, end in collapses]
+    shifts += [RangeOp(OP_INSERT, offset, length) for offset, length in inserts.items()]
+    shifts.sort(key=lambda op: (-op.offset, op.op != OP_COLLAPSE))
+    return fills + shifts
+
+
+def check_plan(plan: List[RangeOp], caps: Dict, size: int):
+    """
+    按文件系统能力和对齐要求校验计划，并按执行顺序跟踪文件大小
+    折叠/插入要求偏移和长度都是块大小的整数倍，折叠不能到达文件末尾，插入点必须在文件内
+    :param size: 编辑前的文件大小
+    :raises OSError: 不支持所需的操作 (置零除外，置零可以退回写零)
+    :raises ValueError: 对齐或范围无效
+    """
+    block = caps.get('block_size') or 4096
+    for op in plan:
+        if caps and op.op != OP_ZERO and not caps.get(_CAPABILITY[op.op]):
+            raise OSError(errno.EOPNOTSUPP, 'Filesystem does not support %s' % op.op)
+        if op.op in (OP_COLLAPSE, OP_INSERT):
+            if op.offset % block or op.length % block:
+                raise ValueError('%s range must be aligned to the block size (%d)' % (op.op, block))
+        if op.op == OP_COLLAPSE:
+            if op.offset + op.length >= size:
+                raise ValueError('collapse range must end before the end of the file')
+            size -= op.length
+        elif op.op == OP_INSERT:
+            if op.offset >= size:
+                raise ValueError('insert offset must be inside the file')
+            size += op.length
+
+
+def _write_zeros(fd: int, offset: int, length: int, size: int):
+    end = min(offset + length, size)
+    zeros = bytes(min(ZERO_CHUNK, max(0, end - offset)))
+    while offset < end:
+        step = min(len(zeros), end - offset)
+        sparse_io.write_at(fd, zeros[:step], offset)
+        offset += step
+
+
+def apply_edits(path: str, ops: List[RangeOp], caps: Optional[Dict] = None) -> Tuple[int, int, int]:
+    """
+    对文件就地应用区间操作
+    :param caps: fs_probe 能力字典 (空字典表示未知，不做能力检查)
+    :return: (原大小, 新大小, 实际执行的系统调用数)
+    """
+    caps = caps or {}
+    plan = plan_edits(ops)
+    fd = os.open(path, os.O_RDWR | getattr(os, 'O_BINARY', 0))
+    try:
+        size = os.fstat(fd).st_size
+        check_plan(plan, caps, size)
+        calls = 0
+        for op in plan:
+            try:
+                sparse_io.fallocate(fd, _MODES[op.op], op.offset, op.length)
+            except OSError as e:
+                if op.op != OP_ZERO or e.errno not in (errno.EOPNOTSUPP, errno.ENOSYS):
+                    raise
+                _write_zeros(fd, op.offset, op.length, size)
+            calls += 1
+        return size, os.fstat(fd).st_size, calls
+    finally:
+        os.close(fd)
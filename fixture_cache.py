@@ -0,0 +1,224 @@
+import hashlib
+import json
+import os
+from typing import List, Optional, Sequence, Tuple, Union
+
+import size_parser
+import sparse_io
+from layout import FileLayout, apply_layout
+
+
+# 缓存条目格式版本，生成方式变化时递增以使旧条目失效
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.sparse_file_generator', 'fixtures')
+DEFAULT_MAX_SIZE = 10 << 30
+
+# 复制回退时的单次读取量
+COPY_CHUNK = 1 << 20
+
+# 不含数据或只含结尾一个字节的布局，直接截断生成比克隆更快，不进入缓存
+LAYOUT_TAIL = 'tail'
+LAYOUT_HOLE = 'hole'
+LAYOUT_FULL = 'full'
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """基于 flock/msvcrt.locking 的跨进程排他锁 (pytest-xdist 的各个 worker 是独立进程)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fd = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            else:
+                msvcrt.locking(fd, msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            if blocking:
+                raise
+            return False
+        self.fd = fd
+        return True
+
+    def release(self):
+        if self.fd is not None:
+            if fcntl is None:
+                os.lseek(self.fd, 0, os.SEEK_SET)
+                msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
+            os.close(self.fd)
+            self.fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
+LayoutSpec = Union[str, FileLayout, Sequence[Tuple[int, int]], None]
+
+
+def normalize_layout(size: int, layout: LayoutSpec) -> Union[str, List[Tuple[int, int]]]:
+    """
+    把布局描述统一为 "tail"/"hole" 或按偏移排序的数据区间列表
+    :param layout: "tail" (默认，与命令行创建的文件相同)、"hole" (全空洞)、"full" (全部为数据)、
+                   [(偏移, 长度), ...] 或 layout.FileLayout (使用其中的区间)
+    """
+    if layout is None or layout == LAYOUT_TAIL:
+        return LAYOUT_TAIL
+    if layout == LAYOUT_HOLE:
+        return LAYOUT_HOLE
+    if layout == LAYOUT_FULL:
+        return [(0, size)] if size else LAYOUT_HOLE
+    if isinstance(layout, str):
+        raise ValueError('Unknown layout: %s' % layout)
+    extents = layout.extents if isinstance(layout, FileLayout) else layout
+    normalized = []
+    for offset, length in sorted((int(offset), int(length)) for offset, length in extents):
+        if offset < 0 or length <= 0 or offset + length > size:
+            raise ValueError('Extent (%d, %d) outside file of size %d' % (offset, length, size))
+        normalized.append((offset, length))
+    return normalized
+
+
+def cache_key(size: int, layout: Union[str, List[Tuple[int, int]]], seed: int) -> str:
+    """由规范化的布局描述计算内容寻址的缓存键"""
+    spec = json.dumps({'version': CACHE_VERSION, 'size': size, 'layout': layout, 'seed': seed},
+                      sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(spec.encode('utf-8')).hexdigest()
+
+
+def _allocated_bytes(st: os.stat_result) -> int:
+    blocks = getattr(st, 'st_blocks', None)
+    return blocks * 512 if blocks is not None else st.st_size
+
+
+def _clone(source: str, target: str, size: int) -> str:
+    """
+    把缓存条目克隆到目标路径: 优先 reflink (写时复制，不复制数据)，
+    否则截断到完整大小后只复制数据区间
+    :return: "reflink" 或 "copy"
+    """
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        try:
+            sparse_io.reflink(src.fileno(), dst.fileno())
+            return 'reflink'
+        except OSError:
+            pass
+        dst.truncate(size)
+        for offset, length in sparse_io.iter_data_extents(src.fileno(), size):
+            end = offset + length
+            while offset < end:
+                chunk = sparse_io.read_at(src.fileno(), min(COPY_CHUNK, end - offset), offset)
+                if not chunk:
+                    break
+                sparse_io.write_at(dst.fileno(), chunk, offset)
+                offset += len(chunk)
+    return 'copy'
+
+
+class SparseFixtureCache:
+    """
+    内容寻址的稀疏测试文件缓存
+    条目以布局描述的哈希命名，生成一次后在多次测试运行之间复用；
+    每个条目有独立的锁文件，多个进程同时请求同一条目时只生成一次；
+    超出容量上限时按最近使用时间 (mtime) 淘汰，正在使用的条目不会被淘汰
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_size: int = DEFAULT_MAX_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + '.img')
+
+    def _lock_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + '.lock')
+
+    def materialize(self, target: str, size: Union[int, str], layout: LayoutSpec = None, seed: int = 0) -> str:
+        """
+        在 target 处生成指定布局的文件
+        :param size: 显示大小，可为 "1GiB" 形式的字符串
+        :return: 生成方式 "truncate"、"reflink" 或 "copy"
+        """
+        if isinstance(size, str):
+            size = size_parser.parse_size(size)
+        normalized = normalize_layout(size, layout)
+        if not isinstance(normalized, list):
+            with open(target, 'wb') as f:
+                f.truncate(size)
+                if normalized == LAYOUT_TAIL and size:
+                    sparse_io.write_at(f.fileno(), b'\0', size - 1)
+            return 'truncate'
+
+        key = cache_key(size, normalized, seed)
+        entry = self._entry_path(key)
+        with FileLock(self._lock_path(key)):
+            if os.path.exists(entry):
+                self.hits += 1
+                os.utime(entry)
+            else:
+                self.misses += 1
+                temp = '%s.%d.tmp' % (entry, os.getpid())
+                apply_layout(temp, FileLayout(key, size, normalized), seed)
+                os.replace(temp, entry)
+                self.evict(keep=key)
+            return _clone(entry, target, size)
+
+    def usage(self) -> int:
+        """缓存条目实际占用的字节数"""
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.img'):
+                total += _allocated_bytes(entry.stat())
+        return total
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """
+        按最近使用时间淘汰条目，直到占用不超过上限
+        :param keep: 不淘汰的条目键
+        :return: 淘汰的条目数
+        """
+        with FileLock(os.path.join(self.cache_dir, 'evict.lock')):
+            entries = []
+            total = 0
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith('.img'):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, entry.name[:-4], _allocated_bytes(st)))
+                    total += _allocated_bytes(st)
+            entries.sort()
+
+            evicted = 0
+            for _mtime, key, allocated in entries:
+                if total <= self.max_size:
+                    break
+                if key == keep:
+                    continue
+                lock = FileLock(self._lock_path(key))
+                if not lock.acquire(blocking=False):
+                    continue
+                try:
+                    os.unlink(self._entry_path(key))
+                    total -= allocated
+                    evicted += 1
+                except FileNotFoundError:
+                    pass
+                finally:
+                    lock.release()
+            return evicted
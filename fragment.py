@@ -0,0 +1,101 @@
+import errno
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import rate_limit
+import sparse_io
+from layout import pattern_bytes
+
+
+DEFAULT_CHUNK = 64 << 10
+
+# 填充阶段的单次写入量
+FILL_CHUNK = 8 << 20
+
+
+def _allocate_round(fds: List[int], offset: int, length: int, use_fallocate: bool, seed: int) -> bool:
+    """
+    为一组文件在同一偏移各分配一个分块，按文件顺序依次进行
+    fallocate 立即分配块，相邻文件的分块因此在物理上交错；
+    不支持时退回写入后逐个 fdatasync，强制延迟分配按同样的顺序落盘
+    :return: 本轮之后是否仍可使用 fallocate
+    """
+    if use_fallocate:
+        try:
+            for fd in fds:
+                # 与 sparse_io.write_at 一样计入数据令牌桶
+                with rate_limit.data_write(length):
+                    sparse_io.fallocate(fd, 0, offset, length)
+            return True
+        except OSError as e:
+            if e.errno not in (errno.EOPNOTSUPP, errno.ENOSYS):
+                raise
+    data = pattern_bytes(seed, offset, length)
+    for fd in fds:
+        sparse_io.write_at(fd, data, offset)
+    sync = getattr(os, 'fdatasync', os.fsync)
+    for fd in fds:
+        sync(fd)
+    return False
+
+
+def _fill(fd: int, size: int, seed: int) -> int:
+    """按顺序大块写入图案数据，覆盖已分配的区间而不改变其物理位置"""
+    offset = 0
+    while offset < size:
+        length = min(FILL_CHUNK, size - offset)
+        sparse_io.write_at(fd, pattern_bytes(seed, offset, length), offset)
+        offset += length
+    return size
+
+
+def make_fragmented(paths: List[str], size: int, chunk: int = DEFAULT_CHUNK, interleave: Optional[int] = None,
+                    fill: bool = True, seed: int = 0, workers: Optional[int] = None) -> List[Dict]:
+    """
+    生成碎片化的文件: 以 chunk 为单位轮流为多个文件分配空间，使各文件的区间在磁盘上交错
+    分配阶段只做元数据操作 (每个分块一次 fallocate)，数据在第二阶段按文件顺序大块写入，
+    所以即使是数百万个区间也只需要少量的数据写入调用
+    :param paths: 目标文件路径列表
+    :param size: 每个文件的大小
+    :param chunk: 分配粒度，应为文件系统块大小的整数倍
+    :param interleave: 交错度，即同时轮流写入的文件数 (默认全部)；1 表示逐个文件顺序写入
+    :param fill: 是否写入图案数据；否则保留为已分配未写入的区间 (退回写入方式时总会写入数据)
+    :param seed: 图案种子
+    :param workers: 填充阶段的线程数
+    :return: 每个文件的报告 [{"path", "size", "chunks", "extents", "extent_source"}]
+    """
+    if chunk <= 0 or size < 0:
+        raise ValueError('Invalid chunk or size')
+    degree = max(1, min(interleave or len(paths), len(paths)))
+
+    fds = []
+    for path in paths:
+        with rate_limit.metadata_op():
+            fds.append(os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644))
+    try:
+        use_fallocate = True
+        for start in range(0, len(fds), degree):
+            group = fds[start:start + degree]
+            for offset in range(0, size, chunk):
+                use_fallocate = _allocate_round(group, offset, min(chunk, size - offset), use_fallocate, seed)
+
+        if fill and use_fallocate:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(lambda fd: _fill(fd, size, seed), fds))
+
+        reports = []
+        for path, fd in zip(paths, fds):
+            os.fsync(fd)
+            extents, source = sparse_io.count_extents(fd)
+            reports.append({
+                'path': path,
+                'size': size,
+                'chunks': -(-size // chunk),
+                'extents': extents,
+                'extent_source': source,
+            })
+        return reports
+    finally:
+        for fd in fds:
+            os.close(fd)
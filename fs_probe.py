@@ -0,0 +1,229 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+import sparse_io
+
+
+# 探测结果格式版本，字段变化时递增以使旧缓存失效
+PROBE_VERSION = 3
+
+CONFIG_DIR = os.path.join(os.path.expanduser('~'), '.sparse_file_generator')
+CACHE_FILE = os.path.join(CONFIG_DIR, 'fs_capabilities.json')
+
+# 用于探测空洞粒度的写入位置 (1MiB 边界前一个字节)
+_GRANULARITY_PROBE_OFFSET = 1 << 20
+
+_memory_cache: Dict[str, Dict] = {}
+_cache_lock = threading.Lock()
+
+
+def _device_identity(directory: str):
+    """返回目录所在设备的缓存键 (st_dev) 以及文件系统 ID"""
+    key = str(os.stat(directory).st_dev)
+    fsid = None
+    if hasattr(os, 'statvfs'):
+        try:
+            fsid = os.statvfs(directory).f_fsid
+        except (OSError, AttributeError):
+            pass
+    return key, fsid
+
+
+def _load_cache() -> Dict:
+    """读取磁盘上的能力缓存"""
+    try:
+        if os.path.exists(CACHE_FILE):
+            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except Exception:
+        pass
+    return {}
+
+
+def _save_cache(key: str, caps: Dict):
+    """把单个设备的探测结果合并写入磁盘缓存"""
+    try:
+        if not os.path.exists(CONFIG_DIR):
+            os.makedirs(CONFIG_DIR)
+        cache = _load_cache()
+        cache[key] = caps
+        tmp_file = CACHE_FILE + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, CACHE_FILE)
+    except Exception:
+        pass
+
+
+def _is_valid(caps: Optional[Dict], fsid) -> bool:
+    return bool(caps) and caps.get('version') == PROBE_VERSION and caps.get('fsid') == fsid
+
+
+def _probe_max_file_size(fd: int) -> Optional[int]:
+    """通过 ftruncate 二分查找文件系统允许的最大文件大小"""
+    upper = (1 << 63) - 1
+    try:
+        os.ftruncate(fd, upper)
+        return upper
+    except (OSError, OverflowError):
+        pass
+    low, high = _GRANULARITY_PROBE_OFFSET, upper
+    while low < high:
+        mid = (low + high + 1) // 2
+        try:
+            os.ftruncate(fd, mid)
+            low = mid
+        except (OSError, OverflowError):
+            high = mid - 1
+    return low
+
+
+def _is_rotational(device: int) -> Optional[bool]:
+    """
+    读取块设备的 queue/rotational 判断是否为机械硬盘 (仅 Linux)
+    分区没有自己的 queue 目录，需要查看其所属磁盘；网络或虚拟文件系统返回 None
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+    base = '/sys/dev/block/%d:%d' % (os.major(device), os.minor(device))
+    for queue_dir in (os.path.join(base, 'queue'), os.path.join(base, '..', 'queue')):
+        try:
+            with open(os.path.join(queue_dir, 'rotational'), 'r') as f:
+                return f.read().strip() == '1'
+        except OSError:
+            continue
+    return None
+
+
+def probe_filesystem(directory: str) -> Dict:
+    """
+    在目录中创建临时文件，探测所在文件系统的稀疏文件相关能力
+    :param directory: 目标目录
+    :return: 能力字典
+    """
+    caps = {
+        'version': PROBE_VERSION,
+        'probed_at': int(time.time()),
+        'block_size': None,
+        'sparse': False,
+        'seek_hole': False,
+        'hole_granularity': None,
+        'punch_hole': False,
+        'zero_range': False,
+        'collapse_range': False,
+        'insert_range': False,
+        'posix_fallocate': False,
+        'reflink': False,
+        'max_file_size': None,
+        'rotational': None,
+    }
+    fd, path = tempfile.mkstemp(prefix='.sfg-probe-', dir=directory)
+    try:
+        st = os.fstat(fd)
+        caps['block_size'] = getattr(st, 'st_blksize', None)
+        caps['rotational'] = _is_rotational(st.st_dev)
+
+        # 空洞与 SEEK_DATA：写入 1MiB 边界前的一个字节，数据起点即为分配粒度
+        sparse_io.write_at(fd, b'\x01', _GRANULARITY_PROBE_OFFSET - 1)
+        if sparse_io.supports_seek_hole():
+            try:
+                data_start = os.lseek(fd, 0, os.SEEK_DATA)
+                caps['seek_hole'] = True
+                if data_start > 0:
+                    caps['sparse'] = True
+                    caps['hole_granularity'] = _GRANULARITY_PROBE_OFFSET - data_start
+            except OSError:
+                pass
+        if not caps['sparse']:
+            blocks = getattr(os.fstat(fd), 'st_blocks', None)
+            caps['sparse'] = blocks is not None and blocks * 512 < _GRANULARITY_PROBE_OFFSET
+
+        # 打洞：先写满一个粒度的数据再尝试打洞
+        granule = caps['hole_granularity'] or caps['block_size'] or 4096
+        if caps['sparse']:
+            try:
+                sparse_io.write_at(fd, b'\x01' * granule, 0)
+                sparse_io.fallocate(fd, sparse_io.FALLOC_FL_PUNCH_HOLE | sparse_io.FALLOC_FL_KEEP_SIZE, 0, granule)
+                caps['punch_hole'] = True
+            except OSError:
+                pass
+
+        if hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(fd, 0, granule)
+                caps['posix_fallocate'] = True
+            except OSError:
+                pass
+
+        # 区间编辑：文件此时约 1MiB，在开头依次尝试置零、折叠和插入一个块 (插入恢复折叠前的大小)
+        block = caps['block_size'] or 4096
+        for key, mode in (('zero_range', sparse_io.FALLOC_FL_ZERO_RANGE | sparse_io.FALLOC_FL_KEEP_SIZE),
+                          ('collapse_range', sparse_io.FALLOC_FL_COLLAPSE_RANGE),
+                          ('insert_range', sparse_io.FALLOC_FL_INSERT_RANGE)):
+            try:
+                sparse_io.fallocate(fd, mode, 0, block)
+                caps[key] = True
+            except OSError:
+                pass
+
+        # reflink：克隆到同目录下的第二个临时文件
+        clone_fd, clone_path = tempfile.mkstemp(prefix='.sfg-probe-', dir=directory)
+        try:
+            sparse_io.reflink(fd, clone_fd)
+            caps['reflink'] = True
+        except OSError:
+            pass
+        finally:
+            os.close(clone_fd)
+            os.unlink(clone_path)
+
+        # 只有支持稀疏文件时 ftruncate 才是廉价的，否则退回 pathconf
+        if caps['sparse']:
+            caps['max_file_size'] = _probe_max_file_size(fd)
+        elif hasattr(os, 'pathconf'):
+            try:
+                bits = os.pathconf(directory, 'PC_FILESIZEBITS')
+                if bits > 0:
+                    caps['max_file_size'] = (1 << (bits - 1)) - 1
+            except (OSError, ValueError):
+                pass
+    finally:
+        os.close(fd)
+        os.unlink(path)
+    return caps
+
+
+def get_capabilities(directory: str, refresh: bool = False) -> Dict:
+    """
+    获取目录所在文件系统的能力，按 st_dev 在内存和磁盘上缓存
+    探测失败 (例如目录不可写) 时返回空字典且不缓存
+    :param directory: 目标目录
+    :param refresh: 是否忽略缓存重新探测
+    """
+    key, fsid = _device_identity(directory)
+    caps = _memory_cache.get(key)
+    if not refresh and _is_valid(caps, fsid):
+        return caps
+
+    with _cache_lock:
+        if not refresh:
+            caps = _memory_cache.get(key)
+            if _is_valid(caps, fsid):
+                return caps
+            caps = _load_cache().get(key)
+            if _is_valid(caps, fsid):
+                _memory_cache[key] = caps
+                return caps
+        try:
+            caps = probe_filesystem(directory)
+        except OSError:
+            return {}
+        caps['fsid'] = fsid
+        _memory_cache[key] = caps
+        _save_cache(key, caps)
+    return caps
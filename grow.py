@@ -0,0 +1,118 @@
+import heapq
+import os
+import time
+from typing import Dict, List, Optional
+
+import rate_limit
+import sparse_io
+from layout import pattern_bytes
+
+
+MODE_TRUNCATE = 'truncate'
+MODE_APPEND = 'append'
+
+# 追加模式下单次写入的上限，避免落后很多时一次性分配过大的缓冲区
+MAX_WRITE = 8 << 20
+
+
+class GrowingFile:
+    """一个按目标速率增长的文件"""
+
+    __slots__ = ('path', 'fd', 'start_size', 'size', 'limit', 'started', 'finished')
+
+    def __init__(self, path: str, limit: Optional[int]):
+        self.path = path
+        with rate_limit.metadata_op():
+            self.fd = os.open(path, os.O_WRONLY | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+        self.start_size = self.size = os.fstat(self.fd).st_size
+        self.limit = limit
+        self.started = 0.0
+        self.finished = 0.0
+
+    def grow_to(self, target: int, mode: str, seed: int):
+        """把文件增长到 target 字节：截断模式只改显示大小，追加模式写入图案数据"""
+        if mode == MODE_TRUNCATE:
+            os.ftruncate(self.fd, target)
+            self.size = target
+            return
+        while self.size < target:
+            length = min(MAX_WRITE, target - self.size)
+            sparse_io.write_at(self.fd, pattern_bytes(seed, self.size, length), self.size)
+            self.size += length
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+def run_growth(paths: List[str], rate: int, mode: str = MODE_TRUNCATE, duration: Optional[float] = None,
+               limit: Optional[int] = None, interval: float = 0.1, seed: int = 0) -> List[Dict]:
+    """
+    在单个线程的定时循环中让多个文件按目标速率增长
+    定时器是按到期时间排序的堆，同一时刻到期的文件在一次唤醒中处理；
+    每次按 "已经过的单调时间 x 速率" 计算目标大小，因此定时抖动不会累积成速率误差
+    :param paths: 文件路径列表 (不存在则创建，已存在则从当前大小继续增长)
+    :param rate: 每个文件的目标速率 (字节/秒)
+    :param mode: truncate 或 append
+    :param duration: 运行秒数，None 表示直到达到 limit 或被中断
+    :param limit: 每个文件的最大大小
+    :param interval: 每个文件的增长间隔 (秒)
+    :param seed: 追加模式的图案种子
+    :return: 每个文件的报告 [{"path", "size", "target_rate", "achieved_rate", "bytes", "seconds"}]，size 为结束时的大小
+    :raises ValueError: 间隔不是正数时 (否则定时循环会空转)
+    """
+    if not interval > 0:
+        raise ValueError('Interval must be positive')
+    files = [GrowingFile(path, limit) for path in paths]
+    start = time.monotonic()
+    deadline = start + duration if duration is not None else None
+    # 错开各文件的首次到期时间，把系统调用均匀分布在一个间隔内
+    heap = [(start + interval * i / len(files), i) for i in range(len(files))]
+    for growing in files:
+        growing.started = start
+
+    try:
+        while heap:
+            due, index = heap[0]
+            now = time.monotonic()
+            if due > now:
+                time.sleep(due - now)
+                continue
+            heapq.heappop(heap)
+            growing = files[index]
+
+            target = growing.start_size + int(rate * (now - growing.started))
+            if growing.limit is not None:
+                target = min(target, growing.limit)
+            if target > growing.size:
+                growing.grow_to(target, mode, seed)
+
+            if (growing.limit is not None and growing.size >= growing.limit) or \
+                    (deadline is not None and now >= deadline):
+                growing.finished = now
+                continue
+            next_due = due + interval
+            if deadline is not None:
+                next_due = min(next_due, deadline)
+            heapq.heappush(heap, (max(next_due, now), index))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        end = time.monotonic()
+        for growing in files:
+            growing.close()
+
+    reports = []
+    for growing in files:
+        seconds = (growing.finished or end) - growing.started
+        grown = growing.size - growing.start_size
+        reports.append({
+            'path': growing.path,
+            'size': growing.size,
+            'target_rate': rate,
+            'achieved_rate': grown / seconds if seconds > 0 else 0.0,
+            'bytes': grown,
+            'seconds': round(seconds, 3),
+        })
+    return reports
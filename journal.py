@@ -0,0 +1,102 @@
+import json
+import os
+import time
+from typing import Set
+
+
+class BatchJournal:
+    """
+    批量/目录树任务的追加式预写日志 (JSONL)
+    记录类型:
+      {"op": "begin", "fingerprint": ..., "total": N}   任务定义
+      {"op": "plan", "start": i, "end": j}              已提交的条目区间
+      {"op": "done", "i": k}                            已完成的条目
+      {"op": "checkpoint", "done": n, "time": t}        检查点 (刷新并 fsync)
+      {"op": "complete"}                                任务全部完成
+    写入经过大缓冲区，只在检查点时 fsync，不会每个文件都同步一次
+    """
+
+    def __init__(self, path: str, fingerprint: str, total: int,
+                 checkpoint_interval: int = 10000, checkpoint_seconds: float = 5.0,
+                 buffer_size: int = 1 << 20):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.total = total
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_seconds = checkpoint_seconds
+        self.buffer_size = buffer_size
+        self._file = None
+        self._done_count = 0
+        self._since_checkpoint = 0
+        self._last_checkpoint = time.monotonic()
+
+    def load_completed(self) -> Set[int]:
+        """
+        读取已有日志中记录为完成的条目
+        任务定义不一致或日志不存在时返回空集合；崩溃时写了一半的末行会被忽略
+        """
+        completed = set()
+        if not os.path.exists(self.path):
+            return completed
+        with open(self.path, 'r', encoding='utf-8') as f:
+            first = f.readline()
+            try:
+                header = json.loads(first)
+            except ValueError:
+                return completed
+            if header.get('op') != 'begin' or header.get('fingerprint') != self.fingerprint:
+                return completed
+            for line in f:
+                if not line.startswith('{"op": "done"'):
+                    continue
+                try:
+                    completed.add(json.loads(line)['i'])
+                except (ValueError, KeyError):
+                    continue
+        return completed
+
+    def open(self, resume: bool):
+        """
+        打开日志文件
+        :param resume: 为 True 时在已有日志后追加，否则重新开始并写入任务定义
+        """
+        if resume and os.path.exists(self.path):
+            self._file = open(self.path, 'a', encoding='utf-8', buffering=self.buffer_size)
+        else:
+            self._file = open(self.path, 'w', encoding='utf-8', buffering=self.buffer_size)
+            self._write({'op': 'begin', 'fingerprint': self.fingerprint, 'total': self.total})
+            self.checkpoint()
+
+    def _write(self, record):
+        self._file.write(json.dumps(record) + '\n')
+
+    def record_plan(self, start: int, end: int):
+        """记录即将提交的条目区间 [start, end)"""
+        self._write({'op': 'plan', 'start': start, 'end': end})
+
+    def record_done(self, index: int):
+        """记录一个已完成的条目，按条数或时间间隔自动打检查点"""
+        self._file.write('{"op": "done", "i": %d}\n' % index)
+        self._done_count += 1
+        self._since_checkpoint += 1
+        if (self._since_checkpoint >= self.checkpoint_interval
+                or time.monotonic() - self._last_checkpoint >= self.checkpoint_seconds):
+            self.checkpoint()
+
+    def checkpoint(self):
+        """写入检查点记录，刷新缓冲区并 fsync"""
+        self._write({'op': 'checkpoint', 'done': self._done_count, 'time': int(time.time())})
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._since_checkpoint = 0
+        self._last_checkpoint = time.monotonic()
+
+    def close(self, complete: bool = False):
+        """关闭日志；complete 为 True 时写入完成标记"""
+        if self._file is None:
+            return
+        if complete:
+            self._write({'op': 'complete'})
+        self.checkpoint()
+        self._file.close()
+        self._file = None
@@ -113,7 +113,65 @@ class LanguageManager:
             "indexing": "索引",
             "open_source_link": "开源链接",
             "link_opened": "链接已打开",
-            "failed_to_open_link": "无法打开链接"
+            "failed_to_open_link": "无法打开链接",
+            "size_exceeds_fs_limit": "文件大小 {} 字节超出目标文件系统的上限 {} 字节",
+            "fs_not_sparse_no_space": "目标文件系统不支持稀疏文件，需要 {} 字节但仅有 {} 字节可用",
+            "cli_probe_failed": "错误: 文件系统探测失败 - {}",
+            "cli_batch_summary": "完成: 创建 {} 个文件，跳过 {} 个已完成文件，失败 {} 个",
+            "cli_manifest_invalid": "错误: 清单文件无效 - {}",
+            "cli_registry_missing": "缺失: {}",
+            "cli_registry_size_mismatch": "大小不符: {} (登记 {} 字节，实际 {} 字节)",
+            "cli_verify_summary": "校验完成: 正常 {} 个，缺失 {} 个，大小不符 {} 个，无法访问 {} 个",
+            "cli_purge_summary": "已删除 {} 个文件，失败 {} 个",
+            "cli_purge_dry_run": "将删除 {} 个文件 (未执行)",
+            "cli_archive_failed": "错误: 归档操作失败 - {}",
+            "cli_export_summary": "已导出 {} 个文件: 显示大小 {} 字节，实际读取数据 {} 字节",
+            "cli_import_summary": "已还原 {} 个文件",
+            "cli_image_failed": "错误: 磁盘镜像创建失败 - {}",
+            "cli_image_created": "磁盘镜像已创建: {} ({} 字节，{} 个分区)",
+            "cli_layout_failed": "错误: 布局操作失败 - {}",
+            "cli_layout_captured": "已捕获 {} 个文件的布局，共 {} 个数据区间",
+            "cli_layout_replayed": "已重放 {} 个文件: 写入数据 {} 字节，失败 {} 个",
+            "cli_diff_failed": "错误: 文件比较失败 - {}",
+            "job_queue": "任务队列",
+            "add_to_queue": "加入队列",
+            "load_manifest": "加载清单...",
+            "start_queue": "开始执行",
+            "clear_queue": "清空队列",
+            "workers": "并发数:",
+            "job_name": "文件名",
+            "job_status": "状态",
+            "job_pending": "等待中",
+            "job_running": "执行中",
+            "job_done": "已完成",
+            "job_failed": "失败: {}",
+            "queue_stats": "已完成 {}/{}，{} 个文件/秒，{} MB/秒",
+            "select_manifest": "选择清单文件",
+            "cli_grow_summary": "{} 个文件，目标速率 {} 字节/秒，平均实际速率 {} 字节/秒",
+            "cli_fragment_summary": "{} 个文件，共 {} 个区间，用时 {} 秒",
+            "cli_plan_no_space": "错误: 剩余空间不足，未开始创建: {}",
+            "cli_plan_trimmed": "空间不足，已从计划中移除: {}",
+            "cli_device_throughput": "设备 {}: {} 个文件，并发 {}，用时 {} 秒，{} 文件/秒",
+            "cli_rate_limit_ops": "元数据限速 {}/秒: {} 次操作，等待 {} 秒，降速 {} 次，当前 {}/秒",
+            "cli_rate_limit_bytes": "写入限速 {} 字节/秒: {} 字节，等待 {} 秒，降速 {} 次，当前 {} 字节/秒",
+            "cli_bench_failed": "错误: 读取测试失败 - {}",
+            "cli_edit_summary": "已应用 {} 个操作 (合并为 {} 次系统调用)，文件大小 {} → {}",
+            "cli_edit_failed": "错误: 编辑文件失败 - {}",
+            "cli_content_verify_summary": "内容校验: {} 个文件一致，{} 个文件不一致，{} 个未校验完，共比较 {} 字节",
+            "cli_content_verify_stopped": "已在第一处不一致后停止 (使用 --all 报告全部差异)",
+            "cli_content_verify_failed": "错误: 内容校验失败 - {}",
+            "cli_densify_progress": "已分配 {} / {} 字节 ({} 字节/秒)",
+            "cli_densify_summary": "已填充 {} 个文件的空洞，共 {} 字节，用时 {} 秒，{} 字节/秒",
+            "cli_densify_failed": "错误: 填充空洞失败 - {}",
+            "cli_scan_summary": "已扫描 {} 个目录、{} 个文件，其中稀疏文件 {} 个；显示大小共 {} 字节，实际分配 {} 字节，错误 {} 个",
+            "cli_scan_failed": "错误: 扫描失败 - {}",
+            "cli_snapshot_created": "已创建快照 {}: {} 个数据区间，{} 个分块，数据 {} 字节压缩为 {} 字节",
+            "cli_snapshot_restored": "已恢复 {} (显示大小 {} 字节): 解压 {} 个分块，写入 {} 字节",
+            "cli_snapshot_failed": "错误: 快照操作失败 - {}",
+            "cli_invalid_rate": "错误: 无效的限速选项 - {}",
+            "cli_rate_limit_processes": "错误: --ops-rate/--bytes-rate 不能与 --processes 同时使用 (各进程无法共享配额)",
+            "cli_registry_unreadable": "无法访问: {} - {}",
+            "cli_output_mode_unsupported": "错误: {} 子命令不支持 --output-mode {}"
         }
         
         # 英文
@@ -204,7 +262,65 @@ class LanguageManager:
             "indexing": "Indexing",
             "open_source_link": "Open Source Link",
             "link_opened": "Link opened",
-            "failed_to_open_link": "Failed to open link"
+            "failed_to_open_link": "Failed to open link",
+            "size_exceeds_fs_limit": "File size {} bytes exceeds the target filesystem limit of {} bytes",
+            "fs_not_sparse_no_space": "Target filesystem does not support sparse files: {} bytes needed but only {} bytes available",
+            "cli_probe_failed": "Error: Filesystem probe failed - {}",
+            "cli_batch_summary": "Done: {} files created, {} already completed files skipped, {} failed",
+            "cli_manifest_invalid": "Error: Invalid manifest - {}",
+            "cli_registry_missing": "Missing: {}",
+            "cli_registry_size_mismatch": "Size mismatch: {} (registered {} bytes, actual {} bytes)",
+            "cli_verify_summary": "Verification done: {} OK, {} missing, {} size mismatches, {} unreadable",
+            "cli_purge_summary": "Removed {} files, {} failed",
+            "cli_purge_dry_run": "Would remove {} files (dry run)",
+            "cli_archive_failed": "Error: Archive operation failed - {}",
+            "cli_export_summary": "Exported {} files: {} bytes apparent size, {} bytes of data read",
+            "cli_import_summary": "Restored {} files",
+            "cli_image_failed": "Error: Disk image creation failed - {}",
+            "cli_image_created": "Disk image created: {} ({} bytes, {} partitions)",
+            "cli_layout_failed": "Error: Layout operation failed - {}",
+            "cli_layout_captured": "Captured layouts of {} files with {} data extents",
+            "cli_layout_replayed": "Replayed {} files: {} bytes of data written, {} failed",
+            "cli_diff_failed": "Error: File comparison failed - {}",
+            "job_queue": "Job Queue",
+            "add_to_queue": "Add to Queue",
+            "load_manifest": "Load Manifest...",
+            "start_queue": "Start",
+            "clear_queue": "Clear Queue",
+            "workers": "Workers:",
+            "job_name": "File Name",
+            "job_status": "Status",
+            "job_pending": "Pending",
+            "job_running": "Running",
+            "job_done": "Done",
+            "job_failed": "Failed: {}",
+            "queue_stats": "Finished {}/{}, {} files/s, {} MB/s",
+            "select_manifest": "Select Manifest File",
+            "cli_grow_summary": "{} files, target rate {} bytes/s, average achieved rate {} bytes/s",
+            "cli_fragment_summary": "{} files, {} extents in total, {} s",
+            "cli_plan_no_space": "Error: Not enough free space, nothing was created: {}",
+            "cli_plan_trimmed": "Removed from the plan (no space): {}",
+            "cli_device_throughput": "Device {}: {} files, {} workers, {} s, {} files/s",
+            "cli_rate_limit_ops": "Metadata limit {}/s: {} ops, throttled {} s, {} back-offs, now {}/s",
+            "cli_rate_limit_bytes": "Write limit {} bytes/s: {} bytes, throttled {} s, {} back-offs, now {} bytes/s",
+            "cli_bench_failed": "Error: Read benchmark failed - {}",
+            "cli_edit_summary": "Applied {} operations ({} system calls after merging), file size {} → {}",
+            "cli_edit_failed": "Error: Failed to edit file - {}",
+            "cli_content_verify_summary": "Content verification: {} files match, {} files differ, {} not fully checked, {} bytes compared",
+            "cli_content_verify_stopped": "Stopped after the first mismatch (use --all to report every difference)",
+            "cli_content_verify_failed": "Error: Content verification failed - {}",
+            "cli_densify_progress": "Allocated {} / {} bytes ({} bytes/s)",
+            "cli_densify_summary": "Filled holes in {} files, {} bytes in {} s, {} bytes/s",
+            "cli_densify_failed": "Error: Failed to fill holes - {}",
+            "cli_scan_summary": "Scanned {} directories and {} files, {} sparse; apparent size {} bytes, allocated {} bytes, {} errors",
+            "cli_scan_failed": "Error: Scan failed - {}",
+            "cli_snapshot_created": "Snapshot created {}: {} data extents, {} chunks, {} data bytes compressed to {} bytes",
+            "cli_snapshot_restored": "Restored {} (apparent size {} bytes): {} chunks decompressed, {} bytes written",
+            "cli_snapshot_failed": "Error: Snapshot operation failed - {}",
+            "cli_invalid_rate": "Error: Invalid rate limit option - {}",
+            "cli_rate_limit_processes": "Error: --ops-rate/--bytes-rate cannot be combined with --processes (processes cannot share the quota)",
+            "cli_registry_unreadable": "Unreadable: {} - {}",
+            "cli_output_mode_unsupported": "Error: the {} command does not support --output-mode {}"
         }
         
         # 日文
@@ -295,7 +411,65 @@ class LanguageManager:
             "indexing": "インデックス",
             "open_source_link": "オープンソースリンク",
             "link_opened": "リンクが開かれました",
-            "failed_to_open_link": "リンクを開けませんでした"
+            "failed_to_open_link": "リンクを開けませんでした",
+            "size_exceeds_fs_limit": "ファイルサイズ {} バイトが対象ファイルシステムの上限 {} バイトを超えています",
+            "fs_not_sparse_no_space": "対象ファイルシステムはスパースファイルをサポートしていません: {} バイト必要ですが、空きは {} バイトです",
+            "cli_probe_failed": "エラー: ファイルシステムの調査に失敗しました - {}",
+            "cli_batch_summary": "完了: {} 個のファイルを作成、完了済み {} 個をスキップ、{} 個が失敗",
+            "cli_manifest_invalid": "エラー: マニフェストが無効です - {}",
+            "cli_registry_missing": "見つかりません: {}",
+            "cli_registry_size_mismatch": "サイズ不一致: {} (登録 {} バイト、実際 {} バイト)",
+            "cli_verify_summary": "検証完了: 正常 {} 個、欠落 {} 個、サイズ不一致 {} 個、アクセス不可 {} 個",
+            "cli_purge_summary": "{} 個のファイルを削除、{} 個が失敗",
+            "cli_purge_dry_run": "{} 個のファイルが削除対象です (ドライラン)",
+            "cli_archive_failed": "エラー: アーカイブ操作に失敗しました - {}",
+            "cli_export_summary": "{} 個のファイルをエクスポート: 表示サイズ {} バイト、読み取ったデータ {} バイト",
+            "cli_import_summary": "{} 個のファイルを復元しました",
+            "cli_image_failed": "エラー: ディスクイメージの作成に失敗しました - {}",
+            "cli_image_created": "ディスクイメージを作成しました: {} ({} バイト、{} 個のパーティション)",
+            "cli_layout_failed": "エラー: レイアウト操作に失敗しました - {}",
+            "cli_layout_captured": "{} 個のファイルのレイアウトを取得しました (データ領域 {} 個)",
+            "cli_layout_replayed": "{} 個のファイルを再現: {} バイトのデータを書き込み、{} 個が失敗",
+            "cli_diff_failed": "エラー: ファイルの比較に失敗しました - {}",
+            "job_queue": "ジョブキュー",
+            "add_to_queue": "キューに追加",
+            "load_manifest": "マニフェストを読み込む...",
+            "start_queue": "開始",
+            "clear_queue": "キューをクリア",
+            "workers": "並列数:",
+            "job_name": "ファイル名",
+            "job_status": "状態",
+            "job_pending": "待機中",
+            "job_running": "実行中",
+            "job_done": "完了",
+            "job_failed": "失敗: {}",
+            "queue_stats": "完了 {}/{}、{} ファイル/秒、{} MB/秒",
+            "select_manifest": "マニフェストファイルを選択",
+            "cli_grow_summary": "{} 個のファイル、目標速度 {} バイト/秒、実際の平均速度 {} バイト/秒",
+            "cli_fragment_summary": "{} 個のファイル、合計 {} 個のエクステント、{} 秒",
+            "cli_plan_no_space": "エラー: 空き容量が不足しているため作成を開始しませんでした: {}",
+            "cli_plan_trimmed": "容量不足のため計画から除外しました: {}",
+            "cli_device_throughput": "デバイス {}: {} 個のファイル、並列数 {}、{} 秒、{} ファイル/秒",
+            "cli_rate_limit_ops": "メタデータ制限 {}/秒: {} 回の操作、待機 {} 秒、減速 {} 回、現在 {}/秒",
+            "cli_rate_limit_bytes": "書き込み制限 {} バイト/秒: {} バイト、待機 {} 秒、減速 {} 回、現在 {} バイト/秒",
+            "cli_bench_failed": "エラー: 読み取りベンチマークに失敗しました - {}",
+            "cli_edit_summary": "{} 個の操作を適用しました (統合後 {} 回のシステムコール)、ファイルサイズ {} → {}",
+            "cli_edit_failed": "エラー: ファイルの編集に失敗しました - {}",
+            "cli_content_verify_summary": "内容検証: {} 個のファイルが一致、{} 個のファイルが不一致、{} 個が未完了、{} バイトを比較しました",
+            "cli_content_verify_stopped": "最初の不一致で停止しました (すべての差異を報告するには --all を使用)",
+            "cli_content_verify_failed": "エラー: 内容検証に失敗しました - {}",
+            "cli_densify_progress": "{} / {} バイトを割り当て済み ({} バイト/秒)",
+            "cli_densify_summary": "{} 個のファイルの穴を埋めました。合計 {} バイト、{} 秒、{} バイト/秒",
+            "cli_densify_failed": "エラー: 穴の埋め込みに失敗しました - {}",
+            "cli_scan_summary": "{} 個のディレクトリと {} 個のファイルをスキャンしました。スパースファイル {} 個、見かけのサイズ {} バイト、実割り当て {} バイト、エラー {} 件",
+            "cli_scan_failed": "エラー: スキャンに失敗しました - {}",
+            "cli_snapshot_created": "スナップショットを作成しました {}: データ領域 {} 個、チャンク {} 個、データ {} バイトを {} バイトに圧縮",
+            "cli_snapshot_restored": "{} を復元しました (見かけのサイズ {} バイト): {} 個のチャンクを展開、{} バイトを書き込み",
+            "cli_snapshot_failed": "エラー: スナップショット操作に失敗しました - {}",
+            "cli_invalid_rate": "エラー: 無効なレート制限オプション - {}",
+            "cli_rate_limit_processes": "エラー: --ops-rate/--bytes-rate は --processes と併用できません (プロセス間でクォータを共有できません)",
+            "cli_registry_unreadable": "アクセス不可: {} - {}",
+            "cli_output_mode_unsupported": "エラー: {} コマンドは --output-mode {} に対応していません"
         }
         
         # 韩文
@@ -386,7 +560,65 @@ class LanguageManager:
             "indexing": "인덱싱",
             "open_source_link": "오픈소스 링크",
             "link_opened": "링크가 열렸습니다",
-            "failed_to_open_link": "링크를 열 수 없습니다"
+            "failed_to_open_link": "링크를 열 수 없습니다",
+            "size_exceeds_fs_limit": "파일 크기 {} 바이트가 대상 파일 시스템의 한도 {} 바이트를 초과합니다",
+            "fs_not_sparse_no_space": "대상 파일 시스템이 희소 파일을 지원하지 않습니다: {} 바이트가 필요하지만 {} 바이트만 사용 가능합니다",
+            "cli_probe_failed": "오류: 파일 시스템 검사 실패 - {}",
+            "cli_batch_summary": "완료: 파일 {}개 생성, 완료된 파일 {}개 건너뜀, {}개 실패",
+            "cli_manifest_invalid": "오류: 잘못된 매니페스트 - {}",
+            "cli_registry_missing": "누락: {}",
+            "cli_registry_size_mismatch": "크기 불일치: {} (등록 {} 바이트, 실제 {} 바이트)",
+            "cli_verify_summary": "검증 완료: 정상 {}개, 누락 {}개, 크기 불일치 {}개, 접근 불가 {}개",
+            "cli_purge_summary": "파일 {}개 삭제, {}개 실패",
+            "cli_purge_dry_run": "파일 {}개가 삭제될 예정입니다 (시험 실행)",
+            "cli_archive_failed": "오류: 아카이브 작업 실패 - {}",
+            "cli_export_summary": "파일 {}개 내보냄: 표시 크기 {} 바이트, 읽은 데이터 {} 바이트",
+            "cli_import_summary": "파일 {}개 복원됨",
+            "cli_image_failed": "오류: 디스크 이미지 생성 실패 - {}",
+            "cli_image_created": "디스크 이미지 생성됨: {} ({} 바이트, 파티션 {}개)",
+            "cli_layout_failed": "오류: 레이아웃 작업 실패 - {}",
+            "cli_layout_captured": "파일 {}개의 레이아웃 캡처됨 (데이터 구간 {}개)",
+            "cli_layout_replayed": "파일 {}개 재현: 데이터 {} 바이트 기록, {}개 실패",
+            "cli_diff_failed": "오류: 파일 비교 실패 - {}",
+            "job_queue": "작업 대기열",
+            "add_to_queue": "대기열에 추가",
+            "load_manifest": "매니페스트 불러오기...",
+            "start_queue": "시작",
+            "clear_queue": "대기열 비우기",
+            "workers": "동시 작업 수:",
+            "job_name": "파일 이름",
+            "job_status": "상태",
+            "job_pending": "대기 중",
+            "job_running": "실행 중",
+            "job_done": "완료",
+            "job_failed": "실패: {}",
+            "queue_stats": "완료 {}/{}, 초당 파일 {}개, {} MB/초",
+            "select_manifest": "매니페스트 파일 선택",
+            "cli_grow_summary": "파일 {}개, 목표 속도 {} 바이트/초, 평균 실제 속도 {} 바이트/초",
+            "cli_fragment_summary": "파일 {}개, 총 익스텐트 {}개, {}초",
+            "cli_plan_no_space": "오류: 여유 공간이 부족하여 생성을 시작하지 않았습니다: {}",
+            "cli_plan_trimmed": "공간 부족으로 계획에서 제외됨: {}",
+            "cli_device_throughput": "장치 {}: 파일 {}개, 동시 작업 {}, {}초, {} 파일/초",
+            "cli_rate_limit_ops": "메타데이터 제한 {}/초: 작업 {}회, 대기 {}초, 감속 {}회, 현재 {}/초",
+            "cli_rate_limit_bytes": "쓰기 제한 {} 바이트/초: {} 바이트, 대기 {}초, 감속 {}회, 현재 {} 바이트/초",
+            "cli_bench_failed": "오류: 읽기 벤치마크 실패 - {}",
+            "cli_edit_summary": "{}개 작업 적용 (병합 후 시스템 호출 {}회), 파일 크기 {} → {}",
+            "cli_edit_failed": "오류: 파일 편집 실패 - {}",
+            "cli_content_verify_summary": "내용 검증: {}개 파일 일치, {}개 파일 불일치, {}개 검증 미완료, {}바이트 비교",
+            "cli_content_verify_stopped": "첫 번째 불일치 후 중지했습니다 (모든 차이를 보려면 --all 사용)",
+            "cli_content_verify_failed": "오류: 내용 검증 실패 - {}",
+            "cli_densify_progress": "{} / {}바이트 할당됨 ({}바이트/초)",
+            "cli_densify_summary": "{}개 파일의 홀을 채움, 총 {}바이트, {}초, {}바이트/초",
+            "cli_densify_failed": "오류: 홀 채우기 실패 - {}",
+            "cli_scan_summary": "디렉터리 {}개, 파일 {}개 검사, 희소 파일 {}개; 표시 크기 {}바이트, 실제 할당 {}바이트, 오류 {}개",
+            "cli_scan_failed": "오류: 검사 실패 - {}",
+            "cli_snapshot_created": "스냅샷 생성 {}: 데이터 구간 {}개, 청크 {}개, 데이터 {}바이트를 {}바이트로 압축",
+            "cli_snapshot_restored": "{} 복원 완료 (표시 크기 {}바이트): 청크 {}개 압축 해제, {}바이트 기록",
+            "cli_snapshot_failed": "오류: 스냅샷 작업 실패 - {}",
+            "cli_invalid_rate": "오류: 잘못된 속도 제한 옵션 - {}",
+            "cli_rate_limit_processes": "오류: --ops-rate/--bytes-rate는 --processes와 함께 사용할 수 없습니다 (프로세스 간에 할당량을 공유할 수 없음)",
+            "cli_registry_unreadable": "접근 불가: {} - {}",
+            "cli_output_mode_unsupported": "오류: {} 명령은 --output-mode {}를 지원하지 않습니다"
         }
         
         # 法文
@@ -477,7 +709,65 @@ class LanguageManager:
             "indexing": "Indexation",
             "open_source_link": "Lien Open Source",
             "link_opened": "Lien ouvert",
-            "failed_to_open_link": "Impossible d'ouvrir le lien"
+            "failed_to_open_link": "Impossible d'ouvrir le lien",
+            "size_exceeds_fs_limit": "La taille {} octets dépasse la limite du système de fichiers cible ({} octets)",
+            "fs_not_sparse_no_space": "Le système de fichiers cible ne prend pas en charge les fichiers clairsemés : {} octets requis mais seulement {} octets disponibles",
+            "cli_probe_failed": "Erreur : Échec de l'analyse du système de fichiers - {}",
+            "cli_batch_summary": "Terminé : {} fichiers créés, {} fichiers déjà terminés ignorés, {} échecs",
+            "cli_manifest_invalid": "Erreur : Manifeste invalide - {}",
+            "cli_registry_missing": "Manquant : {}",
+            "cli_registry_size_mismatch": "Taille différente : {} (enregistrée {} octets, réelle {} octets)",
+            "cli_verify_summary": "Vérification terminée : {} OK, {} manquants, {} tailles différentes, {} inaccessibles",
+            "cli_purge_summary": "{} fichiers supprimés, {} échecs",
+            "cli_purge_dry_run": "{} fichiers seraient supprimés (simulation)",
+            "cli_archive_failed": "Erreur : Échec de l'opération d'archive - {}",
+            "cli_export_summary": "{} fichiers exportés : taille apparente {} octets, {} octets de données lus",
+            "cli_import_summary": "{} fichiers restaurés",
+            "cli_image_failed": "Erreur : Échec de la création de l'image disque - {}",
+            "cli_image_created": "Image disque créée : {} ({} octets, {} partitions)",
+            "cli_layout_failed": "Erreur : Échec de l'opération de disposition - {}",
+            "cli_layout_captured": "Disposition de {} fichiers capturée ({} extents de données)",
+            "cli_layout_replayed": "{} fichiers rejoués : {} octets de données écrits, {} échecs",
+            "cli_diff_failed": "Erreur : Échec de la comparaison des fichiers - {}",
+            "job_queue": "File de tâches",
+            "add_to_queue": "Ajouter à la file",
+            "load_manifest": "Charger un manifeste...",
+            "start_queue": "Démarrer",
+            "clear_queue": "Vider la file",
+            "workers": "Tâches parallèles :",
+            "job_name": "Nom du fichier",
+            "job_status": "État",
+            "job_pending": "En attente",
+            "job_running": "En cours",
+            "job_done": "Terminé",
+            "job_failed": "Échec : {}",
+            "queue_stats": "Terminé {}/{}, {} fichiers/s, {} Mo/s",
+            "select_manifest": "Sélectionner le fichier manifeste",
+            "cli_grow_summary": "{} fichiers, débit cible {} octets/s, débit moyen obtenu {} octets/s",
+            "cli_fragment_summary": "{} fichiers, {} extents au total, {} s",
+            "cli_plan_no_space": "Erreur : espace libre insuffisant, aucun fichier créé : {}",
+            "cli_plan_trimmed": "Retiré du plan (espace insuffisant) : {}",
+            "cli_device_throughput": "Périphérique {} : {} fichiers, {} workers, {} s, {} fichiers/s",
+            "cli_rate_limit_ops": "Limite métadonnées {}/s : {} opérations, attente {} s, {} ralentissements, actuellement {}/s",
+            "cli_rate_limit_bytes": "Limite d'écriture {} octets/s : {} octets, attente {} s, {} ralentissements, actuellement {} octets/s",
+            "cli_bench_failed": "Erreur : échec du test de lecture - {}",
+            "cli_edit_summary": "{} opérations appliquées ({} appels système après fusion), taille du fichier {} → {}",
+            "cli_edit_failed": "Erreur : échec de la modification du fichier - {}",
+            "cli_content_verify_summary": "Vérification du contenu : {} fichiers identiques, {} fichiers différents, {} non vérifiés entièrement, {} octets comparés",
+            "cli_content_verify_stopped": "Arrêt après la première différence (utilisez --all pour toutes les signaler)",
+            "cli_content_verify_failed": "Erreur : échec de la vérification du contenu - {}",
+            "cli_densify_progress": "{} / {} octets alloués ({} octets/s)",
+            "cli_densify_summary": "Trous remplis dans {} fichiers, {} octets en {} s, {} octets/s",
+            "cli_densify_failed": "Erreur : échec du remplissage des trous - {}",
+            "cli_scan_summary": "{} répertoires et {} fichiers analysés, {} fichiers creux ; taille apparente {} octets, alloués {} octets, {} erreurs",
+            "cli_scan_failed": "Erreur : échec de l'analyse - {}",
+            "cli_snapshot_created": "Instantané créé {} : {} plages de données, {} blocs, {} octets de données compressés en {} octets",
+            "cli_snapshot_restored": "{} restauré (taille apparente {} octets) : {} blocs décompressés, {} octets écrits",
+            "cli_snapshot_failed": "Erreur : échec de l'opération d'instantané - {}",
+            "cli_invalid_rate": "Erreur : option de limitation de débit invalide - {}",
+            "cli_rate_limit_processes": "Erreur : --ops-rate/--bytes-rate ne peut pas être combiné avec --processes (les processus ne peuvent pas partager le quota)",
+            "cli_registry_unreadable": "Inaccessible : {} - {}",
+            "cli_output_mode_unsupported": "Erreur : la commande {} ne prend pas en charge --output-mode {}"
         }
         
         # 德文
@@ -568,7 +858,65 @@ class LanguageManager:
             "indexing": "Indizierung",
             "open_source_link": "Open-Source-Link",
             "link_opened": "Link geöffnet",
-            "failed_to_open_link": "Link konnte nicht geöffnet werden"
+            "failed_to_open_link": "Link konnte nicht geöffnet werden",
+            "size_exceeds_fs_limit": "Dateigröße {} Bytes überschreitet das Limit des Ziel-Dateisystems von {} Bytes",
+            "fs_not_sparse_no_space": "Ziel-Dateisystem unterstützt keine Sparse-Dateien: {} Bytes benötigt, aber nur {} Bytes verfügbar",
+            "cli_probe_failed": "Fehler: Dateisystemprüfung fehlgeschlagen - {}",
+            "cli_batch_summary": "Fertig: {} Dateien erstellt, {} bereits fertige Dateien übersprungen, {} fehlgeschlagen",
+            "cli_manifest_invalid": "Fehler: Ungültiges Manifest - {}",
+            "cli_registry_missing": "Fehlt: {}",
+            "cli_registry_size_mismatch": "Größenabweichung: {} (registriert {} Bytes, tatsächlich {} Bytes)",
+            "cli_verify_summary": "Prüfung abgeschlossen: {} OK, {} fehlend, {} Größenabweichungen, {} nicht lesbar",
+            "cli_purge_summary": "{} Dateien entfernt, {} fehlgeschlagen",
+            "cli_purge_dry_run": "{} Dateien würden entfernt (Probelauf)",
+            "cli_archive_failed": "Fehler: Archivvorgang fehlgeschlagen - {}",
+            "cli_export_summary": "{} Dateien exportiert: {} Bytes angezeigte Größe, {} Bytes Daten gelesen",
+            "cli_import_summary": "{} Dateien wiederhergestellt",
+            "cli_image_failed": "Fehler: Erstellung des Disk-Images fehlgeschlagen - {}",
+            "cli_image_created": "Disk-Image erstellt: {} ({} Bytes, {} Partitionen)",
+            "cli_layout_failed": "Fehler: Layout-Vorgang fehlgeschlagen - {}",
+            "cli_layout_captured": "Layout von {} Dateien erfasst ({} Datenbereiche)",
+            "cli_layout_replayed": "{} Dateien nachgebildet: {} Bytes Daten geschrieben, {} fehlgeschlagen",
+            "cli_diff_failed": "Fehler: Dateivergleich fehlgeschlagen - {}",
+            "job_queue": "Auftragswarteschlange",
+            "add_to_queue": "Zur Warteschlange hinzufügen",
+            "load_manifest": "Manifest laden...",
+            "start_queue": "Starten",
+            "clear_queue": "Warteschlange leeren",
+            "workers": "Parallele Aufträge:",
+            "job_name": "Dateiname",
+            "job_status": "Status",
+            "job_pending": "Wartend",
+            "job_running": "Läuft",
+            "job_done": "Fertig",
+            "job_failed": "Fehlgeschlagen: {}",
+            "queue_stats": "Fertig {}/{}, {} Dateien/s, {} MB/s",
+            "select_manifest": "Manifestdatei auswählen",
+            "cli_grow_summary": "{} Dateien, Zielrate {} Bytes/s, durchschnittlich erreichte Rate {} Bytes/s",
+            "cli_fragment_summary": "{} Dateien, insgesamt {} Extents, {} s",
+            "cli_plan_no_space": "Fehler: Nicht genügend freier Speicher, es wurde nichts erstellt: {}",
+            "cli_plan_trimmed": "Aus dem Plan entfernt (kein Platz): {}",
+            "cli_device_throughput": "Gerät {}: {} Dateien, {} Worker, {} s, {} Dateien/s",
+            "cli_rate_limit_ops": "Metadaten-Limit {}/s: {} Operationen, {} s gedrosselt, {} Verlangsamungen, aktuell {}/s",
+            "cli_rate_limit_bytes": "Schreib-Limit {} Bytes/s: {} Bytes, {} s gedrosselt, {} Verlangsamungen, aktuell {} Bytes/s",
+            "cli_bench_failed": "Fehler: Lese-Benchmark fehlgeschlagen - {}",
+            "cli_edit_summary": "{} Operationen angewendet ({} Systemaufrufe nach dem Zusammenführen), Dateigröße {} → {}",
+            "cli_edit_failed": "Fehler: Datei konnte nicht bearbeitet werden - {}",
+            "cli_content_verify_summary": "Inhaltsprüfung: {} Dateien stimmen überein, {} Dateien weichen ab, {} nicht vollständig geprüft, {} Bytes verglichen",
+            "cli_content_verify_stopped": "Nach der ersten Abweichung angehalten (--all meldet alle Unterschiede)",
+            "cli_content_verify_failed": "Fehler: Inhaltsprüfung fehlgeschlagen - {}",
+            "cli_densify_progress": "{} / {} Bytes zugewiesen ({} Bytes/s)",
+            "cli_densify_summary": "Löcher in {} Dateien gefüllt, {} Bytes in {} s, {} Bytes/s",
+            "cli_densify_failed": "Fehler: Löcher konnten nicht gefüllt werden - {}",
+            "cli_scan_summary": "{} Verzeichnisse und {} Dateien durchsucht, {} Sparse-Dateien; scheinbare Größe {} Bytes, belegt {} Bytes, {} Fehler",
+            "cli_scan_failed": "Fehler: Durchsuchen fehlgeschlagen - {}",
+            "cli_snapshot_created": "Snapshot erstellt {}: {} Datenbereiche, {} Blöcke, {} Datenbytes auf {} Bytes komprimiert",
+            "cli_snapshot_restored": "{} wiederhergestellt (scheinbare Größe {} Bytes): {} Blöcke entpackt, {} Bytes geschrieben",
+            "cli_snapshot_failed": "Fehler: Snapshot-Vorgang fehlgeschlagen - {}",
+            "cli_invalid_rate": "Fehler: Ungültige Ratenbegrenzung - {}",
+            "cli_rate_limit_processes": "Fehler: --ops-rate/--bytes-rate kann nicht mit --processes kombiniert werden (Prozesse können das Kontingent nicht teilen)",
+            "cli_registry_unreadable": "Nicht lesbar: {} - {}",
+            "cli_output_mode_unsupported": "Fehler: Der Befehl {} unterstützt --output-mode {} nicht"
         }
         
         # 西班牙文
@@ -659,7 +1007,65 @@ class LanguageManager:
             "indexing": "Indexación",
             "open_source_link": "Enlace de Código Abierto",
             "link_opened": "Enlace abierto",
-            "failed_to_open_link": "No se pudo abrir el enlace"
+            "failed_to_open_link": "No se pudo abrir el enlace",
+            "size_exceeds_fs_limit": "El tamaño de {} bytes supera el límite del sistema de archivos de destino de {} bytes",
+            "fs_not_sparse_no_space": "El sistema de archivos de destino no admite archivos dispersos: se necesitan {} bytes pero solo hay {} bytes disponibles",
+            "cli_probe_failed": "Error: Falló el sondeo del sistema de archivos - {}",
+            "cli_batch_summary": "Listo: {} archivos creados, {} archivos ya completados omitidos, {} fallidos",
+            "cli_manifest_invalid": "Error: Manifiesto no válido - {}",
+            "cli_registry_missing": "Falta: {}",
+            "cli_registry_size_mismatch": "Tamaño distinto: {} (registrado {} bytes, real {} bytes)",
+            "cli_verify_summary": "Verificación terminada: {} correctos, {} faltantes, {} con tamaño distinto, {} inaccesibles",
+            "cli_purge_summary": "{} archivos eliminados, {} fallidos",
+            "cli_purge_dry_run": "Se eliminarían {} archivos (simulación)",
+            "cli_archive_failed": "Error: Falló la operación de archivo - {}",
+            "cli_export_summary": "{} archivos exportados: tamaño aparente {} bytes, {} bytes de datos leídos",
+            "cli_import_summary": "{} archivos restaurados",
+            "cli_image_failed": "Error: Falló la creación de la imagen de disco - {}",
+            "cli_image_created": "Imagen de disco creada: {} ({} bytes, {} particiones)",
+            "cli_layout_failed": "Error: Falló la operación de disposición - {}",
+            "cli_layout_captured": "Disposición de {} archivos capturada ({} extensiones de datos)",
+            "cli_layout_replayed": "{} archivos reproducidos: {} bytes de datos escritos, {} fallidos",
+            "cli_diff_failed": "Error: Falló la comparación de archivos - {}",
+            "job_queue": "Cola de trabajos",
+            "add_to_queue": "Añadir a la cola",
+            "load_manifest": "Cargar manifiesto...",
+            "start_queue": "Iniciar",
+            "clear_queue": "Vaciar cola",
+            "workers": "Trabajos paralelos:",
+            "job_name": "Nombre de archivo",
+            "job_status": "Estado",
+            "job_pending": "Pendiente",
+            "job_running": "En ejecución",
+            "job_done": "Completado",
+            "job_failed": "Falló: {}",
+            "queue_stats": "Completados {}/{}, {} archivos/s, {} MB/s",
+            "select_manifest": "Seleccionar archivo de manifiesto",
+            "cli_grow_summary": "{} archivos, velocidad objetivo {} bytes/s, velocidad media lograda {} bytes/s",
+            "cli_fragment_summary": "{} archivos, {} extents en total, {} s",
+            "cli_plan_no_space": "Error: Espacio libre insuficiente, no se creó nada: {}",
+            "cli_plan_trimmed": "Eliminado del plan (sin espacio): {}",
+            "cli_device_throughput": "Dispositivo {}: {} archivos, {} workers, {} s, {} archivos/s",
+            "cli_rate_limit_ops": "Límite de metadatos {}/s: {} operaciones, espera {} s, {} reducciones, ahora {}/s",
+            "cli_rate_limit_bytes": "Límite de escritura {} bytes/s: {} bytes, espera {} s, {} reducciones, ahora {} bytes/s",
+            "cli_bench_failed": "Error: Falló la prueba de lectura - {}",
+            "cli_edit_summary": "{} operaciones aplicadas ({} llamadas al sistema tras combinar), tamaño del archivo {} → {}",
+            "cli_edit_failed": "Error: No se pudo editar el archivo - {}",
+            "cli_content_verify_summary": "Verificación de contenido: {} archivos coinciden, {} archivos difieren, {} sin verificar por completo, {} bytes comparados",
+            "cli_content_verify_stopped": "Detenido tras la primera diferencia (use --all para informar de todas)",
+            "cli_content_verify_failed": "Error: Falló la verificación de contenido - {}",
+            "cli_densify_progress": "{} / {} bytes asignados ({} bytes/s)",
+            "cli_densify_summary": "Huecos rellenados en {} archivos, {} bytes en {} s, {} bytes/s",
+            "cli_densify_failed": "Error: No se pudieron rellenar los huecos - {}",
+            "cli_scan_summary": "{} directorios y {} archivos analizados, {} dispersos; tamaño aparente {} bytes, asignados {} bytes, {} errores",
+            "cli_scan_failed": "Error: Falló el análisis - {}",
+            "cli_snapshot_created": "Instantánea creada {}: {} rangos de datos, {} bloques, {} bytes de datos comprimidos a {} bytes",
+            "cli_snapshot_restored": "Restaurado {} (tamaño aparente {} bytes): {} bloques descomprimidos, {} bytes escritos",
+            "cli_snapshot_failed": "Error: Falló la operación de instantánea - {}",
+            "cli_invalid_rate": "Error: Opción de límite de velocidad no válida - {}",
+            "cli_rate_limit_processes": "Error: --ops-rate/--bytes-rate no se puede combinar con --processes (los procesos no pueden compartir la cuota)",
+            "cli_registry_unreadable": "Inaccesible: {} - {}",
+            "cli_output_mode_unsupported": "Error: el comando {} no admite --output-mode {}"
         }
         
         # 保存语言文件
@@ -0,0 +1,226 @@
+import os
+import random
+import struct
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import BinaryIO, List, Optional, Tuple
+
+import rate_limit
+import sparse_io
+
+
+# 布局文件魔数 (版本 1)
+LAYOUT_MAGIC = b'SFGLAYT1'
+
+# 图案的基础周期，以及写入偏移戳的块大小
+PATTERN_PERIOD = 1 << 20
+PATTERN_BLOCK = 4096
+WRITE_CHUNK = 1 << 20
+
+# name: 相对路径；size: 显示大小；extents: [(偏移, 长度), ...]
+FileLayout = namedtuple('FileLayout', ['name', 'size', 'extents'])
+
+
+def capture_file(path: str, name: Optional[str] = None) -> FileLayout:
+    """用 SEEK_DATA/SEEK_HOLE 捕获单个文件的大小与数据区间，不读取数据"""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        extents = list(sparse_io.iter_data_extents(f.fileno(), size))
+    return FileLayout(name if name is not None else os.path.basename(path), size, extents)
+
+
+def capture(sources: List[str]) -> List[FileLayout]:
+    """捕获文件或目录树中所有普通文件的布局，名称相对于各源的上级目录"""
+    layouts = []
+    for source in sources:
+        source = os.path.abspath(source)
+        base = os.path.dirname(source)
+        if not os.path.isdir(source):
+            layouts.append(capture_file(source, os.path.relpath(source, base)))
+            continue
+        for dirpath, dirnames, filenames in os.walk(source):
+            dirnames.sort()
+            for name in sorted(filenames):
+                path = os.path.join(dirpath, name)
+                if os.path.isfile(path) and not os.path.islink(path):
+                    layouts.append(capture_file(path, os.path.relpath(path, base)))
+    return layouts
+
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """:raises ValueError: 数据在 varint 中途结束时"""
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError('Truncated layout file')
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def dump_layouts(layouts: List[FileLayout], out: BinaryIO):
+    """
+    写出紧凑的二进制布局包
+    格式: 魔数, 文件数, 每个文件 (名称长度, UTF-8 名称, 大小, 区间数, [与上一区间末尾的间隔, 长度]...)，均为 varint
+    """
+    buf = bytearray(LAYOUT_MAGIC)
+    _write_varint(buf, len(layouts))
+    for entry in layouts:
+        name = entry.name.replace(os.sep, '/').encode('utf-8', 'surrogateescape')
+        _write_varint(buf, len(name))
+        buf += name
+        _write_varint(buf, entry.size)
+        _write_varint(buf, len(entry.extents))
+        previous_end = 0
+        for offset, length in entry.extents:
+            _write_varint(buf, offset - previous_end)
+            _write_varint(buf, length)
+            previous_end = offset + length
+    out.write(bytes(buf))
+
+
+def load_layouts(stream: BinaryIO) -> List[FileLayout]:
+    """
+    读取 dump_layouts 写出的布局包
+    :raises ValueError: 不是布局文件或内容被截断时
+    """
+    data = stream.read()
+    if not data.startswith(LAYOUT_MAGIC):
+        raise ValueError('Not a layout file')
+    pos = len(LAYOUT_MAGIC)
+    count, pos = _read_varint(data, pos)
+    layouts = []
+    for _ in range(count):
+        name_length, pos = _read_varint(data, pos)
+        if pos + name_length > len(data):
+            raise ValueError('Truncated layout file')
+        name = data[pos:pos + name_length].decode('utf-8', 'surrogateescape')
+        pos += name_length
+        size, pos = _read_varint(data, pos)
+        extent_count, pos = _read_varint(data, pos)
+        extents = []
+        previous_end = 0
+        for _ in range(extent_count):
+            gap, pos = _read_varint(data, pos)
+            length, pos = _read_varint(data, pos)
+            offset = previous_end + gap
+            extents.append((offset, length))
+            previous_end = offset + length
+        layouts.append(FileLayout(name, size, extents))
+    return layouts
+
+
+@lru_cache(maxsize=16)
+def _base_pattern(seed: int) -> bytes:
+    """由种子生成的基础图案，重复两次以便按任意起点切片"""
+    pattern = random.Random(seed).getrandbits(PATTERN_PERIOD * 8).to_bytes(PATTERN_PERIOD, 'little')
+    return pattern + pattern
+
+
+def fill_pattern(view: memoryview, seed: int, offset: int):
+    """
+    把文件中 [offset, offset+len(view)) 处的图案数据写入预先分配的缓冲区
+    内容只取决于种子和绝对偏移：周期性的随机图案，每个 4KiB 块开头再写入块偏移戳，
+    因此错位的块也能被校验发现
+    :param view: 可写的缓冲区视图
+    :param seed: 图案种子
+    :param offset: 起始偏移
+    """
+    base = memoryview(_base_pattern(seed))
+    length = len(view)
+    end = offset + length
+    index = 0
+    while index < length:
+        start = (offset + index) % PATTERN_PERIOD
+        take = min(PATTERN_PERIOD, length - index)
+        view[index:index + take] = base[start:start + take]
+        index += take
+
+    stamp_mask = seed & 0xFFFFFFFFFFFFFFFF
+    block = -(-offset // PATTERN_BLOCK) * PATTERN_BLOCK
+    while block < end:
+        stamp = struct.pack('<Q', (block ^ stamp_mask) & 0xFFFFFFFFFFFFFFFF)
+        index = block - offset
+        take = max(0, min(8, end - block))
+        view[index:index + take] = stamp[:take]
+        block += PATTERN_BLOCK
+
+
+def pattern_bytes(seed: int, offset: int, length: int) -> bytearray:
+    """
+    生成文件中 [offset, offset+length) 处的图案数据 (见 fill_pattern)
+    :param seed: 图案种子
+    :param offset: 起始偏移
+    :param length: 长度
+    """
+    buf = bytearray(length)
+    fill_pattern(memoryview(buf), seed, offset)
+    return buf
+
+
+def apply_layout(path: str, entry: FileLayout, seed: int = 0) -> int:
+    """
+    按布局重建文件: 先截断到完整大小形成空洞，再向数据区间写入图案
+    :return: 写入的数据字节数
+    """
+    written = 0
+    with rate_limit.metadata_op():
+        f = open(path, 'wb')
+    with f:
+        f.truncate(entry.size)
+        fd = f.fileno()
+        for offset, length in entry.extents:
+            end = offset + length
+            while offset < end:
+                chunk = min(WRITE_CHUNK, end - offset)
+                sparse_io.write_at(fd, pattern_bytes(seed, offset, chunk), offset)
+                offset += chunk
+                written += chunk
+    return written
+
+
+def replay(layouts: List[FileLayout], dest_dir: str, seed: int = 0,
+           workers: Optional[int] = None, dest_dirs: Optional[List[str]] = None):
+    """
+    并行重放布局包中的所有文件
+    :param dest_dirs: 每个布局各自的目标目录 (如 planner.schedule 的分配结果)，None 表示都写入 dest_dir
+    :return: ([(路径, 布局, 写入字节数)], [(路径, 异常)])
+    """
+    targets = []
+    for index, entry in enumerate(layouts):
+        root = os.path.abspath(dest_dirs[index] if dest_dirs else dest_dir)
+        target = os.path.abspath(os.path.join(root, entry.name))
+        if not target.startswith(root + os.sep):
+            raise ValueError('Unsafe layout entry: %s' % entry.name)
+        targets.append((target, entry))
+    for directory in {os.path.dirname(target) for target, _entry in targets}:
+        os.makedirs(directory, exist_ok=True)
+
+    def run(item):
+        target, entry = item
+        try:
+            return target, entry, apply_layout(target, entry, seed), None
+        except OSError as e:
+            return target, entry, 0, e
+
+    done = []
+    failures = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for target, entry, written, error in pool.map(run, targets):
+            if error is None:
+                done.append((target, entry, written))
+            else:
+                failures.append((target, error))
+    return done, failures
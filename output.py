@@ -0,0 +1,152 @@
+import codecs
+import json
+import locale
+import os
+import sys
+from typing import Dict, Optional
+
+from language_manager import lang
+
+
+MODE_HUMAN = 'human'
+MODE_JSONL = 'jsonl'
+MODE_SUMMARY = 'summary'
+MODES = (MODE_HUMAN, MODE_JSONL, MODE_SUMMARY)
+
+# 攒够这么多字符再写出一次
+BUFFER_SIZE = 64 << 10
+
+# 控制台无法表示当前语言时改用的翻译
+FALLBACK_LANGUAGE = 'en_US'
+
+
+def _resolve_encoding(stream) -> str:
+    encoding = getattr(stream, 'encoding', None) or locale.getpreferredencoding(False) or 'ascii'
+    try:
+        return codecs.lookup(encoding).name
+    except LookupError:
+        return 'ascii'
+
+
+def _can_encode(text: str, encoding: str) -> bool:
+    try:
+        text.encode(encoding)
+        return True
+    except UnicodeEncodeError:
+        return False
+
+
+class Output:
+    """
+    命令行输出层: 写入先缓冲，攒够 BUFFER_SIZE 或结束时成批写出
+    human 输出翻译后的文本；jsonl 每条记录一个 JSON 对象，不做翻译；summary 只输出汇总记录
+    控制台编码在创建时解析一次: 无法表示当前语言时改用英文翻译，个别仍无法表示的字符以 ? 替换，
+    不再逐条捕获 UnicodeEncodeError
+    只应在一个线程中使用 (批量任务的完成回调都在调用线程中执行)
+    """
+
+    def __init__(self, mode: str = MODE_HUMAN, stream=None, buffer_size: int = BUFFER_SIZE):
+        if mode not in MODES:
+            raise ValueError('Unknown output mode: %s' % mode)
+        self.mode = mode
+        self.stream = stream if stream is not None else sys.stdout
+        self.buffer_size = buffer_size
+        self.encoding = _resolve_encoding(self.stream)
+        self._pending = []
+        self._pending_size = 0
+        self._translations: Optional[Dict[str, str]] = None
+        if mode != MODE_JSONL and not _can_encode(''.join(lang.translations.values()), self.encoding):
+            self._translations = self._load_fallback()
+
+    def _load_fallback(self) -> Optional[Dict[str, str]]:
+        path = os.path.join(lang.languages_dir, '%s.json' % FALLBACK_LANGUAGE)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def translate(self, key: str, *args) -> str:
+        if self._translations is None:
+            return lang.get(key, *args)
+        text = self._translations.get(key, key)
+        try:
+            return text.format(*args) if args else text
+        except (IndexError, KeyError, ValueError):
+            return text
+
+    def _write_line(self, line: str):
+        self._pending.append(line)
+        self._pending_size += len(line) + 1
+        if self._pending_size >= self.buffer_size:
+            self.flush()
+
+    def _emit(self, event: str, key: Optional[str], args, fields: Dict, human: bool):
+        if self.mode == MODE_JSONL:
+            record = {'event': event}
+            record.update(fields)
+            self._write_line(json.dumps(record, ensure_ascii=False, default=str))
+        elif human and key is not None:
+            self._write_line(self.translate(key, *args))
+
+    def record(self, event: str, key: Optional[str] = None, args=(), **fields):
+        """
+        逐项记录 (单个文件、单个设备等)，summary 模式下不输出
+        :param event: jsonl 中的 event 字段
+        :param key: human 模式使用的翻译键，None 表示只在 jsonl 中输出
+        :param args: 翻译参数
+        :param fields: jsonl 记录的其余字段
+        """
+        self._emit(event, key, args, fields, self.mode == MODE_HUMAN)
+
+    def summary(self, event: str, key: Optional[str] = None, args=(), **fields):
+        """汇总记录 (以及单次操作的最终结果)，所有模式都输出"""
+        self._emit(event, key, args, fields, True)
+
+    def text(self, event: str, text: str, summary: bool = False, **fields):
+        """
+        不经翻译的文本记录 (表格行、JSON 文档等)：human 模式原样输出 text，jsonl 只输出字段
+        :param summary: 为 True 时与 summary() 一样在所有模式输出，否则与 record() 一样在 summary 模式下不输出
+        """
+        if self.mode == MODE_JSONL:
+            self._emit(event, None, (), fields, False)
+        elif summary or self.mode == MODE_HUMAN:
+            self._write_line(text)
+
+    def flush(self):
+        if not self._pending or self.stream is None:
+            self._pending = []
+            self._pending_size = 0
+            return
+        text = '\n'.join(self._pending) + '\n'
+        self._pending = []
+        self._pending_size = 0
+        buffer = getattr(self.stream, 'buffer', None)
+        if buffer is not None:
+            # 先写出同一流上 print 留下的文本，保持顺序
+            self.stream.flush()
+            buffer.write(text.encode(self.encoding, 'replace'))
+            buffer.flush()
+        else:
+            self.stream.write(text)
+            self.stream.flush()
+
+
+# 当前命令行输出层，首次使用时按 human 模式创建
+_console: Optional[Output] = None
+
+
+def configure(mode: str = MODE_HUMAN, stream=None) -> Output:
+    """设置进程内的命令行输出模式"""
+    global _console
+    if _console is not None:
+        _console.flush()
+    _console = Output(mode, stream)
+    return _console
+
+
+def console() -> Output:
+    global _console
+    if _console is None:
+        _console = Output()
+    return _console
@@ -0,0 +1,203 @@
+import errno
+import os
+import shutil
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import fs_probe
+
+
+DEFAULT_BLOCK_SIZE = 4096
+
+# 计划条目: (名称, 显示大小, 数据区间 [(偏移, 长度), ...])
+PlanItem = Tuple[str, int, Sequence[Tuple[int, int]]]
+
+
+def tail_extents(size: int) -> List[Tuple[int, int]]:
+    """命令行默认创建方式 (结尾写一个字节) 对应的数据区间"""
+    return [(size - 1, 1)] if size > 0 else []
+
+
+def file_allocation(size: int, extents: Sequence[Tuple[int, int]], block_size: int, sparse: bool = True) -> int:
+    """
+    估算一个文件实际分配的字节数: 数据区间按块边界向外取整，落在同一块内的区间只计一次；
+    不支持稀疏文件的文件系统按完整大小计算
+    """
+    if not sparse:
+        return -(-size // block_size) * block_size
+    allocated = 0
+    last_block_end = 0
+    for offset, length in sorted(extents):
+        if length <= 0:
+            continue
+        start = max(offset // block_size * block_size, last_block_end)
+        end = -(-(offset + length) // block_size) * block_size
+        if end > start:
+            allocated += end - start
+            last_block_end = end
+    return allocated
+
+
+def existing_ancestor(directory: str) -> str:
+    """目录本身或最近的已存在上级目录 (目标目录可能尚未创建)"""
+    directory = os.path.abspath(directory)
+    while not os.path.exists(directory):
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            break
+        directory = parent
+    return directory
+
+
+def free_space(directory: str) -> int:
+    """普通用户可用的剩余空间 (statvfs 的 f_bavail，没有 statvfs 的平台用 disk_usage)"""
+    if hasattr(os, 'statvfs'):
+        st = os.statvfs(directory)
+        return st.f_bavail * st.f_frsize
+    return shutil.disk_usage(directory).free
+
+
+class Volume:
+    """一个目标设备: 同一设备上的多个目标目录共享剩余空间"""
+
+    def __init__(self, device: int, directory: str):
+        self.device = device
+        self.directories = [directory]
+        probe_dir = existing_ancestor(directory)
+        self.free = free_space(probe_dir)
+        try:
+            caps = fs_probe.get_capabilities(probe_dir)
+        except OSError:
+            caps = {}
+        self.block_size = caps.get('block_size') or DEFAULT_BLOCK_SIZE
+        self.sparse = caps.get('sparse', True)
+        self.allocation = 0
+        self.files = 0
+        self._next_directory = 0
+
+    @property
+    def remaining(self) -> int:
+        return self.free - self.allocation
+
+    def allocation_of(self, size: int, extents: Sequence[Tuple[int, int]]) -> int:
+        return file_allocation(size, extents, self.block_size, self.sparse)
+
+    def assign(self, allocation: int) -> str:
+        """记入一个文件并按轮转选择同一设备上的目标目录"""
+        self.allocation += allocation
+        self.files += 1
+        directory = self.directories[self._next_directory % len(self.directories)]
+        self._next_directory += 1
+        return directory
+
+    def describe(self) -> Dict:
+        return {
+            'device': self.device,
+            'directories': self.directories,
+            'free': self.free,
+            'allocation': self.allocation,
+            'files': self.files,
+        }
+
+
+def _volume_for(directory: str, volumes: Dict[int, Volume]) -> Volume:
+    """返回目录所在设备的 Volume，同一设备的目录合并到一起"""
+    device = os.stat(existing_ancestor(directory)).st_dev
+    volume = volumes.get(device)
+    if volume is None:
+        volume = volumes[device] = Volume(device, directory)
+    elif directory not in volume.directories:
+        volume.directories.append(directory)
+    return volume
+
+
+def _no_space(volumes: Sequence[Volume]) -> OSError:
+    detail = ', '.join('%s: %d > %d' % (volume.directories[0], volume.allocation, volume.free)
+                       for volume in volumes)
+    return OSError(errno.ENOSPC, 'Not enough free space (%s)' % detail)
+
+
+def schedule(items: Sequence[PlanItem], targets: Sequence[str], reserve: int = 0, trim: bool = False) -> Dict:
+    """
+    在开始写入前把文件分配到多个目标目录
+    按分配量从大到小依次放到放得下的设备中已计划写入量最少的那个 (最长处理时间优先)，
+    使各设备的写入量大致相同以便并行写入；写入量相同时选剩余空间多的设备
+    :param items: [(名称, 显示大小, 数据区间), ...]
+    :param targets: 目标目录列表 (可以不存在)
+    :param reserve: 每个设备保留不用的字节数
+    :param trim: 放不下时丢弃这些文件而不是拒绝整个计划
+    :return: {"assignments": [目标目录或 None (被丢弃)], "volumes": [...], "total_allocation", "skipped": [名称]}
+    :raises OSError: ENOSPC，计划放不下且未指定 trim
+    """
+    by_device: Dict[int, Volume] = {}
+    for target in targets:
+        _volume_for(target, by_device)
+    volumes = list(by_device.values())
+    for volume in volumes:
+        volume.free = max(0, volume.free - reserve)
+
+    # 各设备的块大小可能不同，先按第一个设备估算排序用的分配量
+    order = sorted(range(len(items)), reverse=True,
+                   key=lambda i: volumes[0].allocation_of(items[i][1], items[i][2]))
+
+    assignments: List[Optional[str]] = [None] * len(items)
+    skipped = []
+    for item_index in order:
+        _name, size, extents = items[item_index]
+        best = None
+        best_allocation = 0
+        for volume in volumes:
+            allocation = volume.allocation_of(size, extents)
+            if allocation > volume.remaining:
+                continue
+            if best is None or (volume.allocation, -volume.remaining) < (best.allocation, -best.remaining):
+                best, best_allocation = volume, allocation
+        if best is None:
+            skipped.append(item_index)
+        else:
+            assignments[item_index] = best.assign(best_allocation)
+
+    if skipped and not trim:
+        needed = sum(volumes[0].allocation_of(items[i][1], items[i][2]) for i in skipped)
+        raise OSError(errno.ENOSPC, 'Not enough free space: %d files (%d bytes) do not fit'
+                      % (len(skipped), needed))
+
+    return {
+        'assignments': assignments,
+        'volumes': [volume.describe() for volume in volumes],
+        'total_allocation': sum(volume.allocation for volume in volumes),
+        'skipped': [items[item_index][0] for item_index in sorted(skipped)],
+    }
+
+
+def check_placements(placements: Sequence[Tuple[str, int, Sequence[Tuple[int, int]]]], reserve: int = 0) -> Dict:
+    """
+    校验位置已确定的文件 (如批量清单) 的总分配量是否能放进各自的设备
+    :param placements: [(文件路径, 显示大小, 数据区间), ...]
+    :return: {"volumes": [...], "total_allocation"}
+    :raises OSError: ENOSPC，某个设备放不下时
+    """
+    by_device: Dict[int, Volume] = {}
+    volume_of_dir: Dict[str, Volume] = {}
+    for path, size, extents in placements:
+        directory = os.path.dirname(os.path.abspath(path))
+        volume = volume_of_dir.get(directory)
+        if volume is None:
+            # 目录数可能很多，这里不记录每个目录，只按设备合并
+            device = os.stat(existing_ancestor(directory)).st_dev
+            volume = by_device.get(device)
+            if volume is None:
+                volume = by_device[device] = Volume(device, directory)
+            volume_of_dir[directory] = volume
+        volume.allocation += volume.allocation_of(size, extents)
+        volume.files += 1
+
+    volumes = list(by_device.values())
+    for volume in volumes:
+        volume.free = max(0, volume.free - reserve)
+    overfull = [volume for volume in volumes if volume.allocation > volume.free]
+    if overfull:
+        raise _no_space(overfull)
+    return {
+        'volumes': [volume.describe() for volume in volumes],
+        'total_allocation': sum(volume.allocation for volume in volumes),
+    }
@@ -0,0 +1,148 @@
+import collections
+import os
+import sys
+import threading
+from typing import Callable, List, Optional
+
+
+# tracemalloc 记录的调用栈深度与报告条数
+MALLOC_FRAMES = 25
+TOP_ENTRIES = 30
+
+# 调用栈采样间隔 (秒)
+SAMPLE_INTERVAL = 0.005
+
+
+class ThreadedProfiler:
+    """
+    覆盖所有线程的 cProfile
+    Python 3.12 起 cProfile 基于 sys.monitoring，一个实例即可看到所有线程；
+    更早的版本只统计启用它的线程，因此通过 threading.setprofile 在每个新线程中各启用一个实例，结束时合并
+    """
+
+    def __init__(self):
+        import cProfile
+        self._profile_class = cProfile.Profile
+        self._profilers: List = []
+        self._lock = threading.Lock()
+        self._per_thread = sys.version_info < (3, 12)
+
+    def _bootstrap(self, frame, event, arg):
+        # 新线程的第一个 profile 事件: 换成该线程自己的 cProfile 钩子
+        profiler = self._profile_class()
+        with self._lock:
+            self._profilers.append(profiler)
+        profiler.enable()
+
+    def start(self):
+        profiler = self._profile_class()
+        self._profilers.append(profiler)
+        if self._per_thread:
+            threading.setprofile(self._bootstrap)
+        profiler.enable()
+
+    def stop(self):
+        self._profilers[0].disable()
+        if self._per_thread:
+            threading.setprofile(None)
+
+    def write(self, path: str, top: int = TOP_ENTRIES):
+        """写出合并后的 pstats 文件，以及按累计时间排序的文本摘要 (path.txt)"""
+        import pstats
+        with self._lock:
+            profilers = list(self._profilers)
+        with open(path + '.txt', 'w', encoding='utf-8') as report:
+            stats = pstats.Stats(profilers[0], stream=report)
+            for profiler in profilers[1:]:
+                stats.add(profiler)
+            stats.dump_stats(path)
+            stats.sort_stats('cumulative').print_stats(top)
+
+
+class StackSampler:
+    """后台线程定时采样所有线程的调用栈，输出 flamegraph.pl / speedscope 可读的折叠栈格式"""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.counts: collections.Counter = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append('%s (%s:%d)' % (code.co_name, os.path.basename(code.co_filename),
+                                                 code.co_firstlineno))
+                    frame = frame.f_back
+                self.counts[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: str):
+        with open(path, 'w', encoding='utf-8') as out:
+            for stack, count in self.counts.most_common():
+                out.write('%s %d\n' % (stack, count))
+
+
+def _write_malloc_report(path: str, top: int = TOP_ENTRIES):
+    """写出 tracemalloc 的当前/峰值内存、按代码行和按调用栈统计的最大分配"""
+    import tracemalloc
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    ))
+    current, peak = tracemalloc.get_traced_memory()
+    with open(path, 'w', encoding='utf-8') as out:
+        out.write('current: %d bytes\npeak: %d bytes\n\n' % (current, peak))
+        out.write('Top %d by line\n' % top)
+        for stat in snapshot.statistics('lineno')[:top]:
+            out.write('%s\n' % stat)
+        out.write('\nTop %d by traceback\n' % min(top, 10))
+        for stat in snapshot.statistics('traceback')[:min(top, 10)]:
+            out.write('\n%s\n' % stat)
+            for line in stat.traceback.format():
+                out.write('%s\n' % line)
+
+
+def run_profiled(func: Callable[[], int], profile_path: Optional[str] = None, malloc_path: Optional[str] = None,
+                 stacks_path: Optional[str] = None) -> int:
+    """
+    在性能分析下运行 func，结束时 (包括异常退出) 写出报告
+    :param profile_path: cProfile 的 pstats 输出路径 (另写一份 .txt 摘要)
+    :param malloc_path: tracemalloc 最大分配报告路径
+    :param stacks_path: 折叠栈输出路径
+    :return: func 的返回值
+    """
+    profiler = sampler = None
+    if malloc_path:
+        import tracemalloc
+        tracemalloc.start(MALLOC_FRAMES)
+    if stacks_path:
+        sampler = StackSampler()
+        sampler.start()
+    if profile_path:
+        profiler = ThreadedProfiler()
+        profiler.start()
+    try:
+        return func()
+    finally:
+        if profiler is not None:
+            profiler.stop()
+            profiler.write(profile_path)
+        if sampler is not None:
+            sampler.stop()
+            sampler.write(stacks_path)
+        if malloc_path:
+            _write_malloc_report(malloc_path)
+            tracemalloc.stop()
@@ -0,0 +1,50 @@
+"""
+pytest 插件: 提供基于缓存的稀疏文件夹具
+
+启用方式: pytest -p pytest_sparse，或在 conftest.py 中写 pytest_plugins = ['pytest_sparse']
+
+    def test_reader(sparse_file):
+        path = sparse_file('10GiB', layout=[(0, 4096), (1 << 30, 1 << 20)])
+"""
+import os
+
+import pytest
+
+import fixture_cache
+import size_parser
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('sparse', 'sparse file fixtures')
+    group.addoption('--sparse-cache-dir', default=None,
+                    help='cache directory for sparse file fixtures')
+    parser.addini('sparse_cache_dir', 'cache directory for sparse file fixtures',
+                  default=fixture_cache.DEFAULT_CACHE_DIR)
+    parser.addini('sparse_cache_max_size', 'maximum allocated size of the fixture cache (e.g. 10GiB)',
+                  default='10GiB')
+
+
+@pytest.fixture(scope='session')
+def sparse_cache(pytestconfig):
+    """会话内共享的缓存对象；xdist 的各 worker 各有一个实例，通过锁文件协调"""
+    cache_dir = pytestconfig.getoption('sparse_cache_dir') or pytestconfig.getini('sparse_cache_dir')
+    max_size = size_parser.parse_size(pytestconfig.getini('sparse_cache_max_size'))
+    return fixture_cache.SparseFixtureCache(os.path.expanduser(cache_dir), max_size)
+
+
+@pytest.fixture
+def sparse_file(sparse_cache, tmp_path):
+    """
+    返回工厂函数 sparse_file(size, layout='tail', seed=0, name=None)，在 tmp_path 中生成文件
+    layout 取值见 fixture_cache.normalize_layout；返回 pathlib.Path
+    """
+    created = []
+
+    def make(size, layout=None, seed=0, name=None):
+        path = tmp_path / (name or 'sparse_%d.bin' % len(created))
+        sparse_cache.materialize(str(path), size, layout, seed)
+        created.append(path)
+        return path
+
+    return make
+
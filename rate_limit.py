@@ -0,0 +1,179 @@
+import contextlib
+import threading
+import time
+from typing import Dict, Optional
+
+
+# 吞吐量自适应: 延迟的指数移动平均超过基线的倍数时降速，回落到基线附近时逐步恢复
+EWMA_ALPHA = 0.1
+BACKOFF_THRESHOLD = 2.0
+RECOVER_THRESHOLD = 1.2
+BACKOFF_FACTOR = 0.7
+RECOVER_STEP = 0.05
+MIN_RATE_FRACTION = 0.05
+ADJUST_INTERVAL = 0.5
+
+# 低于这些延迟时不降速: 本地缓存命中的操作只有几微秒，相对波动再大也不代表服务端过载
+METADATA_LATENCY_FLOOR = 0.002
+DATA_LATENCY_FLOOR = 1e-8
+
+# 数据写入的延迟按每字节计算，过小的写入 (如结尾一个字节) 不参与自适应
+ADAPT_MIN_WRITE = 64 << 10
+
+# 每次加锁预取的令牌约为 LEASE_SECONDS 秒的配额，线程在本地消耗预取的令牌，减少锁竞争
+LEASE_SECONDS = 0.01
+
+# 当前生效的限速器，None 表示不限速 (各写入路径只多一次属性读取)
+active = None
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+class TokenBucket:
+    """
+    GCRA 形式的令牌桶: 每次取令牌只在锁内预约时间点，需要等待时在锁外 sleep
+    空闲之后最多立即放行 burst_seconds 秒的配额
+    线程按租约批量预取令牌，本地扣减不加锁；实际消耗的令牌数记在各线程自己的计数器中，汇报时求和
+    """
+
+    def __init__(self, rate: float, burst_seconds: float = 0.1, adaptive: bool = True,
+                 latency_floor: float = METADATA_LATENCY_FLOOR):
+        if rate <= 0:
+            raise ValueError('Rate must be positive')
+        self.configured_rate = float(rate)
+        self.rate = float(rate)
+        self.burst_seconds = burst_seconds
+        self.adaptive = adaptive
+        self.latency_floor = latency_floor
+        self.throttled_seconds = 0.0
+        self.backoffs = 0
+        self._counters = []
+        self._lock = threading.Lock()
+        self._tat = time.monotonic()
+        self._local = threading.local()
+        self._latency = None
+        self._baseline = None
+        self._last_adjust = 0.0
+
+    def acquire(self, amount: int = 1):
+        """取 amount 个令牌，配额不足时阻塞到可用为止"""
+        local = self._local
+        tokens = getattr(local, 'tokens', 0)
+        if tokens >= amount:
+            local.tokens = tokens - amount
+            local.spent[0] += amount
+            return
+        borrow = max(amount - tokens, int(self.rate * LEASE_SECONDS))
+        with self._lock:
+            if not hasattr(local, 'spent'):
+                local.spent = [0]
+                self._counters.append(local.spent)
+            now = time.monotonic()
+            self._tat = max(self._tat, now) + borrow / self.rate
+            wait = self._tat - self.burst_seconds - now
+            if wait > 0:
+                self.throttled_seconds += wait
+        local.tokens = tokens + borrow - amount
+        local.spent[0] += amount
+        if wait > 0:
+            time.sleep(wait)
+
+    def observe(self, latency: float):
+        """
+        记录一次操作的延迟，按 AIMD 调整速率: 持续变慢时乘性降速，恢复后加性回升
+        EWMA 的更新不加锁，并发时偶尔丢失一次采样无关紧要
+        """
+        if not self.adaptive:
+            return
+        average = latency if self._latency is None else self._latency + EWMA_ALPHA * (latency - self._latency)
+        self._latency = average
+        if self._baseline is None or average < self._baseline:
+            self._baseline = average
+        now = time.monotonic()
+        if now - self._last_adjust < ADJUST_INTERVAL:
+            return
+        with self._lock:
+            if now - self._last_adjust < ADJUST_INTERVAL:
+                return
+            self._last_adjust = now
+            if average > max(self._baseline * BACKOFF_THRESHOLD, self.latency_floor):
+                self.rate = max(self.configured_rate * MIN_RATE_FRACTION, self.rate * BACKOFF_FACTOR)
+                self.backoffs += 1
+            elif average < self._baseline * RECOVER_THRESHOLD and self.rate < self.configured_rate:
+                self.rate = min(self.configured_rate, self.rate + self.configured_rate * RECOVER_STEP)
+
+    @property
+    def consumed(self) -> int:
+        """实际消耗的令牌数 (不含已预取但尚未使用的部分)"""
+        return sum(counter[0] for counter in self._counters)
+
+    def describe(self) -> Dict:
+        return {
+            'rate': self.configured_rate,
+            'current_rate': round(self.rate, 1),
+            'consumed': self.consumed,
+            # 各线程等待时间之和
+            'throttled_seconds': round(self.throttled_seconds, 3),
+            'backoffs': self.backoffs,
+        }
+
+
+class RateLimiter:
+    """元数据操作 (创建/删除文件) 与数据写入字节分别限速"""
+
+    def __init__(self, ops_per_second: Optional[float] = None, bytes_per_second: Optional[float] = None,
+                 adaptive: bool = True):
+        self.ops = TokenBucket(ops_per_second, adaptive=adaptive) if ops_per_second else None
+        self.data = TokenBucket(bytes_per_second, adaptive=adaptive, latency_floor=DATA_LATENCY_FLOOR) \
+            if bytes_per_second else None
+
+    @contextlib.contextmanager
+    def _metadata_op(self):
+        self.ops.acquire(1)
+        started = time.monotonic()
+        yield
+        self.ops.observe(time.monotonic() - started)
+
+    def metadata_op(self):
+        return self._metadata_op() if self.ops is not None else _NULL_CONTEXT
+
+    @contextlib.contextmanager
+    def _data_write(self, nbytes: int):
+        self.data.acquire(nbytes)
+        started = time.monotonic()
+        yield
+        if nbytes >= ADAPT_MIN_WRITE:
+            self.data.observe((time.monotonic() - started) / nbytes)
+
+    def data_write(self, nbytes: int):
+        return self._data_write(nbytes) if self.data is not None else _NULL_CONTEXT
+
+    def describe(self) -> Dict:
+        return {
+            'metadata': self.ops.describe() if self.ops is not None else None,
+            'data': self.data.describe() if self.data is not None else None,
+        }
+
+
+def configure(ops_per_second: Optional[float] = None, bytes_per_second: Optional[float] = None,
+              adaptive: bool = True) -> Optional[RateLimiter]:
+    """
+    设置进程内全局生效的限速器 (各工作线程共享)；两个速率都为空时取消限速
+    限速器不跨进程共享，批量任务的进程池模式不能与限速同时使用
+    """
+    global active
+    active = RateLimiter(ops_per_second, bytes_per_second, adaptive) \
+        if ops_per_second or bytes_per_second else None
+    return active
+
+
+def metadata_op():
+    """包裹一次元数据操作 (创建、删除文件)：限速并记录延迟，未限速时为空上下文"""
+    limiter = active
+    return limiter.metadata_op() if limiter is not None else _NULL_CONTEXT
+
+
+def data_write(nbytes: int):
+    """包裹一次数据写入：按字节限速并记录延迟，未限速时为空上下文"""
+    limiter = active
+    return limiter.data_write(nbytes) if limiter is not None else _NULL_CONTEXT
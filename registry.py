@@ -0,0 +1,197 @@
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import rate_limit
+
+
+CONFIG_DIR = os.path.join(os.path.expanduser('~'), '.sparse_file_generator')
+REGISTRY_FILE = os.path.join(CONFIG_DIR, 'registry.sqlite3')
+
+# 默认布局: 只在末尾写入一个字节 (create_dummy_large_file 的行为)
+DEFAULT_LAYOUT = 'tail'
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    layout TEXT NOT NULL,
+    created REAL NOT NULL
+)
+'''
+
+
+def _prefix_range(prefix: Optional[str]) -> Tuple[str, str]:
+    """把目录前缀转换为主键上的范围查询 [low, high)"""
+    if not prefix:
+        return '', chr(0x10FFFF)
+    low = os.path.abspath(prefix)
+    if not low.endswith(os.sep):
+        low += os.sep
+    return low, low + chr(0x10FFFF)
+
+
+class FileRegistry:
+    """已生成文件的 SQLite 索引，记录按批次在单个事务中写入"""
+
+    def __init__(self, db_path: str = REGISTRY_FILE, batch_size: int = 5000):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._pending: List[Tuple[str, int, str, float]] = []
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def record(self, file_path: str, size: int, layout: str = DEFAULT_LAYOUT):
+        """登记一个已创建的文件，攒够 batch_size 条后统一提交"""
+        with self._lock:
+            self._pending.append((os.path.abspath(file_path), size, layout, time.time()))
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)', self._pending)
+        self._pending = []
+
+    def flush(self):
+        """提交所有未写入的记录"""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        """提交剩余记录并关闭数据库"""
+        if self._conn is None:
+            return
+        self.flush()
+        self._conn.close()
+        self._conn = None
+
+    def update_size(self, file_path: str, size: int, layout: Optional[str] = None) -> bool:
+        """
+        更新已登记文件的大小 (以及布局)
+        :return: 文件是否已登记
+        """
+        self.flush()
+        with self._conn:
+            if layout is None:
+                cursor = self._conn.execute('UPDATE files SET size = ? WHERE path = ?',
+                                            (size, os.path.abspath(file_path)))
+            else:
+                cursor = self._conn.execute('UPDATE files SET size = ?, layout = ? WHERE path = ?',
+                                            (size, layout, os.path.abspath(file_path)))
+        return cursor.rowcount > 0
+
+    def iter_files(self, prefix: Optional[str] = None) -> Iterator[Tuple[str, int, str, float]]:
+        """
+        按路径顺序遍历登记的文件
+        :param prefix: 只返回该目录下的文件
+        :return: (路径, 大小, 布局, 创建时间) 迭代器
+        """
+        self.flush()
+        low, high = _prefix_range(prefix)
+        return self._conn.execute(
+            'SELECT path, size, layout, created FROM files WHERE path >= ? AND path < ? ORDER BY path',
+            (low, high))
+
+    def verify(self, prefix: Optional[str] = None) -> Tuple[int, List[str], List[Tuple[str, int, int]],
+                                                           List[Tuple[str, OSError]]]:
+        """
+        用 stat 校验登记的文件是否仍然存在且大小一致；无法访问的文件 (如权限不足、网络存储故障) 单独记录，不中断校验
+        :return: (正常数, [缺失路径], [(路径, 登记大小, 实际大小)], [(路径, 异常)])
+        """
+        ok = 0
+        missing = []
+        mismatched = []
+        errors = []
+        for path, size, _layout, _created in self.iter_files(prefix):
+            try:
+                actual = os.stat(path).st_size
+            except FileNotFoundError:
+                missing.append(path)
+                continue
+            except OSError as e:
+                errors.append((path, e))
+                continue
+            if actual != size:
+                mismatched.append((path, size, actual))
+            else:
+                ok += 1
+        return ok, missing, mismatched, errors
+
+    def purge(self, prefix: Optional[str] = None, workers: Optional[int] = None,
+              dry_run: bool = False) -> Tuple[int, List[Tuple[str, OSError]]]:
+        """
+        删除登记的文件并移除索引记录，按目录分组并行 unlink (POSIX 上使用 dir_fd)
+        :param prefix: 只删除该目录下的文件
+        :param workers: 并行线程数
+        :param dry_run: 只统计不删除
+        :return: (删除数, [(路径, 异常)])
+        """
+        by_directory: Dict[str, List[str]] = {}
+        for path, _size, _layout, _created in self.iter_files(prefix):
+            directory, name = os.path.split(path)
+            by_directory.setdefault(directory, []).append(name)
+        if dry_run:
+            return sum(len(names) for names in by_directory.values()), []
+
+        removed = []
+        failures = []
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for done, failed in pool.map(lambda item: _unlink_in_directory(*item), by_directory.items()):
+                removed.extend(done)
+                failures.extend(failed)
+
+        with self._lock:
+            for start in range(0, len(removed), self.batch_size):
+                with self._conn:
+                    self._conn.executemany('DELETE FROM files WHERE path = ?',
+                                           [(path,) for path in removed[start:start + self.batch_size]])
+        return len(removed), failures
+
+
+def _unlink_in_directory(directory: str, names: List[str]):
+    """删除同一目录下的一组文件；已不存在的文件视为删除成功"""
+    removed = []
+    failures = []
+    dir_fd = None
+    if os.unlink in os.supports_dir_fd:
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+        except OSError:
+            dir_fd = None
+    try:
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                with rate_limit.metadata_op():
+                    if dir_fd is not None:
+                        os.unlink(name, dir_fd=dir_fd)
+                    else:
+                        os.unlink(path)
+                removed.append(path)
+            except FileNotFoundError:
+                removed.append(path)
+            except OSError as e:
+                failures.append((path, e))
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+    return removed, failures
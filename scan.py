@@ -0,0 +1,159 @@
+import collections
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+import sparse_io
+
+
+# 已分配字节 / 显示大小不超过该比例时视为稀疏文件
+DEFAULT_RATIO = 0.5
+
+# 小于该大小的文件不判断 (小文件可能内联在元数据中，st_blocks 为 0)
+DEFAULT_MIN_SIZE = 1 << 20
+
+# 在途目录数为线程数的倍数；待扫描的目录只保存路径
+WINDOW_FACTOR = 4
+
+
+class ScanStats:
+    """扫描计数"""
+
+    __slots__ = ('directories', 'files', 'sparse', 'size', 'allocated', 'errors')
+
+    def __init__(self):
+        self.directories = 0
+        self.files = 0
+        self.sparse = 0
+        self.size = 0
+        self.allocated = 0
+        self.errors = 0
+
+    def describe(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def analyze_extents(path: str) -> Tuple[int, int]:
+    """用 SEEK_DATA/SEEK_HOLE 统计数据区间数和数据字节数 (只读取元数据)"""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        extents = 0
+        data = 0
+        for _offset, length in sparse_io.iter_data_extents(f.fileno(), size):
+            extents += 1
+            data += length
+    return extents, data
+
+
+class Scanner:
+    """
+    并行扫描目录树，找出稀疏文件
+    每个任务用 os.scandir 读取一个目录，返回子目录和该目录中的记录；子目录再提交给线程池，
+    结果在调用线程中逐个目录交给回调，内存占用只与在途目录数有关，与文件总数无关
+    """
+
+    def __init__(self, ratio: float = DEFAULT_RATIO, min_size: int = DEFAULT_MIN_SIZE, extents: bool = False,
+                 report_all: bool = False, one_file_system: bool = False, workers: Optional[int] = None):
+        """
+        :param ratio: 已分配字节不超过 size * ratio 时视为稀疏
+        :param min_size: 小于该大小的文件不判断为稀疏
+        :param extents: 对稀疏文件进一步用 SEEK_DATA 统计数据区间 (需要打开文件)
+        :param report_all: 输出所有普通文件的记录，而不只是稀疏文件
+        :param one_file_system: 不进入其他设备上的目录
+        """
+        self.ratio = ratio
+        self.min_size = min_size
+        self.extents = extents
+        self.report_all = report_all
+        self.one_file_system = one_file_system
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 4)
+
+    def _scan_directory(self, path: str, device: int) -> Tuple[List[str], List[Dict], ScanStats]:
+        subdirs = []
+        records = []
+        stats = ScanStats()
+        stats.directories = 1
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not self.one_file_system or entry.stat(follow_symlinks=False).st_dev == device:
+                                subdirs.append(entry.path)
+                            continue
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError as e:
+                        stats.errors += 1
+                        records.append({'path': entry.path, 'error': str(e)})
+                        continue
+                    record = self._check_file(entry.path, st, stats)
+                    if record is not None:
+                        records.append(record)
+        except OSError as e:
+            stats.errors += 1
+            records.append({'path': path, 'error': str(e)})
+        return subdirs, records, stats
+
+    def _check_file(self, path: str, st: os.stat_result, stats: ScanStats) -> Optional[Dict]:
+        blocks = getattr(st, 'st_blocks', None)
+        allocated = blocks * 512 if blocks is not None else st.st_size
+        stats.files += 1
+        stats.size += st.st_size
+        stats.allocated += allocated
+        sparse = (blocks is not None and st.st_size >= self.min_size
+                  and allocated <= st.st_size * self.ratio)
+        if not sparse and not self.report_all:
+            return None
+        record = {
+            'path': path,
+            'size': st.st_size,
+            'allocated': allocated,
+            'ratio': round(allocated / st.st_size, 4) if st.st_size else 1.0,
+            'sparse': sparse,
+        }
+        if sparse:
+            stats.sparse += 1
+            if self.extents:
+                try:
+                    record['extents'], record['data_bytes'] = analyze_extents(path)
+                except OSError as e:
+                    stats.errors += 1
+                    record['error'] = str(e)
+        return record
+
+    def run(self, roots: List[str], on_record: Callable[[Dict], None]) -> Dict:
+        """
+        :param roots: 起始目录 (也可以是单个文件)
+        :param on_record: 每条记录的回调 (稀疏文件或错误)，在调用线程中执行
+        :return: 汇总计数 {"directories", "files", "sparse", "size", "allocated", "errors"}
+        """
+        totals = ScanStats()
+        pending = collections.deque()
+        for root in roots:
+            st = os.stat(root)
+            if os.path.isdir(root):
+                pending.append((root, st.st_dev))
+            else:
+                record = self._check_file(root, st, totals)
+                if record is not None:
+                    on_record(record)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            in_flight = {}
+            while pending or in_flight:
+                while pending and len(in_flight) < self.workers * WINDOW_FACTOR:
+                    path, device = pending.popleft()
+                    in_flight[pool.submit(self._scan_directory, path, device)] = device
+                completed, _pending = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    device = in_flight.pop(future)
+                    subdirs, records, stats = future.result()
+                    # 深度优先: 新发现的子目录先扫描，待扫描队列不会随目录树的宽度无限增长
+                    pending.extendleft((subdir, device) for subdir in reversed(subdirs))
+                    for record in records:
+                        on_record(record)
+                    for name in ScanStats.__slots__:
+                        setattr(totals, name, getattr(totals, name) + getattr(stats, name))
+        return totals.describe()
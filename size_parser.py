@@ -0,0 +1,110 @@
+import re
+from fractions import Fraction
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence
+
+
+_PREFIXES = 'KMGTPEZY'
+
+# 单位表 (小写)：B 与 IEC 单位 (KiB...) 恒为 1024 进制；
+# 兼容旧版的 K/KB/MB... 默认同样是 1024 进制，decimal_units=True 时按 SI 的 1000 进制
+_BINARY_UNITS = {'': 1, 'b': 1}
+_DECIMAL_UNITS = {'': 1, 'b': 1}
+for _i, _p in enumerate(_PREFIXES, 1):
+    _p = _p.lower()
+    for _name in (_p, _p + 'b'):
+        _BINARY_UNITS[_name] = 1024 ** _i
+        _DECIMAL_UNITS[_name] = 1000 ** _i
+    _BINARY_UNITS[_p + 'ib'] = _DECIMAL_UNITS[_p + 'ib'] = 1024 ** _i
+
+_TERM = r'(\d+(?:\.\d*)?|\.\d+)\s*([a-z]*)'
+_EXPRESSION_RE = re.compile(r'\s*[+-]?\s*%s(?:\s*[+-]\s*%s)*\s*' % (_TERM, _TERM))
+_TERM_RE = re.compile(r'([+-]?)\s*' + _TERM)
+_SIMPLE_RE = re.compile(r'\s*(\d+)\s*([a-z]*)\s*')
+
+# 未显式指定 decimal_units 时使用的进制，由命令行 --decimal-units 通过 configure 设置
+default_decimal_units = False
+
+
+def configure(decimal_units: bool = False):
+    """设置进程内 K/KB/MB... 的默认进制"""
+    global default_decimal_units
+    default_decimal_units = decimal_units
+
+
+@lru_cache(maxsize=65536)
+def _parse_normalized(text: str, decimal_units: bool) -> int:
+    """解析已经转换为小写的大小表达式 (带缓存)"""
+    units = _DECIMAL_UNITS if decimal_units else _BINARY_UNITS
+
+    # 快速路径: 单个整数加单位，例如 "500mb"
+    match = _SIMPLE_RE.fullmatch(text)
+    if match:
+        multiplier = units.get(match.group(2))
+        if multiplier is None:
+            raise ValueError('Unknown size unit: %r' % match.group(2))
+        return int(match.group(1)) * multiplier
+
+    if not _EXPRESSION_RE.fullmatch(text):
+        raise ValueError('Invalid size expression: %r' % text)
+
+    total = 0
+    for sign, number, unit in _TERM_RE.findall(text):
+        multiplier = units.get(unit)
+        if multiplier is None:
+            raise ValueError('Unknown size unit: %r' % unit)
+        if '.' in number:
+            # Fraction 精确表示十进制小数，乘积不经过任何舍入，结果向下取整到字节
+            value = int(Fraction(number) * multiplier)
+        else:
+            value = int(number) * multiplier
+        total = total - value if sign == '-' else total + value
+
+    if total < 0:
+        raise ValueError('Negative size: %r' % text)
+    return total
+
+
+def parse_size(size_str: str, decimal_units: Optional[bool] = None) -> int:
+    """
+    将大小表达式精确转换为字节数 (整数/分数运算，不经过 float)
+    支持: 纯数字、B、K/KB...YB、KiB...YiB，以及 "1TiB+4KiB" 这样的加减表达式
+    :param size_str: 大小字符串
+    :param decimal_units: 为 True 时 KB/MB... 按 1000 进制解析，None 使用 configure 设置的默认值
+    :return: 字节数
+    :raises ValueError: 表达式无效时
+    """
+    text = size_str.strip()
+    if text.isdigit():
+        return int(text)
+    if not text:
+        raise ValueError('Empty size expression')
+    if decimal_units is None:
+        decimal_units = default_decimal_units
+    return _parse_normalized(text.lower(), decimal_units)
+
+
+def parse_sizes(values: Iterable[str], decimal_units: Optional[bool] = None,
+                line_numbers: Optional[Sequence[int]] = None) -> List[int]:
+    """
+    批量解析一整列大小表达式 (例如清单文件中的 size 列)
+    列内重复的值只解析一次
+    :param values: 大小字符串序列
+    :param decimal_units: 为 True 时 KB/MB... 按 1000 进制解析，None 使用 configure 设置的默认值
+    :param line_numbers: 各值所在的行号，用于错误信息；None 时按从 1 开始的序号报告
+    :return: 与输入等长的字节数列表
+    :raises ValueError: 遇到无效值时 (带行号)
+    """
+    seen = {}
+    results = []
+    append = results.append
+    for index, value in enumerate(values):
+        size = seen.get(value)
+        if size is None:
+            try:
+                size = parse_size(value, decimal_units)
+            except ValueError as e:
+                raise ValueError('Line %d: %s' % (line_numbers[index] if line_numbers else index + 1, e))
+            seen[value] = size
+        append(size)
+    return results
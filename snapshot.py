@@ -0,0 +1,291 @@
+import bisect
+import collections
+import lzma
+import mmap
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import rate_limit
+import sparse_io
+
+
+# 快照文件魔数 (版本 1) 与结尾标记
+SNAPSHOT_MAGIC = b'SFGSNAP1'
+FOOTER_MAGIC = b'SFGSNIDX'
+
+CODEC_ZLIB = 'zlib'
+CODEC_LZMA = 'lzma'
+CODECS = {CODEC_ZLIB: 1, CODEC_LZMA: 2}
+_CODEC_NAMES = {value: name for name, value in CODECS.items()}
+
+DEFAULT_CHUNK = 4 << 20
+
+# 各编码可用的压缩级别 (zlib 的 level、lzma 的 preset)
+LEVELS = {CODEC_ZLIB: range(0, 10), CODEC_LZMA: range(0, 10)}
+DEFAULT_LEVEL = 6
+
+# 并行压缩/解压时在途的分块数为线程数的倍数，限制内存占用
+WINDOW_FACTOR = 2
+
+# 头部: 魔数, 编码, 压缩级别, 保留, 分块大小, 文件显示大小
+_HEADER = struct.Struct('<8sBBHIQ')
+# 索引项: 文件内偏移, 快照内偏移, 原始长度, 压缩后长度, 原始数据 CRC32
+_CHUNK = struct.Struct('<QQIII')
+# 数据区间: 偏移, 长度
+_EXTENT = struct.Struct('<QQ')
+# 结尾: 索引起始位置, 区间数, 分块数, 结尾标记
+_FOOTER = struct.Struct('<QQQ8s')
+
+# 格式:
+#   头部 | 各分块的压缩数据 (按文件偏移顺序) | 数据区间表 | 分块索引 | 结尾
+# 分块不跨越数据区间；索引项定长，恢复时在 mmap 上二分查找，只解压与请求范围重叠的分块
+
+
+def _compress(codec: str, level: int, data: bytes) -> bytes:
+    try:
+        if codec == CODEC_LZMA:
+            return lzma.compress(data, preset=level)
+        return zlib.compress(data, level)
+    except (zlib.error, lzma.LZMAError) as e:
+        raise ValueError('Compression failed: %s' % e)
+
+
+def _decompress(codec: str, data) -> bytes:
+    """:raises ValueError: 压缩数据损坏时"""
+    try:
+        if codec == CODEC_LZMA:
+            return lzma.decompress(data)
+        return zlib.decompress(data)
+    except (zlib.error, lzma.LZMAError) as e:
+        raise ValueError('Corrupt snapshot chunk: %s' % e)
+
+
+def _split(extents: List[Tuple[int, int]], chunk: int) -> List[Tuple[int, int]]:
+    pieces = []
+    for offset, length in extents:
+        end = offset + length
+        while offset < end:
+            step = min(chunk, end - offset)
+            pieces.append((offset, step))
+            offset += step
+    return pieces
+
+
+def _ordered_map(pool: ThreadPoolExecutor, func, items, window: int):
+    """按顺序产出 func(item) 的结果，同时最多有 window 个任务在途 (Executor.map 会一次性提交全部任务)"""
+    pending = collections.deque()
+    for item in items:
+        pending.append(pool.submit(func, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def create_snapshot(path: str, out_path: str, codec: str = CODEC_ZLIB, level: Optional[int] = None,
+                    chunk: int = DEFAULT_CHUNK, workers: Optional[int] = None) -> Dict:
+    """
+    为稀疏文件创建可随机访问的压缩快照: 只读取数据区间，切分为独立压缩的分块并行压缩，按顺序写出
+    :param codec: zlib 或 lzma
+    :param level: 压缩级别 (0-9)，None 使用 DEFAULT_LEVEL
+    :param chunk: 分块大小 (随机恢复的最小解压单位)
+    :return: {"path", "size", "extents", "chunks", "data_bytes", "compressed_bytes"}
+    """
+    if codec not in CODECS:
+        raise ValueError('Unknown codec: %s' % codec)
+    if not 0 < chunk < 1 << 32:
+        raise ValueError('Invalid chunk size')
+    if level is None:
+        level = DEFAULT_LEVEL
+    if level not in LEVELS[codec]:
+        raise ValueError('Invalid %s compression level: %d (expected %d-%d)'
+                         % (codec, level, LEVELS[codec][0], LEVELS[codec][-1]))
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+
+    with open(path, 'rb') as source:
+        fd = source.fileno()
+        size = os.fstat(fd).st_size
+        extents = list(sparse_io.iter_data_extents(fd, size))
+        pieces = _split(extents, chunk)
+
+        def compress_piece(piece):
+            offset, length = piece
+            data = sparse_io.read_at(fd, length, offset)
+            return offset, len(data), zlib.crc32(data), _compress(codec, level, data)
+
+        index = bytearray()
+        compressed_bytes = 0
+        with rate_limit.metadata_op():
+            out = open(out_path, 'wb')
+        with out, ThreadPoolExecutor(max_workers=workers) as pool:
+            out.write(_HEADER.pack(SNAPSHOT_MAGIC, CODECS[codec], level, 0, chunk, size))
+            position = _HEADER.size
+            for offset, length, crc, data in _ordered_map(pool, compress_piece, pieces, workers * WINDOW_FACTOR):
+                with rate_limit.data_write(len(data)):
+                    out.write(data)
+                index += _CHUNK.pack(offset, position, length, len(data), crc)
+                position += len(data)
+                compressed_bytes += len(data)
+            for offset, length in extents:
+                out.write(_EXTENT.pack(offset, length))
+            out.write(index)
+            out.write(_FOOTER.pack(position, len(extents), len(pieces), FOOTER_MAGIC))
+
+    return {
+        'path': out_path,
+        'size': size,
+        'extents': len(extents),
+        'chunks': len(pieces),
+        'data_bytes': sum(length for _offset, length in extents),
+        'compressed_bytes': compressed_bytes,
+    }
+
+
+class _ChunkOffsets:
+    """把 mmap 中的定长索引项按文件偏移呈现为序列，供 bisect 使用，不解析整个索引"""
+
+    def __init__(self, mapped: mmap.mmap, start: int, count: int):
+        self.mapped = mapped
+        self.start = start
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index: int) -> int:
+        return _CHUNK.unpack_from(self.mapped, self.start + index * _CHUNK.size)[0]
+
+    def entry(self, index: int) -> Tuple[int, int, int, int, int]:
+        return _CHUNK.unpack_from(self.mapped, self.start + index * _CHUNK.size)
+
+
+class Snapshot:
+    """只读打开的快照，头部和索引都通过 mmap 按需读取"""
+
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        try:
+            self._mapped = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 空文件无法映射
+            self._file.close()
+            raise ValueError('Not a snapshot file')
+        try:
+            if len(self._mapped) < _HEADER.size + _FOOTER.size:
+                raise ValueError('Not a snapshot file')
+            magic, codec, self.level, _reserved, self.chunk, self.size = _HEADER.unpack_from(self._mapped, 0)
+            index_start, self.extent_count, self.chunk_count, footer_magic = _FOOTER.unpack_from(
+                self._mapped, len(self._mapped) - _FOOTER.size)
+            if magic != SNAPSHOT_MAGIC or footer_magic != FOOTER_MAGIC or codec not in _CODEC_NAMES:
+                raise ValueError('Not a snapshot file')
+            # 区间表和索引必须正好填满数据区与结尾之间，否则文件被截断或结尾损坏
+            if index_start < _HEADER.size or (index_start + self.extent_count * _EXTENT.size
+                                              + self.chunk_count * _CHUNK.size + _FOOTER.size
+                                              != len(self._mapped)):
+                raise ValueError('Corrupt snapshot index')
+            self.codec = _CODEC_NAMES[codec]
+            self._extent_start = index_start
+            self.chunks = _ChunkOffsets(self._mapped, index_start + self.extent_count * _EXTENT.size,
+                                        self.chunk_count)
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self._mapped.close()
+        self._file.close()
+
+    def extents(self) -> List[Tuple[int, int]]:
+        return [_EXTENT.unpack_from(self._mapped, self._extent_start + i * _EXTENT.size)
+                for i in range(self.extent_count)]
+
+    def chunks_for(self, offset: int, length: int) -> List[int]:
+        """与 [offset, offset+length) 重叠的分块序号 (二分查找起点)"""
+        end = offset + length
+        index = max(0, bisect.bisect_right(self.chunks, offset) - 1)
+        selected = []
+        while index < self.chunk_count:
+            chunk_offset, _position, chunk_length, _compressed, _crc = self.chunks.entry(index)
+            if chunk_offset >= end:
+                break
+            if chunk_offset + chunk_length > offset:
+                selected.append(index)
+            index += 1
+        return selected
+
+    def read_chunk(self, index: int) -> Tuple[int, bytes]:
+        """解压一个分块并校验 CRC32，返回 (文件内偏移, 数据)"""
+        offset, position, length, compressed, crc = self.chunks.entry(index)
+        if position < _HEADER.size or position + compressed > self._extent_start or offset + length > self.size:
+            raise ValueError('Corrupt snapshot index entry %d' % index)
+        # 切片也要显式释放: 解压出错时回溯仍引用它，否则关闭 mmap 会失败
+        with memoryview(self._mapped) as view, view[position:position + compressed] as piece:
+            data = _decompress(self.codec, piece)
+        if len(data) != length or zlib.crc32(data) != crc:
+            raise ValueError('Corrupt snapshot chunk at offset %d' % offset)
+        return offset, data
+
+    def describe(self) -> Dict:
+        return {
+            'size': self.size,
+            'codec': self.codec,
+            'level': self.level,
+            'chunk': self.chunk,
+            'extents': self.extent_count,
+            'chunks': self.chunk_count,
+            'snapshot_bytes': len(self._mapped),
+        }
+
+
+def restore_snapshot(snapshot_path: str, dest: str, ranges: Optional[List[Tuple[int, int]]] = None,
+                     workers: Optional[int] = None) -> Dict:
+    """
+    从快照恢复文件: 先截断到原显示大小形成空洞，再并行解压并写入数据
+    :param ranges: 只恢复这些范围 [(偏移, 长度), ...]，其余部分保持为空洞；None 恢复全部数据
+    :return: {"path", "size", "chunks", "written_bytes"}
+    """
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    with Snapshot(snapshot_path) as snap:
+        if ranges is None:
+            ranges = [(0, snap.size)]
+        # 合并重叠的请求范围，避免重复写入
+        merged: List[List[int]] = []
+        for offset, length in sorted(ranges):
+            end = min(offset + length, snap.size)
+            if offset >= end:
+                continue
+            if merged and offset <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([offset, end])
+        ranges = [(start, end - start) for start, end in merged]
+        selected = sorted({index for offset, length in ranges for index in snap.chunks_for(offset, length)})
+
+        def restore_chunk(index):
+            offset, data = snap.read_chunk(index)
+            written = 0
+            with memoryview(data) as view:
+                for start, length in ranges:
+                    low = max(start, offset)
+                    high = min(start + length, offset + len(data))
+                    if low < high:
+                        sparse_io.write_at(fd, view[low - offset:high - offset], low)
+                        written += high - low
+            return written
+
+        with rate_limit.metadata_op():
+            out = open(dest, 'wb')
+        with out, ThreadPoolExecutor(max_workers=workers) as pool:
+            fd = out.fileno()
+            out.truncate(snap.size)
+            written = sum(_ordered_map(pool, restore_chunk, selected, workers * WINDOW_FACTOR))
+        return {'path': dest, 'size': snap.size, 'chunks': len(selected), 'written_bytes': written}
@@ -0,0 +1,66 @@
+import errno
+import os
+import shutil
+from typing import Dict, Optional
+
+import fs_probe
+import rate_limit
+import registry
+from language_manager import lang
+
+
+def create_dummy_large_file(file_path: str, apparent_size: int):
+    """
+    创建一个显示为大文件但实际上占用空间很小的文件
+    :param file_path: 文件路径
+    :param apparent_size: 显示的大小（字节）
+    """
+    check_target_filesystem(os.path.dirname(os.path.abspath(file_path)), apparent_size)
+    with rate_limit.metadata_op():
+        with open(file_path, 'wb') as f:
+            f.seek(apparent_size - 1)
+            f.write(b'\0')
+
+
+def check_target_filesystem(directory: str, apparent_size: int) -> Dict:
+    """
+    根据缓存的文件系统能力校验创建请求，避免把底层异常 (如 EFBIG) 直接抛给用户
+    :param directory: 目标目录
+    :param apparent_size: 显示的大小（字节）
+    :return: 文件系统能力字典
+    """
+    try:
+        caps = fs_probe.get_capabilities(directory)
+    except OSError:
+        return {}
+
+    max_file_size = caps.get('max_file_size')
+    if max_file_size is not None and apparent_size > max_file_size:
+        raise OSError(errno.EFBIG, lang.get('size_exceeds_fs_limit', apparent_size, max_file_size))
+
+    # 不支持稀疏文件时文件会被完整分配，需要足够的可用空间
+    if caps and not caps.get('sparse'):
+        free = shutil.disk_usage(directory).free
+        if apparent_size > free:
+            raise OSError(errno.ENOSPC, lang.get('fs_not_sparse_no_space', apparent_size, free))
+    return caps
+
+
+def open_registry() -> Optional[registry.FileRegistry]:
+    """打开已生成文件的索引；索引只是辅助记录，打开失败时返回 None 而不影响文件创建"""
+    try:
+        return registry.FileRegistry()
+    except Exception:
+        return None
+
+
+def register_created_file(file_path: str, apparent_size: int, layout: str = registry.DEFAULT_LAYOUT):
+    """把单个新建文件登记到索引"""
+    file_registry = open_registry()
+    if file_registry is None:
+        return
+    try:
+        with file_registry:
+            file_registry.record(file_path, apparent_size, layout)
+    except Exception:
+        pass
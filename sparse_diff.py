@@ -0,0 +1,117 @@
+import collections
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import sparse_io
+
+
+DEFAULT_CHUNK = 8 << 20
+DEFAULT_BLOCK = 4096
+
+# 在途分块数为线程数的倍数: 每个在途分块要同时读入两份数据，pool.map 会一次性提交全部分块
+WINDOW_FACTOR = 2
+
+
+def merge_extents(a: List[Tuple[int, int]], b: List[Tuple[int, int]], limit: int) -> List[Tuple[int, int]]:
+    """
+    合并两个文件的数据区间 (取并集)，截断到 limit
+    两边都是空洞的范围不在结果中，无需读取
+    """
+    ranges = sorted((offset, offset + length) for offset, length in a + b if offset < limit)
+    merged = []
+    for start, end in ranges:
+        end = min(end, limit)
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(start, end - start) for start, end in merged]
+
+
+def _split(ranges: List[Tuple[int, int]], chunk: int) -> Iterator[Tuple[int, int]]:
+    for offset, length in ranges:
+        end = offset + length
+        while offset < end:
+            step = min(chunk, end - offset)
+            yield offset, step
+            offset += step
+
+
+def _append_range(ranges: List[List[int]], offset: int, length: int):
+    if ranges and ranges[-1][0] + ranges[-1][1] == offset:
+        ranges[-1][1] += length
+    else:
+        ranges.append([offset, length])
+
+
+def _compare_piece(fd_a: int, fd_b: int, offset: int, length: int, block: int) -> List[List[int]]:
+    """比较一个分块，不同时按 block 粒度定位差异范围"""
+    data_a = sparse_io.read_at(fd_a, length, offset)
+    data_b = sparse_io.read_at(fd_b, length, offset)
+    if data_a == data_b:
+        return []
+    view_a = memoryview(data_a)
+    view_b = memoryview(data_b)
+    differences = []
+    for start in range(0, length, block):
+        if view_a[start:start + block] != view_b[start:start + block]:
+            _append_range(differences, offset + start, min(block, length - start))
+    return differences
+
+
+def diff_files(path_a: str, path_b: str, chunk: int = DEFAULT_CHUNK, block: int = DEFAULT_BLOCK,
+               workers: Optional[int] = None) -> Dict:
+    """
+    感知空洞的文件比较: 只读取至少一方有数据的范围，分块并行比较
+    运行时间取决于已分配的数据量而不是显示大小
+    :return: 结果字典，differences 为 [{"offset", "length"}]
+    :raises ValueError: 分块或比较块大小不是正数时
+    """
+    if chunk <= 0:
+        raise ValueError('Chunk size must be positive')
+    if block <= 0:
+        raise ValueError('Block size must be positive')
+    with open(path_a, 'rb') as file_a, open(path_b, 'rb') as file_b:
+        fd_a, fd_b = file_a.fileno(), file_b.fileno()
+        size_a = os.fstat(fd_a).st_size
+        size_b = os.fstat(fd_b).st_size
+        common = min(size_a, size_b)
+        ranges = merge_extents(list(sparse_io.iter_data_extents(fd_a, size_a)),
+                               list(sparse_io.iter_data_extents(fd_b, size_b)), common)
+        workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        if not hasattr(os, 'pread'):
+            # 没有 pread 时 read_at 依赖共享的文件偏移，只能串行读取
+            workers = 1
+
+        differences: List[List[int]] = []
+
+        def merge(piece_differences):
+            for offset, length in piece_differences:
+                _append_range(differences, offset, length)
+
+        # 按偏移顺序取回结果 (差异范围才能与前一块相接)，同时最多有 window 个分块在途
+        window = workers * WINDOW_FACTOR
+        pending = collections.deque()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for offset, length in _split(ranges, chunk):
+                pending.append(pool.submit(_compare_piece, fd_a, fd_b, offset, length, block))
+                if len(pending) >= window:
+                    merge(pending.popleft().result())
+            while pending:
+                merge(pending.popleft().result())
+
+    # 长度不同时，多出来的部分整体视为差异
+    if size_a != size_b:
+        _append_range(differences, common, abs(size_a - size_b))
+
+    return {
+        'a': path_a,
+        'b': path_b,
+        'size_a': size_a,
+        'size_b': size_b,
+        'identical': not differences,
+        'compared_bytes': sum(length for _offset, length in ranges),
+        'differences': [{'offset': offset, 'length': length} for offset, length in differences],
+    }
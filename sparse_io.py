@@ -0,0 +1,192 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import sys
+from typing import Tuple
+
+import rate_limit
+
+
+# fallocate(2) 模式位 (linux/falloc.h)
+FALLOC_FL_KEEP_SIZE = 0x01
+FALLOC_FL_PUNCH_HOLE = 0x02
+FALLOC_FL_COLLAPSE_RANGE = 0x08
+FALLOC_FL_ZERO_RANGE = 0x10
+FALLOC_FL_INSERT_RANGE = 0x20
+
+# ioctl FICLONE (linux/fs.h)，用于 reflink 克隆
+FICLONE = 0x40049409
+
+# ioctl FS_IOC_FIEMAP (linux/fiemap.h)，查询物理区间映射
+FS_IOC_FIEMAP = 0xC020660B
+FIEMAP_FLAG_SYNC = 0x01
+FIEMAP_MAX_OFFSET = 0xFFFFFFFFFFFFFFFF
+
+
+class FiemapExtent(ctypes.Structure):
+    """struct fiemap_extent"""
+    _fields_ = [
+        ('fe_logical', ctypes.c_uint64),
+        ('fe_physical', ctypes.c_uint64),
+        ('fe_length', ctypes.c_uint64),
+        ('fe_reserved64', ctypes.c_uint64 * 2),
+        ('fe_flags', ctypes.c_uint32),
+        ('fe_reserved', ctypes.c_uint32 * 3),
+    ]
+
+
+class Fiemap(ctypes.Structure):
+    """struct fiemap (不含柔性数组 fm_extents)"""
+    _fields_ = [
+        ('fm_start', ctypes.c_uint64),
+        ('fm_length', ctypes.c_uint64),
+        ('fm_flags', ctypes.c_uint32),
+        ('fm_mapped_extents', ctypes.c_uint32),
+        ('fm_extent_count', ctypes.c_uint32),
+        ('fm_reserved', ctypes.c_uint32),
+    ]
+
+_libc = None
+
+
+def _get_libc():
+    """延迟加载 libc 并声明 fallocate 的参数类型"""
+    global _libc
+    if _libc is None:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        libc.fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_longlong, ctypes.c_longlong]
+        libc.fallocate.restype = ctypes.c_int
+        _libc = libc
+    return _libc
+
+
+def _not_supported():
+    return OSError(errno.EOPNOTSUPP, os.strerror(errno.EOPNOTSUPP))
+
+
+def supports_seek_hole() -> bool:
+    """当前平台是否提供 SEEK_DATA / SEEK_HOLE"""
+    return hasattr(os, 'SEEK_DATA') and hasattr(os, 'SEEK_HOLE')
+
+
+def fallocate(fd: int, mode: int, offset: int, length: int):
+    """
+    通过 ctypes 调用 fallocate(2)
+    :param fd: 文件描述符
+    :param mode: FALLOC_FL_* 模式位组合
+    :param offset: 起始偏移
+    :param length: 长度
+    """
+    if not sys.platform.startswith('linux'):
+        raise _not_supported()
+    try:
+        libc = _get_libc()
+    except (OSError, AttributeError):
+        raise _not_supported()
+    if libc.fallocate(fd, mode, offset, length) != 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+
+
+def reflink(src_fd: int, dst_fd: int):
+    """使用 FICLONE 将 src_fd 的全部内容以写时复制方式克隆到 dst_fd"""
+    if not sys.platform.startswith('linux'):
+        raise _not_supported()
+    import fcntl
+    fcntl.ioctl(dst_fd, FICLONE, src_fd)
+
+
+def write_at(fd: int, data: bytes, offset: int):
+    """在指定偏移写入数据 (兼容没有 os.pwrite 的平台)，受全局数据写入限速约束"""
+    with rate_limit.data_write(len(data)):
+        if hasattr(os, 'pwrite'):
+            os.pwrite(fd, data, offset)
+        else:
+            os.lseek(fd, offset, os.SEEK_SET)
+            os.write(fd, data)
+
+
+def read_at(fd: int, length: int, offset: int) -> bytes:
+    """从指定偏移读取数据 (兼容没有 os.pread 的平台)"""
+    if hasattr(os, 'pread'):
+        return os.pread(fd, length, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, length)
+
+
+def read_into(fd: int, view: memoryview, offset: int) -> int:
+    """
+    从指定偏移读取数据到预先分配的缓冲区，直到填满或到达文件末尾
+    :return: 读取的字节数
+    """
+    total = 0
+    while total < len(view):
+        if hasattr(os, 'preadv'):
+            count = os.preadv(fd, [view[total:]], offset + total)
+        else:
+            data = read_at(fd, len(view) - total, offset + total)
+            count = len(data)
+            view[total:total + count] = data
+        if count == 0:
+            break
+        total += count
+    return total
+
+
+def iter_data_extents(fd: int, size: int):
+    """
+    用 SEEK_DATA/SEEK_HOLE 枚举文件的数据区间，不读取任何数据
+    平台或文件系统不支持时把整个文件视为一个数据区间
+    :param fd: 文件描述符
+    :param size: 文件大小
+    :return: (偏移, 长度) 迭代器
+    """
+    if size <= 0:
+        return
+    if not supports_seek_hole():
+        yield 0, size
+        return
+    offset = 0
+    while offset < size:
+        try:
+            start = os.lseek(fd, offset, os.SEEK_DATA)
+        except OSError as e:
+            if e.errno == errno.ENXIO:
+                # 之后全部是空洞
+                return
+            if offset == 0 and e.errno in (errno.EINVAL, errno.EOPNOTSUPP):
+                yield 0, size
+                return
+            raise
+        if start >= size:
+            return
+        end = min(os.lseek(fd, start, os.SEEK_HOLE), size)
+        yield start, end - start
+        offset = end
+
+
+def fiemap_extent_count(fd: int, sync: bool = True) -> int:
+    """
+    用 FIEMAP 查询文件的物理区间数 (fm_extent_count 为 0 时内核只返回数量)
+    :raises OSError: 平台或文件系统不支持 FIEMAP
+    """
+    if not sys.platform.startswith('linux'):
+        raise _not_supported()
+    import fcntl
+    request = Fiemap(0, FIEMAP_MAX_OFFSET, FIEMAP_FLAG_SYNC if sync else 0, 0, 0, 0)
+    buf = bytearray(request)
+    fcntl.ioctl(fd, FS_IOC_FIEMAP, buf, True)
+    return Fiemap.from_buffer(buf).fm_mapped_extents
+
+
+def count_extents(fd: int) -> Tuple[int, str]:
+    """
+    统计文件区间数: 优先使用 FIEMAP (物理区间)，不支持时退回 SEEK_DATA (逻辑数据段，
+    看不出物理上相邻与否)
+    :return: (区间数, 来源 "fiemap" 或 "seek_data")
+    """
+    try:
+        return fiemap_extent_count(fd), 'fiemap'
+    except OSError:
+        return sum(1 for _extent in iter_data_extents(fd, os.fstat(fd).st_size)), 'seek_data'
@@ -0,0 +1,248 @@
+import collections
+import gzip
+import os
+import tarfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, List, Optional, Tuple
+
+import rate_limit
+import sparse_io
+
+
+BLOCKSIZE = tarfile.BLOCKSIZE
+RECORDSIZE = tarfile.RECORDSIZE
+
+# 读取数据区间时的单次读取量
+COPY_CHUNK = 1 << 20
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
+def _gzip_member(data: bytes, level: int) -> bytes:
+    """把一块数据压缩成一个独立的 gzip 成员"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+class ParallelGzipWriter:
+    """
+    把写入的数据切块后在线程池中并行压缩，按顺序输出
+    结果是多个 gzip 成员的拼接，gzip/tar 等标准工具都能直接解压
+    """
+
+    def __init__(self, raw: BinaryIO, workers: Optional[int] = None,
+                 block_size: int = 1 << 20, level: int = 6):
+        self.raw = raw
+        self.block_size = block_size
+        self.level = level
+        workers = workers or os.cpu_count() or 1
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._max_in_flight = 2 * workers
+        self._in_flight = collections.deque()
+        self._buffer = bytearray()
+
+    def write(self, data: bytes):
+        self._buffer += data
+        while len(self._buffer) >= self.block_size:
+            self._submit(bytes(self._buffer[:self.block_size]))
+            del self._buffer[:self.block_size]
+
+    def _submit(self, block: bytes):
+        self._in_flight.append(self._pool.submit(_gzip_member, block, self.level))
+        while len(self._in_flight) > self._max_in_flight:
+            self.raw.write(self._in_flight.popleft().result())
+
+    def close(self):
+        """压缩剩余数据并按顺序写出所有结果"""
+        if self._buffer:
+            self._submit(bytes(self._buffer))
+            self._buffer = bytearray()
+        while self._in_flight:
+            self.raw.write(self._in_flight.popleft().result())
+        self._pool.shutdown()
+
+
+class SparseTarWriter:
+    """以 GNU/PAX 1.0 稀疏格式流式写出 tar 归档，只读取文件的数据区间"""
+
+    def __init__(self, out):
+        self.out = out
+        self.offset = 0
+        self.files = 0
+        self.apparent_bytes = 0
+        self.data_bytes = 0
+
+    def _write(self, data: bytes):
+        self.out.write(data)
+        self.offset += len(data)
+
+    def _pad(self):
+        remainder = self.offset % BLOCKSIZE
+        if remainder:
+            self._write(b'\0' * (BLOCKSIZE - remainder))
+
+    def _write_header(self, info: tarfile.TarInfo):
+        self._write(info.tobuf(tarfile.PAX_FORMAT, 'utf-8', 'surrogateescape'))
+
+    def add_directory(self, path: str, arcname: str):
+        """写入目录条目"""
+        st = os.stat(path)
+        info = tarfile.TarInfo(arcname)
+        info.type = tarfile.DIRTYPE
+        info.mode = st.st_mode & 0o7777
+        info.mtime = int(st.st_mtime)
+        self._write_header(info)
+
+    def add_file(self, path: str, arcname: str):
+        """写入普通文件；含空洞时按 PAX 1.0 稀疏格式写出稀疏表和数据区间"""
+        with open(path, 'rb') as f:
+            fd = f.fileno()
+            st = os.fstat(fd)
+            size = st.st_size
+            extents = list(sparse_io.iter_data_extents(fd, size))
+            data_size = sum(length for _offset, length in extents)
+
+            info = tarfile.TarInfo(arcname)
+            info.mode = st.st_mode & 0o7777
+            info.mtime = int(st.st_mtime)
+            sparse_map = b''
+            if data_size < size:
+                # 以空洞结尾时按 GNU tar 的约定追加一个 (realsize, 0) 条目
+                if not extents or sum(extents[-1]) < size:
+                    extents.append((size, 0))
+                sparse_map = ('%d\n' % len(extents)).encode('ascii') + b''.join(
+                    ('%d\n%d\n' % extent).encode('ascii') for extent in extents)
+                sparse_map += b'\0' * (-len(sparse_map) % BLOCKSIZE)
+                directory, name = os.path.split(arcname)
+                info.name = os.path.join(directory, 'GNUSparseFile.0', name).replace(os.sep, '/')
+                info.pax_headers = {
+                    'GNU.sparse.major': '1',
+                    'GNU.sparse.minor': '0',
+                    'GNU.sparse.name': arcname,
+                    'GNU.sparse.realsize': str(size),
+                }
+            info.size = len(sparse_map) + data_size
+            self._write_header(info)
+            self._write(sparse_map)
+
+            for offset, length in extents:
+                end = offset + length
+                while offset < end:
+                    chunk = sparse_io.read_at(fd, min(COPY_CHUNK, end - offset), offset)
+                    if not chunk:
+                        raise tarfile.TarError('File shrank while archiving: %s' % path)
+                    self._write(chunk)
+                    offset += len(chunk)
+            self._pad()
+
+        self.files += 1
+        self.apparent_bytes += size
+        self.data_bytes += data_size
+
+    def add(self, path: str):
+        """添加文件或整个目录树，归档内路径相对于 path 的上级目录"""
+        path = os.path.abspath(path)
+        base = os.path.dirname(path)
+
+        def arcname_of(p):
+            return os.path.relpath(p, base).replace(os.sep, '/')
+
+        if not os.path.isdir(path):
+            self.add_file(path, arcname_of(path))
+            return
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            self.add_directory(dirpath, arcname_of(dirpath))
+            for name in sorted(filenames):
+                file_path = os.path.join(dirpath, name)
+                if os.path.isfile(file_path) and not os.path.islink(file_path):
+                    self.add_file(file_path, arcname_of(file_path))
+
+    def close(self):
+        """写入归档结束标记并补齐到记录边界"""
+        self._write(b'\0' * (2 * BLOCKSIZE))
+        remainder = self.offset % RECORDSIZE
+        if remainder:
+            self._write(b'\0' * (RECORDSIZE - remainder))
+
+
+def export_archive(sources: List[str], out: BinaryIO, compress: bool = False,
+                   workers: Optional[int] = None) -> Tuple[int, int, int]:
+    """
+    把文件/目录导出为稀疏 tar 归档流
+    :param sources: 源文件或目录列表
+    :param out: 二进制输出流 (文件或 stdout)
+    :param compress: 是否输出 gzip 压缩流 (并行压缩)
+    :param workers: 压缩线程数
+    :return: (文件数, 显示大小总和, 实际读取的数据字节数)
+    """
+    sink = ParallelGzipWriter(out, workers) if compress else out
+    writer = SparseTarWriter(sink)
+    for source in sources:
+        writer.add(source)
+    writer.close()
+    if compress:
+        sink.close()
+    out.flush()
+    return writer.files, writer.apparent_bytes, writer.data_bytes
+
+
+def _safe_target(dest_dir: str, name: str) -> str:
+    """拒绝绝对路径和 .. 逃逸的成员名"""
+    target = os.path.abspath(os.path.join(dest_dir, name))
+    root = os.path.abspath(dest_dir)
+    if target != root and not target.startswith(root + os.sep):
+        raise tarfile.TarError('Unsafe member path: %s' % name)
+    return target
+
+
+def import_archive(stream: BinaryIO, dest_dir: str,
+                   on_file: Optional[Callable[[str, int], None]] = None) -> int:
+    """
+    从 tar 归档流 (可为 gzip 压缩) 还原文件
+    稀疏成员先截断到完整大小重建空洞，再只写入数据区间
+    :param stream: 可读二进制流，需支持 peek 或为普通文件
+    :param dest_dir: 目标目录
+    :param on_file: 每还原一个文件后的回调 on_file(路径, 显示大小)
+    :return: 还原的文件数
+    """
+    if not hasattr(stream, 'peek'):
+        stream = open(stream.fileno(), 'rb', closefd=False)
+    if stream.peek(2)[:2] == _GZIP_MAGIC:
+        # GzipFile 支持多成员拼接的 gzip 流 (并行压缩的输出)
+        stream = gzip.GzipFile(fileobj=stream, mode='rb')
+
+    count = 0
+    with tarfile.open(fileobj=stream, mode='r|') as tar:
+        for member in tar:
+            target = _safe_target(dest_dir, member.name)
+            if member.isdir():
+                os.makedirs(target, exist_ok=True)
+                continue
+            if not member.isreg():
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            # 流式模式下成员数据按区间顺序紧密排列，直接从底层流顺序读取
+            source = tar.fileobj
+            source.seek(member.offset_data)
+            extents = member.sparse if member.sparse is not None else [(0, member.size)]
+            with rate_limit.metadata_op():
+                out = open(target, 'wb')
+            with out:
+                out.truncate(member.size)
+                fd = out.fileno()
+                for offset, length in extents:
+                    end = offset + length
+                    while offset < end:
+                        chunk = source.read(min(COPY_CHUNK, end - offset))
+                        if not chunk:
+                            raise tarfile.ReadError('Unexpected end of archive')
+                        sparse_io.write_at(fd, chunk, offset)
+                        offset += len(chunk)
+            os.chmod(target, member.mode)
+            os.utime(target, (member.mtime, member.mtime))
+            count += 1
+            if on_file is not None:
+                on_file(target, member.size)
+    return count
@@ -0,0 +1,26 @@
+import io
+
+import pytest
+
+import layout
+
+
+def _bundle():
+    out = io.BytesIO()
+    layout.dump_layouts([layout.FileLayout('a/b.bin', 1 << 40, [(0, 4096), (1 << 30, 1 << 20)]),
+                         layout.FileLayout('c.bin', 123, [])], out)
+    return out.getvalue()
+
+
+def test_round_trip():
+    layouts = layout.load_layouts(io.BytesIO(_bundle()))
+    assert layouts[0] == ('a/b.bin', 1 << 40, [(0, 4096), (1 << 30, 1 << 20)])
+    assert layouts[1] == ('c.bin', 123, [])
+
+
+def test_truncated_bundle_raises_value_error():
+    data = _bundle()
+    # 在每个位置截断 (包括名称中间和 varint 中间) 都应报告为 ValueError
+    for end in range(len(layout.LAYOUT_MAGIC), len(data)):
+        with pytest.raises(ValueError):
+            layout.load_layouts(io.BytesIO(data[:end]))
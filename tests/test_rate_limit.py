@@ -0,0 +1,33 @@
+import time
+
+import rate_limit
+
+
+def _drain(bucket, count):
+    started = time.monotonic()
+    for _ in range(count):
+        bucket.acquire(1)
+    return time.monotonic() - started
+
+
+def test_burst_after_idle_is_capped():
+    bucket = rate_limit.TokenBucket(1000, burst_seconds=0.1, adaptive=False)
+    time.sleep(0.3)
+    # 空闲后立即放行 100 个令牌 (0.1 秒配额)，其余 200 个按 1000/秒 发放
+    elapsed = _drain(bucket, 300)
+    assert 0.18 <= elapsed < 0.35
+
+
+def test_burst_is_immediate():
+    bucket = rate_limit.TokenBucket(1000, burst_seconds=0.1, adaptive=False)
+    time.sleep(0.2)
+    assert _drain(bucket, 90) < 0.05
+
+
+def test_consumed_counts_spent_tokens():
+    bucket = rate_limit.TokenBucket(1000, adaptive=False)
+    for _ in range(5):
+        bucket.acquire(1)
+    bucket.acquire(3)
+    assert bucket.consumed == 8
+    assert bucket.describe()['consumed'] == 8
@@ -0,0 +1,19 @@
+import pytest
+
+import size_parser
+
+
+def test_large_fractional_values_are_exact():
+    assert size_parser.parse_size('123456789.123456789YiB') == 123456789123456789 * 1024 ** 8 // 10 ** 9
+    assert size_parser.parse_size('0.000000000000000000001ZB', decimal_units=True) == 1
+    assert size_parser.parse_size('987654321.987654321ZB', decimal_units=True) == 987654321987654321 * 10 ** 12
+
+
+def test_fraction_rounds_down_to_whole_bytes():
+    assert size_parser.parse_size('1.5KiB') == 1536
+    assert size_parser.parse_size('0.3B') == 0
+
+
+def test_parse_sizes_reports_line_numbers():
+    with pytest.raises(ValueError, match='Line 7'):
+        size_parser.parse_sizes(['1KB', 'oops'], line_numbers=[3, 7])
@@ -0,0 +1,65 @@
+import os
+import struct
+
+import pytest
+
+import snapshot
+
+
+@pytest.fixture
+def snap_path(tmp_path):
+    source = tmp_path / 'source.bin'
+    with open(str(source), 'wb') as f:
+        f.truncate(1 << 20)
+        f.seek(8192)
+        f.write(os.urandom(20000))
+    path = str(tmp_path / 'source.sfgsnap')
+    snapshot.create_snapshot(str(source), path, chunk=4096)
+    return path
+
+
+def _patch(path, offset, data):
+    with open(path, 'r+b') as f:
+        f.seek(offset)
+        f.write(data)
+
+
+def test_round_trip(snap_path, tmp_path):
+    restored = str(tmp_path / 'restored.bin')
+    snapshot.restore_snapshot(snap_path, restored)
+    with open(str(tmp_path / 'source.bin'), 'rb') as a, open(restored, 'rb') as b:
+        assert a.read() == b.read()
+
+
+def test_corrupted_footer_index_start(snap_path):
+    size = os.path.getsize(snap_path)
+    # 结尾的第一个字段是索引起始位置
+    _patch(snap_path, size - snapshot._FOOTER.size, struct.pack('<Q', size * 4))
+    with pytest.raises(ValueError):
+        snapshot.Snapshot(snap_path)
+
+
+def test_corrupted_footer_chunk_count(snap_path):
+    size = os.path.getsize(snap_path)
+    _patch(snap_path, size - snapshot._FOOTER.size + 16, struct.pack('<Q', 1 << 40))
+    with pytest.raises(ValueError):
+        snapshot.Snapshot(snap_path)
+
+
+def test_truncated_snapshot(snap_path):
+    with open(snap_path, 'rb') as f:
+        data = f.read()
+    # 去掉中间的一段但保留结尾
+    with open(snap_path, 'wb') as f:
+        f.write(data[:100] + data[200:])
+    with pytest.raises(ValueError):
+        snapshot.Snapshot(snap_path)
+
+
+def test_chunk_entry_out_of_range(snap_path, tmp_path):
+    with snapshot.Snapshot(snap_path) as snap:
+        entry_start = snap.chunks.start
+    # 第一个索引项的快照内偏移指向文件之外
+    _patch(snap_path, entry_start + 8, struct.pack('<Q', 1 << 40))
+    with pytest.raises(ValueError):
+        snapshot.restore_snapshot(snap_path, str(tmp_path / 'restored.bin'))
@@ -1,6 +1,12 @@
 import os
 import sys
+import csv
+import time
 import json
+import hashlib
+import argparse
+import queue
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
@@ -21,65 +27,36 @@ def get_user_language():
 os.environ['USER_LANGUAGE'] = get_user_language()
 
 from language_manager import lang
-
-
-def create_dummy_large_file(file_path, apparent_size):
-    """
-    创建一个显示为大文件但实际上占用空间很小的文件
-    :param file_path: 文件路径
-    :param apparent_size: 显示的大小（字节）
-    """
-    with open(file_path, 'wb') as f:
-        f.seek(apparent_size - 1)
-        f.write(b'\0')
+import fs_probe
+import size_parser
+from journal import BatchJournal
+import registry
+import sparse_tar
+import disk_image
+import layout
+import sparse_diff
+import grow
+import fragment
+import planner
+import device_pool
+import rate_limit
+import bench_read
+import edit
+import content_verify
+import output
+import densify
+import scan
+import snapshot
+from sparse_create import check_target_filesystem, create_dummy_large_file, open_registry, register_created_file
 
 
 def get_size_in_bytes(size_str):
     """
     将用户输入的大小字符串转换为字节数
-    支持的单位: B, KB, MB, GB, TB, PB, EB, ZB, YB
-    """
-    size_str = size_str.strip().upper()
-    if not size_str:
-        return 0
-
-    # 定义所有支持的单位及其对应的乘数
-    units = {
-        'B': 1,
-        'KB': 1024,
-        'MB': 1024 ** 2,
-        'GB': 1024 ** 3,
-        'TB': 1024 ** 4,
-        'PB': 1024 ** 5,
-        'EB': 1024 ** 6,
-        'ZB': 1024 ** 7,
-        'YB': 1024 ** 8
-    }
-
-    # 尝试匹配单位
-    unit_found = None
-    num = None
-
-    # 从大到小检查单位
-    for unit in sorted(units.keys(), key=lambda x: -len(x)):
-        if size_str.endswith(unit):
-            num_str = size_str[:-len(unit)]
-            try:
-                num = float(num_str)
-                unit_found = unit
-                break
-            except ValueError:
-                continue
-
-    # 如果没有找到匹配的单位，尝试解析整个字符串为数字(默认单位B)
-    if unit_found is None:
-        try:
-            num = float(size_str)
-            unit_found = 'B'
-        except ValueError:
-            return 0
-
-    return int(num * units[unit_found])
+    支持的单位: B, KB, MB, GB, TB, PB, EB, ZB, YB 以及 KiB...YiB，可写成 "1TiB+4KiB" 形式的表达式
+    :raises ValueError: 输入无效时
+    """
+    return size_parser.parse_size(size_str)
 
 
 def generate_file_from_args(size_str, file_name, save_location):
@@ -98,47 +75,1057 @@ def generate_file_from_args(size_str, file_name, save_location):
     file_path = os.path.join(save_location, file_name)
 
     # 转换大小为字节
-    apparent_size = get_size_in_bytes(size_str)
+    try:
+        apparent_size = get_size_in_bytes(size_str)
+    except ValueError:
+        apparent_size = 0
+    console = output.console()
     if apparent_size <= 0:
-        try:
-            print(lang.get('cli_invalid_size'))
-        except UnicodeEncodeError:
-            print("Error: Invalid file size provided.")
+        console.summary('error', 'cli_invalid_size', reason='invalid_size', size=size_str)
         return False
 
     # 检查保存位置是否存在
     if not os.path.exists(save_location):
-        try:
-            print(lang.get('cli_save_location_not_exist', save_location))
-        except UnicodeEncodeError:
-            print(f"Error: Save location does not exist: {save_location}")
+        console.summary('error', 'cli_save_location_not_exist', (save_location,),
+                        reason='save_location_not_exist', path=save_location)
         return False
 
     # 检查文件是否已存在
     if os.path.exists(file_path):
-        try:
-            print(lang.get('file_overwrite_warning', file_path))
-        except UnicodeEncodeError:
-            print(f"Warning: File already exists and will be overwritten: {file_path}")
+        console.record('warning', 'file_overwrite_warning', (file_path,), reason='overwrite', path=file_path)
 
     try:
         # 创建文件
         create_dummy_large_file(file_path, apparent_size)
-        try:
-            print(lang.get('cli_file_created', file_path, size_str))
-        except UnicodeEncodeError:
-            print(f"Success: Virtual large file created successfully!")
-            print(f"File path: {file_path}")
-            print(f"Display size: {size_str}")
+        register_created_file(file_path, apparent_size)
+        console.summary('created', 'cli_file_created', (file_path, size_str), path=file_path, size=apparent_size)
         return True
     except Exception as e:
-        try:
-            print(lang.get('cli_file_creation_failed', e))
-        except UnicodeEncodeError:
-            print(f"Error: Failed to create file - {e}")
+        console.summary('error', 'cli_file_creation_failed', (e,), path=file_path, error=str(e))
         return False
 
 
+def load_manifest(manifest_path, default_location):
+    """
+    读取批量清单文件 (CSV，每行: 大小,文件名[,保存位置])，首行为 size 表头时跳过
+    :param manifest_path: 清单文件路径
+    :param default_location: 行内未给出保存位置时使用的目录
+    :return: [(文件路径, 字节数), ...]
+    :raises ValueError: 清单内容无效时
+    """
+    with open(manifest_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        # 记录每行在文件中的行号 (从 1 开始，引号内换行时取该记录的结束行)，错误信息按行号报告
+        rows = [(reader.line_num, row) for row in reader if row]
+    if rows and rows[0][1][0].strip().lower() == 'size':
+        rows = rows[1:]
+
+    line_numbers = [line for line, _row in rows]
+    sizes = size_parser.parse_sizes([row[0] for _line, row in rows], line_numbers=line_numbers)
+    default_extension = lang.get('default_extension')
+    jobs = []
+    for (line, row), size in zip(rows, sizes):
+        if len(row) < 2 or not row[1].strip() or size <= 0:
+            raise ValueError('Line %d: %s' % (line, ','.join(row)))
+        file_name = row[1].strip()
+        if '.' not in file_name:
+            file_name += default_extension
+        location = row[2].strip() if len(row) > 2 and row[2].strip() else default_location
+        jobs.append((os.path.join(location, file_name), size))
+    return jobs
+
+
+def build_tree_jobs(root_dir, depth, fanout, files_per_dir, apparent_size):
+    """
+    生成目录树任务: 深度为 depth、每层 fanout 个子目录，叶子目录各放 files_per_dir 个文件
+    :return: [(文件路径, 字节数), ...]
+    """
+    directories = [root_dir]
+    for level in range(depth):
+        directories = [os.path.join(parent, 'd%d_%d' % (level, i))
+                       for parent in directories for i in range(fanout)]
+
+    default_extension = lang.get('default_extension')
+    return [(os.path.join(directory, 'f%06d%s' % (i, default_extension)), apparent_size)
+            for directory in directories for i in range(files_per_dir)]
+
+
+def _jobs_fingerprint(jobs):
+    """计算任务列表的指纹，用于判断日志是否属于同一个任务"""
+    digest = hashlib.sha1()
+    for file_path, size in jobs:
+        digest.update(('%s\0%d\n' % (file_path, size)).encode('utf-8', 'surrogateescape'))
+    return digest.hexdigest()
+
+
+def _is_already_created(file_path, apparent_size):
+    """恢复时的廉价校验: 文件存在且显示大小一致"""
+    try:
+        return os.stat(file_path).st_size == apparent_size
+    except OSError:
+        return False
+
+
+def check_batch_space(jobs):
+    """
+    在开始批量创建前按设备估算总分配量 (每个文件结尾一个块)，放不下时直接拒绝，避免中途 ENOSPC
+    :raises OSError: ENOSPC
+    """
+    planner.check_placements([(path, size, planner.tail_extents(size)) for path, size in jobs])
+
+
+def _index_runs(indices):
+    """把升序的索引列表压缩为连续区间 [(起点, 终点), ...]"""
+    runs = []
+    for index in indices:
+        if runs and runs[-1][1] == index:
+            runs[-1][1] = index + 1
+        else:
+            runs.append([index, index + 1])
+    return runs
+
+
+def run_batch_jobs(jobs, journal_path=None, workers=None, resume=True, processes=False):
+    """
+    按目标设备分组批量创建文件，每个设备有独立的有界线程池 (或进程池)，可选写入预写日志以便中断后恢复
+    :param jobs: [(文件路径, 字节数), ...]
+    :param journal_path: 日志文件路径，None 表示不记录日志
+    :param workers: 每个设备的并发数，None 时使用配置或按探测结果自动选择
+    :param resume: 是否根据已有日志跳过已完成的文件
+    :param processes: 每个设备使用独立的进程池
+    :return: (创建数, 跳过数, [(文件路径, 异常), ...], [每个设备的吞吐量统计])
+    """
+    journal = None
+    completed = set()
+    if journal_path:
+        journal = BatchJournal(journal_path, _jobs_fingerprint(jobs), len(jobs))
+        if resume:
+            completed = journal.load_completed()
+        journal.open(resume=bool(completed))
+
+    pending = []
+    skipped = 0
+    for index, (file_path, size) in enumerate(jobs):
+        if index in completed and _is_already_created(file_path, size):
+            skipped += 1
+        else:
+            pending.append(index)
+
+    # 先创建所有目标目录，避免工作线程重复检查
+    for directory in {os.path.dirname(jobs[index][0]) for index in pending}:
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    file_registry = open_registry()
+    failures = []
+    counts = {'created': 0}
+
+    def on_submit(chunk):
+        if journal:
+            for start, end in _index_runs(chunk):
+                journal.record_plan(start, end)
+
+    console = output.console()
+
+    def on_complete(index, error):
+        if error is not None:
+            failures.append((jobs[index][0], error))
+            return
+        counts['created'] += 1
+        console.record('created', path=jobs[index][0], size=jobs[index][1])
+        if journal:
+            journal.record_done(index)
+        if file_registry:
+            file_registry.record(*jobs[index])
+
+    devices = []
+    try:
+        devices = device_pool.run_by_device(jobs, pending, create_dummy_large_file, workers, processes,
+                                            on_submit, on_complete)
+    finally:
+        created = counts['created']
+        if journal:
+            journal.close(complete=not failures and created + skipped == len(jobs))
+        if file_registry:
+            try:
+                file_registry.close()
+            except Exception:
+                pass
+    return created, skipped, failures, devices
+
+
+def _check_processes_rate_limit(processes):
+    """
+    限速器只在当前进程内共享: 进程池中的每个子进程会继承完整配额，且统计不会回到父进程，因此两者不能同时使用
+    :return: 是否可以继续
+    """
+    if processes and rate_limit.active is not None:
+        output.console().summary('error', 'cli_rate_limit_processes', reason='rate_limit_processes')
+        return False
+    return True
+
+
+def _print_batch_result(created, skipped, failures, devices=()):
+    """输出批量任务的失败明细、每个设备的吞吐量和汇总"""
+    console = output.console()
+    for file_path, error in failures:
+        console.record('error', 'cli_file_creation_failed', ('%s: %s' % (file_path, error),),
+                       path=file_path, error=str(error))
+    for device in devices:
+        console.record('device', 'cli_device_throughput', (device['directory'], device['files'], device['workers'],
+                                                           device['seconds'], device['files_per_second']),
+                       **device)
+    console.summary('batch', 'cli_batch_summary', (created, skipped, len(failures)),
+                    created=created, skipped=skipped, failed=len(failures))
+
+
+def cmd_batch(argv):
+    """
+    命令行子命令: 按清单文件批量创建稀疏文件
+    :param argv: 子命令参数
+    :return: 退出码
+    """
+    parser = argparse.ArgumentParser(prog='稀疏文件.py batch')
+    parser.add_argument('manifest')
+    parser.add_argument('--dir', default='.')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--journal', default=None)
+    parser.add_argument('--restart', action='store_true')
+    parser.add_argument('--processes', action='store_true')
+    args = parser.parse_args(argv)
+
+    console = output.console()
+    if not _check_processes_rate_limit(args.processes):
+        return 1
+    try:
+        jobs = load_manifest(args.manifest, args.dir)
+    except (OSError, ValueError) as e:
+        console.summary('error', 'cli_manifest_invalid', (e,), reason='manifest_invalid', error=str(e))
+        return 1
+
+    try:
+        check_batch_space(jobs)
+    except OSError as e:
+        console.summary('error', 'cli_plan_no_space', (e,), reason='no_space', error=str(e))
+        return 1
+
+    journal_path = args.journal or args.manifest + '.journal'
+    created, skipped, failures, devices = run_batch_jobs(jobs, journal_path, args.workers,
+                                                         resume=not args.restart, processes=args.processes)
+    _print_batch_result(created, skipped, failures, devices)
+    return 0 if not failures else 1
+
+
+def cmd_tree(argv):
+    """
+    命令行子命令: 生成目录树形式的稀疏文件集
+    :param argv: 子命令参数
+    :return: 退出码
+    """
+    parser = argparse.ArgumentParser(prog='稀疏文件.py tree')
+    parser.add_argument('root')
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--fanout', type=int, default=4)
+    parser.add_argument('--files', type=int, default=10)
+    parser.add_argument('--size', default='1GB')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--journal', default=None)
+    parser.add_argument('--restart', action='store_true')
+    parser.add_argument('--processes', action='store_true')
+    args = parser.parse_args(argv)
+
+    try:
+        apparent_size = get_size_in_bytes(args.size)
+    except ValueError:
+        apparent_size = 0
+    console = output.console()
+    if apparent_size <= 0:
+        console.summary('error', 'cli_invalid_size', reason='invalid_size', size=args.size)
+        return 1
+    if not _check_processes_rate_limit(args.processes):
+        return 1
+
+    jobs = build_tree_jobs(args.root, args.depth, args.fanout, args.files, apparent_size)
+    try:
+        check_batch_space(jobs)
+    except OSError as e:
+        console.summary('error', 'cli_plan_no_space', (e,), reason='no_space', error=str(e))
+        return 1
+    journal_path = args.journal or args.root.rstrip('/\\') + '.journal'
+    created, skipped, failures, devices = run_batch_jobs(jobs, journal_path, args.workers,
+                                                         resume=not args.restart, processes=args.processes)
+    _print_batch_result(created, skipped, failures, devices)
+    return 0 if not failures else 1
+
+
+def cmd_list(argv):
+    """
+    命令行子命令: 列出索引中登记的文件
+    :param argv: 子命令参数
+    :return: 退出码
+    """
+    parser = argparse.ArgumentParser(prog='稀疏文件.py list')
+    parser.add_argument('prefix', nargs='?', default=None)
+    args = parser.parse_args(argv)
+
+    console = output.console()
+    count = 0
+    with registry.FileRegistry() as file_registry:
+        for path, size, file_layout, created in file_registry.iter_files(args.prefix):
+            console.text('file', '%s\t%d\t%s\t%s' % (path, size, file_layout,
+                                                     time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(created))),
+                         path=path, size=size, layout=file_layout, created=created)
+            count += 1
+    console.summary('list', files=count)
+    return 0
+
+
+def cmd_verify(argv):
+    """
+    命令行子命令: 按索引校验文件是否仍然存在且大小一致；
+    给出 --seed 或 --layout 时改为按种子重新生成图案，并行校验文件内容和空洞，无需保存的校验和
+    :param argv: 子命令参数
+    :return: 退出码
+    """
+    parser = argparse.ArgumentParser(prog='稀疏文件.py verify')
+    parser.add_argument('paths', nargs='*')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--layout', default=None)
+    parser.add_argument('--all', action='store_true')
+    parser.add_argument('--chunk', default='8MiB')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.seed is not None or args.layout is not None:
+        return verify_content(args)
+    if len(args.paths) > 1:
+        parser.error('only one prefix may be given without --seed/--layout')
+
+    with registry.FileRegistry() as file_registry:
+        ok, missing, mismatched, errors = file_registry.verify(args.paths[0] if args.paths else None)
+    console = output.console()
+    for path in missing:
+        console.record('missing', 'cli_registry_missing', (path,), path=path)
+    for path, expected, actual in mismatched:
+        console.record('size_mismatch', 'cli_registry_size_mismatch', (path, expected, actual),
+                       path=path, expected=expected, actual=actual)
+    for path, error in errors:
+        console.record('error', 'cli_registry_unreadable', (path, error), path=path, error=str(error))
+    console.summary('verify', 'cli_verify_summary', (ok, len(missing), len(mismatched), len(errors)),
+                    ok=ok, missing=len(missing), mismatched=len(mismatched), errors=len(errors))
+    return 0 if not missing and not mismatched and not errors else 1
+
+
+def verify_content(args):
+    """
+    按种子校验内容: 有 --layout 时校验布局包中的文件 (位于 paths[0] 目录下，默认当前目录)，
+    包括大小和空洞；否则以文件当前的数据区间为准，只校验数据内容
+    有差异的文件以 JSON 行输出，摘要输出到标准错误
+    :return: 退出码
+    """
+    try:
+        chunk = get_size_in_bytes(args.chunk)
+        if chunk <= 0:
+            raise ValueError('--chunk must be positive')
+        if args.layout is not None:
+            with open(args.layout, 'rb') as f:
+                layouts = layout.load_layouts(f)
+            root = args.paths[0] if args.paths else '.'
+            items = [(os.path.join(root, entry.name), entry) for entry in layouts]
+        else:
+            if not args.paths:
+                raise ValueError('No files given')
+            items = content_verify.layouts_for(args.paths)
+        results, stopped = content_verify.verify_files(items, args.seed or 0, chunk, args.workers,
+                                                       check_holes=args.layout is not None,
+                                                       first_only=not args.all)
+    except (OSError, ValueError) as e:
+        output.console().summary('error', 'cli_content_verify_failed', (e,), reason='verify_failed', error=str(e))
+        return 1
+
+    console = output.console()
+    failed = [result for result in results if not result['ok']]
+    skipped = sum(1 for result in results if result['skipped'])
+    checked = sum(result['checked_bytes'] for result in results)
+    for result in failed:
+        console.text('mismatch', json.dumps(result, ensure_ascii=False), **result)
+    if console.mode == output.MODE_JSONL:
+        console.summary('verify', ok=len(results) - len(failed) - skipped, failed=len(failed), skipped=skipped,
+                        checked_bytes=checked, stopped=stopped)
+        return 0 if not failed else 1
+    print(lang.get('cli_content_verify_summary', len(results) - len(failed) - skipped, len(failed), skipped,
+                   checked), file=sys.stderr)
+    if stopped:
+        print(lang.get('cli_content_verify_stopped'), file=sys.stderr)
+    return 0 if not failed else 1
+
+
+def cmd_purge(argv):
+    """
+    命令行子命令: 按索引并行删除生成的文件
+    :param argv: 子命令参数
+    :return: 退出码
+    """
+    parser = argparse.ArgumentParser(prog='稀疏文件.py purge')
+    parser.add_argument('prefix', nargs='?', default=None)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args(argv)
+
+    with registry.FileRegistry() as file_registry:
+        removed, failures = file_registry.purge(args.prefix, args.workers, args.dry_run)
+    console = output.console()
+    for path, error in failures:
+        console.record('error', 'cli_file_creation_failed', ('%s: %s' % (path, error),), path=path, error=str(error))
+    if args.dry_run:
+        console.summary('purge', 'cli_purge_dry_run', (removed,), removed=removed, failed=0, dry_run=True)
+    else:
+        console.summary('purge', 'cli_purge_summary', (removed, len(failures)), removed=removed,
+                        failed=len(failures), dry_run=False)
+    return 0 if not failures else 1
+
+
+def cmd_export(argv):
+    """
+    命令行子命令: 把文件/目录导出为保留空洞的 GNU 稀疏 tar 归档
+    :param argv: 子命令参数
+    :return: 退出码
+    """
+    parser = argparse.ArgumentParser(prog='稀疏文件.py export')
+    parser.add_argument('sources', nargs='+')
+    parser.add_argument('-o', '--output', default='-')
+    parser.add_argument('--gzip', action='store_true')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.output == '-':
+            files, apparent, data = sparse_tar.export_archive(args.sources, sys.stdout.buffer, args.gzip, args.workers)
+        else:
+            with open(args.output, 'wb') as out:
+                files, apparent, data = sparse_tar.export_archive(args.sources, out, args.gzip, args.workers)
+    except (OSError, sparse_tar.tarfile.TarError) as e:
+        print(lang.get('cli_archive_failed', e), file=sys.stderr)
+        return 1
+    print(lang.get('cli_export_summary', files, apparent, data), file=sys.stderr)
+    return 0
+
+
+def cmd_import(argv):
+    """
+    命令行子命令: 从稀疏 tar 归档还原文件，通过截断重建空洞
+    :param argv: 子命令参数
+    :return: 退出码
+    """
+    parser = argparse.ArgumentParser(prog='稀疏文件.py import')
+    parser.add_argument('archive', nargs='?', default='-')
+    parser.add_argument('-C', '--dir', default='.')
+    args = parser.parse_args(argv)
+
+    # 还原的文件逐个登记到索引 (按批提交)，中途失败时已还原的文件同样保留记录
+    file_registry = open_registry()
+    on_file = (lambda path, size: file_registry.record(path, size, 'archive')) if file_registry else None
+    try:
+        if args.archive == '-':
+            files = sparse_tar.import_archive(sys.stdin.buffer, args.dir, on_file)
+        else:
+            with open(args.archive, 'rb') as stream:
+                files = sparse_tar.import_archive(stream, args.dir, on_file)
+    except (OSError, sparse_tar.tarfile.TarError) as e:
+        print(lang.get('cli_archive_failed', e))
+        return 1
+    finally:
+        if file_registry:
+            try:
+                file_registry.close()
+            except Exception:
+                pass
+    print(lang.get('cli_import_summary', files))
+    return 0
+
+
+def cmd_image(argv):
+    """
+    命令行子命令: 创建带 GPT 分区表的稀疏原始磁盘镜像
+    :param argv: 子命令参数
+    :return: 退出码
+    """
+    parser = argparse.ArgumentParser(prog='稀疏文件.py image')
+    parser.add_argument('output')
+    parser.add_argument('--spec', default=None)
+    parser.add_argument('--size', default=None)
+    parser.add_argument('--sector-size', type=int, default=None)
+    parser.add_argument('--partition', action='append', default=[])
+    args = parser.parse_args(argv)
+
+    try:
+        spec = disk_image.load_spec(args.spec) if args.spec else {}
+        if args.size:
+            spec['size'] = args.size
+        if args.sector_size:
+            spec['sector_size'] = args.sector_size
+        if args.partition:
+            spec['partitions'] = [disk_image.parse_partition_arg(p) for p in args.partition]
+        if 'size' not in spec:
+            raise ValueError('size')
+        layout = disk_image.plan_layout(spec)
+        check_target_filesystem(os.path.dirname(os.path.abspath(args.output)), layout['image_size'])
+        disk_image.write_image(args.output, layout)
+    except (OSError, ValueError, KeyError) as e:
+        print(lang.get('cli_image_failed', e))
+        return 1
+
+    register_created_file(args.output, layout['image_size'], 'gpt')
+    print(lang.get('cli_image_created', args.output, layout['image_size'], len(layout['partitions'])))
+    print(json.dumps(disk_image.describe_layout(layout), ensure_ascii=False, indent=2))
+    return 0
+
+
+def cmd_replay(argv):
+    """
+    命令行子命令: 捕获/重放文件的空洞与数据区间布局
+      replay capture 源... -o 布局文件
+      replay apply 布局文件 -C 目标目录 [-C 目标目录...]
+      replay clone 源... -C 目标目录 [-C 目标目录...]
+    写入前先估算各文件的实际分配量，按剩余空间把文件分配到各目标目录所在的设备
+    :param argv: 子命令参数
+    :return: 退出码
+    """
+    parser = argparse.ArgumentParser(prog='稀疏文件.py replay')
+    parser.add_argument('action', choices=['capture', 'apply', 'clone'])
+    parser.add_argument('sources', nargs='+')
+    parser.add_argument('-o', '--output', default=None)
+    parser.add_argument('-C', '--dir', action='append', default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--reserve', default='0')
+    parser.add_argument('--trim', action='store_true')
+    parser.add_argument('--plan', action='store_true')
+    args = parser.parse_args(argv)
+    targets = args.dir or ['.']
+
+    try:
+        if args.action == 'apply':
+            layouts = []
+            for source in args.sources:
+                with open(source, 'rb') as f:
+                    layouts.extend(layout.load_layouts(f))
+        else:
+            layouts = layout.capture(args.sources)
+
+        if args.action == 'capture':
+            if args.output:
+                with open(args.output, 'wb') as out:
+                    layout.dump_layouts(layouts, out)
+            else:
+                layout.dump_layouts(layouts, sys.stdout.buffer)
+            print(lang.get('cli_layout_captured', len(layouts), sum(len(e.extents) for e in layouts)),
+                  file=sys.stderr)
+            return 0
+
+        plan = planner.schedule([(entry.name, entry.size, entry.extents) for entry in layouts],
+                                targets, get_size_in_bytes(args.reserve), args.trim)
+        if args.plan:
+            print(json.dumps({key: plan[key] for key in ('volumes', 'total_allocation', 'skipped')},
+                             ensure_ascii=False, indent=2))
+            return 0
+        planned = [(entry, target) for entry, target in zip(layouts, plan['assignments']) if target]
+        for entry, target in planned:
+            check_target_filesystem(planner.existing_ancestor(target), entry.size)
+        done, failures = layout.replay([entry for entry, _target in planned], targets[0], args.seed,
+                                       args.workers, [target for _entry, target in planned])
+    except (OSError, ValueError) as e:
+        print(lang.get('cli_layout_failed', e))
+        return 1
+
+    for name in plan['skipped']:
+        print(lang.get('cli_plan_trimmed', name), file=sys.stderr)
+
+    file_registry = open_registry()
+    if file_registry:
+        with file_registry:
+            for target, entry, _written in done:
+                file_registry.record(target, entry.size, 'replay')
+    for path, error in failures:
+        print(lang.get('cli_file_creation_failed', '%s: %s' % (path, error)))
+    print(lang.get('cli_layout_replayed', len(done), sum(written for _t, _e, written in done), len(failures)))
+    return 0 if not failures else 1
+
+
+def cmd_diff(argv):
+    """
+    命令行子命令: 感知空洞地比较两个文件，以 JSON 输出差异范围
+    :param argv: 子命令参数
+    :return: 退出码 (0 相同，1 不同，2 出错)
+    """
+    parser = argparse.ArgumentParser(prog='稀疏文件.py diff')
+    parser.add_argument('a')
+    parser.add_argument('b')
+    parser.add_argument('--chunk', default='8MiB')
+    parser.add_argument('--block', type=int, default=sparse_diff.DEFAULT_BLOCK)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    try:
+        result = sparse_diff.diff_files(args.a, args.b, get_size_in_bytes(args.chunk), args.block, args.workers)
+    except (OSError, ValueError) as e:
+        print(lang.get('cli_diff_failed', e), file=sys.stderr)
+        return 2
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0 if result['identical'] else 1
+
+
+def cmd_grow(argv):
+    """
+    命令行子命令: 让文件按目标速率随时间增长 (用于测试日志采集和磁盘监控)
+    :param argv: 子命令参数
+    :return: 退出码
+    """
+    parser = argparse.ArgumentParser(prog='稀疏文件.py grow')
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--rate', default='1MiB')
+    parser.add_argument('--mode', choices=[grow.MODE_TRUNCATE, grow.MODE_APPEND], default=grow.MODE_TRUNCATE)
+    parser.add_argument('--duration', type=float, default=None)
+    parser.add_argument('--max-size', default=None)
+    parser.add_argument('--interval', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    try:
+        rate = get_size_in_bytes(args.rate)
+        limit = get_size_in_bytes(args.max_size) if args.max_size else None
+        if limit is not None:
+            for path in args.files:
+                check_target_filesystem(os.path.dirname(os.path.abspath(path)), limit)
+        reports = grow.run_growth(args.files, rate, args.mode, args.duration, limit, args.interval, args.seed)
+    except (OSError, ValueError) as e:
+        print(lang.get('cli_file_creation_failed', e))
+        return 1
+
+    # 以结束时的大小登记 (已登记的文件更新大小和布局)
+    file_registry = open_registry()
+    if file_registry:
+        with file_registry:
+            for report in reports:
+                file_registry.record(report['path'], report['size'], 'grow')
+    for report in reports:
+        print(json.dumps(report, ensure_ascii=False))
+    average = sum(report['achieved_rate'] for report in reports) / len(reports)
+    print(lang.get('cli_grow_summary', len(reports), rate, '%.0f' % average), file=sys.stderr)
+    return 0
+
+
+def cmd_fragment(argv):
+    """
+    命令行子命令: 轮流为多个文件分配小分块，生成物理上高度碎片化的文件
+    (用于测试碎片整理、备份工具和读取性能)
+    :param argv: 子命令参数
+    :return: 退出码
+    """
+    parser = argparse.ArgumentParser(prog='稀疏文件.py fragment')
+    parser.add_argument('dir')
+    parser.add_argument('--files', type=int, default=4)
+    parser.add_argument('--size', default='64MiB')
+    parser.add_argument('--chunk', default='64KiB')
+    parser.add_argument('--interleave', type=int, default=None)
+    parser.add_argument('--no-fill', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    try:
+        size = get_size_in_bytes(args.size)
+        chunk = get_size_in_bytes(args.chunk)
+        if args.files <= 0:
+            raise ValueError('--files must be positive')
+        os.makedirs(args.dir, exist_ok=True)
+        caps = check_target_filesystem(args.dir, size)
+        block_size = caps.get('block_size')
+        if block_size and chunk % block_size:
+            raise ValueError('--chunk must be a multiple of the block size (%d)' % block_size)
+        paths = [os.path.join(args.dir, 'frag%06d.bin' % i) for i in range(args.files)]
+        start = time.time()
+        reports = fragment.make_fragmented(paths, size, chunk, args.interleave, not args.no_fill,
+                                           args.seed, args.workers)
+        elapsed = time.time() - start
+    except (OSError, ValueError) as e:
+        print(lang.get('cli_file_creation_failed', e))
+        return 1
+
+    file_registry = open_registry()
+    if file_registry:
+        with file_registry:
+            for report in reports:
+                file_registry.record(report['path'], report['size'], 'fragment')
+    for report in reports:
+        print(json.dumps(report, ensure_ascii=False))
+    print(lang.get('cli_fragment_summary', len(reports), sum(report['extents'] for report in reports),
+                   '%.2f' % elapsed), file=sys.stderr)
+    return 0
+
+
+def cmd_bench_read(argv):
+    """
+    命令行子命令: 用不同的读取模式和方式读取文件，分别统计空洞与数据区域的吞吐量和延迟分位数
+    :param argv: 子命令参数
+    :return: 退出码
+    """
+    parser = argparse.ArgumentParser(prog='稀疏文件.py bench-read')
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--pattern', action='append', choices=bench_read.PATTERNS, default=None)
+    parser.add_argument('--method', action='append', choices=bench_read.METHODS, default=None)
+    parser.add_argument('--block', default='128KiB')
+    parser.add_argument('--count', type=int, default=None)
+    parser.add_argument('--stride', default=None)
+    parser.add_argument('--cache', choices=bench_read.CACHE_MODES, default='drop')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = []
+    try:
+        block = get_size_in_bytes(args.block)
+        stride = get_size_in_bytes(args.stride) if args.stride else None
+        if block <= 0:
+            raise ValueError('--block must be positive')
+        for path in args.files:
+            for pattern in args.pattern or bench_read.PATTERNS:
+                for method in args.method or bench_read.METHODS:
+                    results.append(bench_read.bench_file(path, pattern, method, block, args.count, stride,
+                                                         args.seed, args.cache))
+    except (OSError, ValueError) as e:
+        print(lang.get('cli_bench_failed', e))
+        return 1
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    return 0
+
+
+def cmd_edit(argv):
+    """
+    命令行子命令: 对已有文件就地执行打洞、置零、折叠和插入区间操作
+    偏移均为编辑前的原文件坐标，重叠和相邻的操作会合并为尽量少的 fallocate 调用
+    :param argv: 子命令参数
+    :return: 退出码
+    """
+    parser = argparse.ArgumentParser(prog='稀疏文件.py edit')
+    parser.add_argument('file')
+    parser.add_argument('--op', action='append', default=[], help='punch|zero|collapse|insert:OFFSET:LENGTH')
+    parser.add_argument('--ops-file', default=None)
+    args = parser.parse_args(argv)
+
+    try:
+        ops = [edit.parse_op(text) for text in args.op]
+        if args.ops_file:
+            ops += edit.load_ops(args.ops_file)
+        if not ops:
+            raise ValueError('No edit operations given')
+        try:
+            caps = fs_probe.get_capabilities(os.path.dirname(os.path.abspath(args.file)))
+        except OSError:
+            caps = {}
+        old_size, new_size, calls = edit.apply_edits(args.file, ops, caps)
+    except (OSError, ValueError) as e:
+        print(lang.get('cli_edit_failed', e))
+        return 1
+
+    # 内容已不再与生成时的布局一致
+    file_registry = open_registry()
+    if file_registry:
+        with file_registry:
+            file_registry.update_size(args.file, new_size, 'edited')
+    print(lang.get('cli_edit_summary', len(ops), calls, old_size, new_size))
+    return 0
+
+
+def cmd_densify(argv):
+    """
+    命令行子命令: 把稀疏文件转换为完全分配的同样大小的文件
+    空洞切分为分块在线程池中并行用 fallocate 分配 (--mode pattern 改为写入图案数据)
+    :param argv: 子命令参数
+    :return: 退出码
+    """
+    parser = argparse.ArgumentParser(prog='稀疏文件.py densify')
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--mode', choices=densify.MODES, default=densify.MODE_ALLOCATE)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk', default='64MiB')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    progress_interval = 0.5
+    last = {'printed': 0.0}
+    show_progress = sys.stderr.isatty()
+
+    def on_progress(done, total, seconds):
+        now = time.monotonic()
+        if not show_progress or (now - last['printed'] < progress_interval and done < total):
+            return
+        last['printed'] = now
+        rate = done / seconds if seconds > 0 else 0
+        print('\r' + lang.get('cli_densify_progress', done, total, '%.0f' % rate), end='', file=sys.stderr)
+
+    try:
+        chunk = get_size_in_bytes(args.chunk)
+        planner.check_placements([(path,) + densify.file_holes(path) for path in args.files])
+        start = time.monotonic()
+        reports = densify.Densifier(args.mode, args.seed, chunk, args.workers).run(args.files, on_progress)
+        elapsed = time.monotonic() - start
+    except (OSError, ValueError) as e:
+        if show_progress:
+            print(file=sys.stderr)
+        print(lang.get('cli_densify_failed', e))
+        return 1
+    if show_progress:
+        print(file=sys.stderr)
+
+    file_registry = open_registry()
+    if file_registry:
+        with file_registry:
+            for report in reports:
+                file_registry.update_size(report['path'], report['size'], 'dense')
+    for report in reports:
+        print(json.dumps(report, ensure_ascii=False))
+    total = sum(report['hole_bytes'] for report in reports)
+    print(lang.get('cli_densify_summary', len(reports), total, '%.2f' % elapsed,
+                   '%.0f' % (total / elapsed if elapsed > 0 else 0)), file=sys.stderr)
+    return 0
+
+
+def cmd_scan(argv):
+    """
+    命令行子命令: 并行扫描已有目录树，找出稀疏文件 (st_blocks*512 远小于 st_size)
+    结果以 JSON 行流式输出，摘要输出到标准错误
+    :param argv: 子命令参数
+    :return: 退出码
+    """
+    parser = argparse.ArgumentParser(prog='稀疏文件.py scan')
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--ratio', type=float, default=scan.DEFAULT_RATIO)
+    parser.add_argument('--min-size', default='1MiB')
+    parser.add_argument('--extents', action='store_true')
+    parser.add_argument('--all', action='store_true')
+    parser.add_argument('-x', '--one-file-system', action='store_true')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    def on_record(record):
+        print(json.dumps(record, ensure_ascii=False))
+
+    try:
+        scanner = scan.Scanner(args.ratio, get_size_in_bytes(args.min_size), args.extents, args.all,
+                               args.one_file_system, args.workers)
+        totals = scanner.run(args.paths, on_record)
+    except (OSError, ValueError) as e:
+        print(lang.get('cli_scan_failed', e), file=sys.stderr)
+        return 1
+    print(lang.get('cli_scan_summary', totals['directories'], totals['files'], totals['sparse'], totals['size'],
+                   totals['allocated'], totals['errors']), file=sys.stderr)
+    return 0
+
+
+def parse_range(text):
+    """解析 OFFSET:LENGTH 形式的范围，偏移和长度可带单位 (如 1TiB:1GiB)"""
+    parts = text.split(':')
+    if len(parts) != 2:
+        raise ValueError('Invalid range: %s' % text)
+    offset = get_size_in_bytes(parts[0]) if parts[0] not in ('0', '') else 0
+    length = get_size_in_bytes(parts[1])
+    if offset < 0 or length <= 0:
+        raise ValueError('Invalid range: %s' % text)
+    return offset, length
+
+
+def cmd_snapshot(argv):
+    """
+    命令行子命令: 可随机访问的压缩快照
+      snapshot create 文件 [-o 快照] [--codec zlib|lzma] [--level N] [--chunk 4MiB]
+      snapshot restore 快照 -o 文件 [--range 偏移:长度 ...]
+      snapshot info 快照
+    :param argv: 子命令参数
+    :return: 退出码
+    """
+    parser = argparse.ArgumentParser(prog='稀疏文件.py snapshot')
+    parser.add_argument('action', choices=['create', 'restore', 'info'])
+    parser.add_argument('source')
+    parser.add_argument('-o', '--output', default=None)
+    parser.add_argument('--codec', choices=sorted(snapshot.CODECS), default=snapshot.CODEC_ZLIB)
+    parser.add_argument('--level', type=int, default=None)
+    parser.add_argument('--chunk', default='4MiB')
+    parser.add_argument('--range', action='append', default=None)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.action == 'info':
+            with snapshot.Snapshot(args.source) as snap:
+                print(json.dumps(snap.describe(), ensure_ascii=False, indent=2))
+            return 0
+        if args.action == 'create':
+            report = snapshot.create_snapshot(args.source, args.output or args.source + '.sfgsnap', args.codec,
+                                              args.level, get_size_in_bytes(args.chunk), args.workers)
+            print(lang.get('cli_snapshot_created', report['path'], report['extents'], report['chunks'],
+                           report['data_bytes'], report['compressed_bytes']))
+            return 0
+        if not args.output:
+            raise ValueError('restore requires -o')
+        ranges = [parse_range(text) for text in args.range] if args.range else None
+        with snapshot.Snapshot(args.source) as snap:
+            check_target_filesystem(os.path.dirname(os.path.abspath(args.output)), snap.size)
+        report = snapshot.restore_snapshot(args.source, args.output, ranges, args.workers)
+    except (OSError, ValueError) as e:
+        print(lang.get('cli_snapshot_failed', e))
+        return 1
+
+    register_created_file(args.output, report['size'], 'snapshot')
+    print(lang.get('cli_snapshot_restored', report['path'], report['size'], report['chunks'], report['written_bytes']))
+    return 0
+
+
+def cmd_probe(argv):
+    """
+    命令行子命令: 探测并显示目标目录所在文件系统的能力
+    :param argv: 子命令参数
+    :return: 退出码
+    """
+    parser = argparse.ArgumentParser(prog='稀疏文件.py probe')
+    parser.add_argument('path', nargs='?', default='.')
+    parser.add_argument('--refresh', action='store_true')
+    args = parser.parse_args(argv)
+
+    console = output.console()
+    try:
+        caps = fs_probe.get_capabilities(args.path, refresh=args.refresh)
+    except OSError as e:
+        console.summary('error', 'cli_probe_failed', (e,), reason='probe_failed', error=str(e))
+        return 1
+    console.text('probe', json.dumps(caps, ensure_ascii=False, indent=2), summary=True, path=args.path,
+                 capabilities=caps)
+    return 0
+
+
+def apply_global_options(argv):
+    """
+    解析并应用与子命令无关的全局选项 (可出现在任意位置)
+      --ops-rate N              每秒元数据操作 (创建/删除文件) 上限
+      --bytes-rate SIZE         每秒数据写入字节上限
+      --no-adaptive             关闭按操作延迟自动降速
+      --profile FILE            用 cProfile 运行，写出 pstats 文件和 FILE.txt 摘要
+      --trace-malloc FILE       用 tracemalloc 运行，写出最大分配报告
+      --collapsed-stacks FILE   采样调用栈，写出用于火焰图的折叠栈
+      --output-mode MODE        输出模式: human (默认，翻译后的文本)、jsonl (每条记录一个 JSON 对象)、summary (只输出汇总)；
+                                只用于 "大小 文件名 路径" 形式和 OUTPUT_MODE_COMMANDS 中的子命令
+      --decimal-units           K/KB/MB... 按 1000 进制解析 (KiB/MiB... 仍为 1024 进制)
+    :return: (全局选项, 剩余参数)
+    :raises ValueError: 速率无效时
+    """
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    parser.add_argument('--ops-rate', type=float, default=None)
+    parser.add_argument('--bytes-rate', default=None)
+    parser.add_argument('--no-adaptive', action='store_true')
+    parser.add_argument('--profile', default=None)
+    parser.add_argument('--trace-malloc', default=None)
+    parser.add_argument('--collapsed-stacks', default=None)
+    parser.add_argument('--output-mode', choices=output.MODES, default=output.MODE_HUMAN)
+    parser.add_argument('--decimal-units', action='store_true')
+    options, rest = parser.parse_known_args(argv)
+    # 先设置输出模式，之后的选项错误也按该模式输出
+    output.configure(options.output_mode)
+    size_parser.configure(options.decimal_units)
+    try:
+        bytes_rate = get_size_in_bytes(options.bytes_rate) if options.bytes_rate else None
+    except ValueError:
+        raise ValueError('--bytes-rate: %s' % options.bytes_rate)
+    if options.ops_rate is not None and options.ops_rate <= 0:
+        raise ValueError('--ops-rate must be positive')
+    if bytes_rate is not None and bytes_rate <= 0:
+        raise ValueError('--bytes-rate must be positive')
+    rate_limit.configure(options.ops_rate, bytes_rate, not options.no_adaptive)
+    return options, rest
+
+
+def print_rate_limit_report():
+    """限速生效时，在标准错误输出各令牌桶的等待时间与降速次数 (格式与当前输出模式一致)"""
+    limiter = rate_limit.active
+    if limiter is None:
+        return
+    report_output = output.Output(output.console().mode, sys.stderr)
+    for name, key, bucket in (('metadata', 'cli_rate_limit_ops', limiter.ops),
+                              ('data', 'cli_rate_limit_bytes', limiter.data)):
+        if bucket is not None:
+            report = bucket.describe()
+            report_output.summary('rate_limit', key, ('%.0f' % report['rate'], report['consumed'],
+                                                      report['throttled_seconds'], report['backoffs'],
+                                                      '%.0f' % report['current_rate']),
+                                  bucket=name, **report)
+    report_output.flush()
+
+
+def run_cli(argv):
+    """
+    执行命令行模式 (子命令或 "大小 文件名 路径" 形式)
+    :return: 退出码
+    """
+    try:
+        if argv[0] in CLI_COMMANDS:
+            # 子命令模式
+            console = output.console()
+            if console.mode != output.MODE_HUMAN and argv[0] not in OUTPUT_MODE_COMMANDS:
+                console.summary('error', 'cli_output_mode_unsupported', (argv[0], console.mode),
+                                reason='output_mode_unsupported', command=argv[0], mode=console.mode)
+                return 1
+            exit_code = CLI_COMMANDS[argv[0]](argv[1:])
+        else:
+            # 命令行模式
+            if len(argv) != 3:
+                console = output.console()
+                console.summary('error', 'cli_usage_error', reason='usage')
+                if console.mode != output.MODE_JSONL:
+                    console.summary('usage', 'cli_usage_example')
+                return 1
+            exit_code = 0 if generate_file_from_args(argv[0], argv[1], argv[2]) else 1
+    finally:
+        # 写出缓冲的输出
+        output.console().flush()
+    print_rate_limit_report()
+    return exit_code
+
+
+# 支持 --output-mode jsonl/summary 的子命令 ("大小 文件名 路径" 形式也支持)；
+# 其余子命令自行输出文本或 JSON 文档，只能使用默认的 human 模式
+OUTPUT_MODE_COMMANDS = frozenset(['probe', 'batch', 'tree', 'list', 'verify', 'purge'])
+
+# 命令行子命令表: 第一个参数匹配时分派到对应函数
+CLI_COMMANDS = {
+    'probe': cmd_probe,
+    'batch': cmd_batch,
+    'tree': cmd_tree,
+    'list': cmd_list,
+    'verify': cmd_verify,
+    'purge': cmd_purge,
+    'export': cmd_export,
+    'import': cmd_import,
+    'image': cmd_image,
+    'replay': cmd_replay,
+    'diff': cmd_diff,
+    'grow': cmd_grow,
+    'fragment': cmd_fragment,
+    'bench-read': cmd_bench_read,
+    'edit': cmd_edit,
+    'densify': cmd_densify,
+    'scan': cmd_scan,
+    'snapshot': cmd_snapshot,
+}
+
+
+# 任务队列界面的刷新间隔 (毫秒) 与列标题对应的翻译键
+QUEUE_POLL_MS = 200
+QUEUE_COLUMNS = {
+    'name': 'job_name',
+    'size': 'size',
+    'location': 'location',
+    'status': 'job_status',
+}
+
+
 def generate_file_gui():
     """
     图形界面方式生成文件 - 支持多语言的现代化界面
@@ -209,14 +1196,27 @@ def generate_file_gui():
         browse_button.config(text=lang.get('browse'))
         generate_button.config(text=lang.get('generate'))
         
+        # 更新任务队列
+        queue_frame.config(text=lang.get('job_queue'))
+        add_queue_button.config(text=lang.get('add_to_queue'))
+        load_manifest_button.config(text=lang.get('load_manifest'))
+        start_queue_button.config(text=lang.get('start_queue'))
+        clear_queue_button.config(text=lang.get('clear_queue'))
+        workers_label.config(text=lang.get('workers'))
+        for column in ('name', 'size', 'location', 'status'):
+            job_tree.heading(column, text=lang.get(QUEUE_COLUMNS[column]))
+
         # 更新说明文本
         note_label.config(text=lang.get('supported_units'))
         
         # 更新状态栏
         status_var.set(lang.get('ready'))
 
-    def on_generate():
-        """生成按钮点击事件处理"""
+    def validate_inputs():
+        """
+        校验输入框内容
+        :return: (文件路径, 字节数, 大小字符串)，无效时显示错误并返回 None
+        """
         size_str = size_entry.get()
         file_name = file_name_entry.get()
         save_location = save_location_entry.get()
@@ -224,15 +1224,15 @@ def generate_file_gui():
         # 验证输入
         if not size_str:
             messagebox.showerror(lang.get('error'), lang.get('empty_file_size'))
-            return
+            return None
 
         if not file_name:
             messagebox.showerror(lang.get('error'), lang.get('empty_file_name'))
-            return
+            return None
 
         if not save_location:
             messagebox.showerror(lang.get('error'), lang.get('empty_save_location'))
-            return
+            return None
 
         # 处理文件名和扩展名
         if '.' not in file_name:
@@ -242,15 +1242,27 @@ def generate_file_gui():
         file_path = os.path.join(save_location, file_name)
 
         # 转换大小为字节
-        apparent_size = get_size_in_bytes(size_str)
+        try:
+            apparent_size = get_size_in_bytes(size_str)
+        except ValueError:
+            apparent_size = 0
         if apparent_size <= 0:
             messagebox.showerror(lang.get('error'), lang.get('invalid_file_size'))
-            return
+            return None
 
         # 检查保存位置是否存在
         if not os.path.exists(save_location):
             messagebox.showerror(lang.get('error'), lang.get('save_location_not_exist', save_location))
+            return None
+
+        return file_path, apparent_size, size_str
+
+    def on_generate():
+        """生成按钮点击事件处理"""
+        inputs = validate_inputs()
+        if inputs is None:
             return
+        file_path, apparent_size, size_str = inputs
 
         # 检查文件是否已存在
         if os.path.exists(file_path):
@@ -269,11 +1281,114 @@ def generate_file_gui():
             
             # 添加到最近文件
             add_to_recent_files(file_path)
+            register_created_file(file_path, apparent_size)
             
         except Exception as e:
             messagebox.showerror(lang.get('error'), lang.get('file_creation_failed', e))
             status_var.set(lang.get('ready'))
 
+    def add_queue_row(file_path, apparent_size, size_label):
+        """向任务队列追加一行"""
+        index = len(queue_jobs)
+        queue_jobs.append((file_path, apparent_size))
+        queue_status.append('pending')
+        job_tree.insert('', tk.END, iid=str(index), values=(
+            os.path.basename(file_path), size_label, os.path.dirname(file_path), lang.get('job_pending')))
+
+    def on_add_to_queue():
+        """把当前输入加入任务队列"""
+        inputs = validate_inputs()
+        if inputs is not None:
+            add_queue_row(*inputs)
+
+    def on_load_manifest():
+        """从清单文件批量加入任务"""
+        manifest_path = filedialog.askopenfilename(
+            title=lang.get('select_manifest'), filetypes=[('CSV', '*.csv'), ('*', '*')])
+        if not manifest_path:
+            return
+        try:
+            jobs = load_manifest(manifest_path, save_location_entry.get() or os.getcwd())
+        except (OSError, ValueError) as e:
+            messagebox.showerror(lang.get('error'), lang.get('cli_manifest_invalid', e))
+            return
+        for file_path, apparent_size in jobs:
+            add_queue_row(file_path, apparent_size, str(apparent_size))
+
+    def on_clear_queue():
+        """清空任务队列 (运行中不可清空)"""
+        if queue_state['running']:
+            return
+        job_tree.delete(*job_tree.get_children())
+        del queue_jobs[:]
+        del queue_status[:]
+
+    def run_queue_job(index):
+        """工作线程: 创建文件并把结果放入结果队列，不直接操作界面"""
+        try:
+            create_dummy_large_file(*queue_jobs[index])
+            queue_results.put((index, None))
+        except Exception as e:
+            queue_results.put((index, e))
+
+    def on_start_queue():
+        """用线程池执行所有等待中的任务"""
+        if queue_state['running']:
+            return
+        pending = [index for index, status in enumerate(queue_status) if status == 'pending']
+        if not pending:
+            return
+        try:
+            workers = max(1, int(workers_var.get()))
+        except ValueError:
+            workers = 4
+
+        queue_state.update(running=True, submitted=len(pending), finished=0, failed=0,
+                           bytes=0, start=time.monotonic(), created=[])
+        executor = ThreadPoolExecutor(max_workers=workers)
+        for index in pending:
+            queue_status[index] = 'running'
+            job_tree.set(str(index), 'status', lang.get('job_running'))
+            executor.submit(run_queue_job, index)
+        executor.shutdown(wait=False)
+        status_var.set(lang.get('processing'))
+        root.after(QUEUE_POLL_MS, poll_queue)
+
+    def poll_queue():
+        """定时批量取回结果并刷新界面，每次只处理上次刷新后完成的任务"""
+        while True:
+            try:
+                index, error = queue_results.get_nowait()
+            except queue.Empty:
+                break
+            queue_state['finished'] += 1
+            if error is None:
+                queue_status[index] = 'done'
+                queue_state['bytes'] += queue_jobs[index][1]
+                queue_state['created'].append(queue_jobs[index])
+                job_tree.set(str(index), 'status', lang.get('job_done'))
+            else:
+                queue_status[index] = 'failed'
+                queue_state['failed'] += 1
+                job_tree.set(str(index), 'status', lang.get('job_failed', error))
+
+        elapsed = max(time.monotonic() - queue_state['start'], 1e-6)
+        succeeded = queue_state['finished'] - queue_state['failed']
+        queue_stats_var.set(lang.get('queue_stats', queue_state['finished'], queue_state['submitted'],
+                                     '%.1f' % (succeeded / elapsed),
+                                     '%.1f' % (queue_state['bytes'] / elapsed / 1024 ** 2)))
+
+        if queue_state['finished'] < queue_state['submitted']:
+            root.after(QUEUE_POLL_MS, poll_queue)
+            return
+        queue_state['running'] = False
+        status_var.set(lang.get('operation_completed'))
+        file_registry = open_registry()
+        if file_registry:
+            with file_registry:
+                for file_path, apparent_size in queue_state['created']:
+                    file_registry.record(file_path, apparent_size)
+
     def browse_save_location():
         """浏览保存位置"""
         directory = filedialog.askdirectory(title=lang.get('select_save_location'))
@@ -333,9 +1448,9 @@ def generate_file_gui():
     # 创建主窗口
     root = tk.Tk()
     root.title(lang.get('title'))
-    root.geometry("700x500")
+    root.geometry("800x760")
     root.resizable(True, True)
-    root.minsize(600, 400)
+    root.minsize(600, 560)
     
     # 设置窗口图标
     try:
@@ -431,9 +1546,50 @@ def generate_file_gui():
                                 style='Accent.TButton')
     generate_button.pack(side=tk.RIGHT, padx=(10, 0))
 
+    # 任务队列框架
+    queue_jobs = []
+    queue_status = []
+    queue_results = queue.Queue()
+    queue_state = {'running': False}
+
+    queue_frame = ttk.LabelFrame(main_frame, text=lang.get('job_queue'), padding="10")
+    queue_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
+
+    queue_toolbar = ttk.Frame(queue_frame)
+    queue_toolbar.pack(fill=tk.X, pady=(0, 8))
+    add_queue_button = ttk.Button(queue_toolbar, text=lang.get('add_to_queue'), command=on_add_to_queue)
+    add_queue_button.pack(side=tk.LEFT)
+    load_manifest_button = ttk.Button(queue_toolbar, text=lang.get('load_manifest'), command=on_load_manifest)
+    load_manifest_button.pack(side=tk.LEFT, padx=(10, 0))
+    clear_queue_button = ttk.Button(queue_toolbar, text=lang.get('clear_queue'), command=on_clear_queue)
+    clear_queue_button.pack(side=tk.LEFT, padx=(10, 0))
+    start_queue_button = ttk.Button(queue_toolbar, text=lang.get('start_queue'), command=on_start_queue)
+    start_queue_button.pack(side=tk.RIGHT)
+    workers_var = tk.StringVar(value='4')
+    workers_spinbox = ttk.Spinbox(queue_toolbar, from_=1, to=64, width=5, textvariable=workers_var)
+    workers_spinbox.pack(side=tk.RIGHT, padx=(0, 10))
+    workers_label = ttk.Label(queue_toolbar, text=lang.get('workers'))
+    workers_label.pack(side=tk.RIGHT, padx=(0, 5))
+
+    job_tree = ttk.Treeview(queue_frame, columns=tuple(QUEUE_COLUMNS), show='headings', height=8)
+    for column in QUEUE_COLUMNS:
+        job_tree.heading(column, text=lang.get(QUEUE_COLUMNS[column]))
+    job_tree.column('name', width=180)
+    job_tree.column('size', width=100)
+    job_tree.column('location', width=220)
+    job_tree.column('status', width=160)
+    job_scrollbar = ttk.Scrollbar(queue_frame, orient=tk.VERTICAL, command=job_tree.yview)
+    job_tree.configure(yscrollcommand=job_scrollbar.set)
+    job_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    job_tree.pack(fill=tk.BOTH, expand=True)
+
+    queue_stats_var = tk.StringVar()
+    queue_stats_label = ttk.Label(queue_frame, textvariable=queue_stats_var)
+    queue_stats_label.pack(anchor=tk.W, pady=(8, 0))
+
     # 说明文本
     note_frame = ttk.LabelFrame(main_frame, text=lang.get('help'), padding="10")
-    note_frame.pack(fill=tk.BOTH, expand=True)
+    note_frame.pack(fill=tk.X)
     
     note_label = ttk.Label(note_frame, text=lang.get('supported_units'), wraplength=600, justify=tk.LEFT)
     note_label.pack(anchor=tk.W)
@@ -463,20 +1619,22 @@ def generate_file_gui():
 
 
 if __name__ == "__main__":
+    try:
+        global_options, argv = apply_global_options(sys.argv[1:])
+    except ValueError as e:
+        console = output.console()
+        console.summary('error', 'cli_invalid_rate', (e,), reason='invalid_rate', error=str(e))
+        console.flush()
+        sys.exit(1)
+
     # 检查是否通过命令行参数调用
-    if len(sys.argv) > 1 and sys.argv[1].upper() != 'GUI':
-        # 命令行模式
-        if len(sys.argv) != 4:
-            print(lang.get('cli_usage_error'))
-            print(lang.get('cli_usage_example'))
-            sys.exit(1)
-
-        size_str = sys.argv[1]
-        file_name = sys.argv[2]
-        save_location = sys.argv[3]
-
-        success = generate_file_from_args(size_str, file_name, save_location)
-        sys.exit(0 if success else 1)
+    if argv and argv[0].upper() != 'GUI':
+        if global_options.profile or global_options.trace_malloc or global_options.collapsed_stacks:
+            # 只在请求时才导入分析模块，未启用时没有任何额外开销
+            import profiling
+            sys.exit(profiling.run_profiled(lambda: run_cli(argv), global_options.profile,
+                                            global_options.trace_malloc, global_options.collapsed_stacks))
+        sys.exit(run_cli(argv))
     else:
         # GUI模式
         generate_file_gui()
\ No newline at end of file